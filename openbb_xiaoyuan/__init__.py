@@ -1,54 +1,66 @@
 """openbb_xiaoyuan OpenBB Platform Provider."""
 
+from typing import Any
+
 from openbb_core.provider.abstract.provider import Provider
 
-from openbb_xiaoyuan.models.balance_sheet import XiaoYuanBalanceSheetFetcher
-from openbb_xiaoyuan.models.balance_sheet_growth import (
-    XiaoYuanBalanceSheetGrowthFetcher,
-)
-from openbb_xiaoyuan.models.calendar_dividend import XiaoYuanCalendarDividendFetcher
-from openbb_xiaoyuan.models.cash_flow import XiaoYuanCashFlowStatementFetcher
-from openbb_xiaoyuan.models.cash_flow_growth import (
-    XiaoYuanCashFlowStatementGrowthFetcher,
-)
-from openbb_xiaoyuan.models.equity_valuation_multiples import (
-    XiaoYuanEquityValuationMultiplesFetcher,
-)
-from openbb_xiaoyuan.models.equity_historical import XiaoYuanEquityHistoricalFetcher
-from openbb_xiaoyuan.models.financial_ratios import XiaoYuanFinancialRatiosFetcher
-from openbb_xiaoyuan.models.historical_dividends import (
-    XiaoYuanHistoricalDividendsFetcher,
-)
-from openbb_xiaoyuan.models.historical_market_cap import (
-    XiaoYuanHistoricalMarketCapFetcher,
-)
-from openbb_xiaoyuan.models.income_statement import XiaoYuanIncomeStatementFetcher
-from openbb_xiaoyuan.models.key_metrics import XiaoYuanKeyMetricsFetcher
-from openbb_xiaoyuan.models.income_statement_growth import (
-    XiaoYuanIncomeStatementGrowthFetcher,
-)
+from openbb_xiaoyuan.utils.lazy import LazyFetcherDict
 
 # mypy: disable-error-code="list-item"
 
+# Model name to (module in openbb_xiaoyuan.models, fetcher class), imported on
+# first use so that loading the provider does not load every model.
+FETCHERS = {
+    "CashFlowStatement": ("cash_flow", "XiaoYuanCashFlowStatementFetcher"),
+    "FinancialRatios": ("financial_ratios", "XiaoYuanFinancialRatiosFetcher"),
+    "CashFlowStatementGrowth": (
+        "cash_flow_growth",
+        "XiaoYuanCashFlowStatementGrowthFetcher",
+    ),
+    "BalanceSheetGrowth": (
+        "balance_sheet_growth",
+        "XiaoYuanBalanceSheetGrowthFetcher",
+    ),
+    "BalanceSheet": ("balance_sheet", "XiaoYuanBalanceSheetFetcher"),
+    "IncomeStatement": ("income_statement", "XiaoYuanIncomeStatementFetcher"),
+    "IncomeStatementGrowth": (
+        "income_statement_growth",
+        "XiaoYuanIncomeStatementGrowthFetcher",
+    ),
+    "EquityHistorical": ("equity_historical", "XiaoYuanEquityHistoricalFetcher"),
+    "HistoricalMarketCap": (
+        "historical_market_cap",
+        "XiaoYuanHistoricalMarketCapFetcher",
+    ),
+    "KeyMetrics": ("key_metrics", "XiaoYuanKeyMetricsFetcher"),
+    "EquityValuationMultiples": (
+        "equity_valuation_multiples",
+        "XiaoYuanEquityValuationMultiplesFetcher",
+    ),
+    "CalendarDividend": ("calendar_dividend", "XiaoYuanCalendarDividendFetcher"),
+    "HistoricalDividends": (
+        "historical_dividends",
+        "XiaoYuanHistoricalDividendsFetcher",
+    ),
+    "CompanyFundamentals": (
+        "company_fundamentals",
+        "XiaoYuanCompanyFundamentalsFetcher",
+    ),
+    "EquityScreener": ("equity_screener", "XiaoYuanEquityScreenerFetcher"),
+}
 
 openbb_xiaoyuan_provider = Provider(
     name="xiaoyuan",
     description="Data provider for openbb-xiaoyuan.",
     # credentials=["api_key"],
     website="https://openbb-xiaoyuan.com",
-    fetcher_dict={
-        "CashFlowStatement": XiaoYuanCashFlowStatementFetcher,
-        "FinancialRatios": XiaoYuanFinancialRatiosFetcher,
-        "CashFlowStatementGrowth": XiaoYuanCashFlowStatementGrowthFetcher,
-        "BalanceSheetGrowth": XiaoYuanBalanceSheetGrowthFetcher,
-        "BalanceSheet": XiaoYuanBalanceSheetFetcher,
-        "IncomeStatement": XiaoYuanIncomeStatementFetcher,
-        "IncomeStatementGrowth": XiaoYuanIncomeStatementGrowthFetcher,
-        "EquityHistorical": XiaoYuanEquityHistoricalFetcher,
-        "HistoricalMarketCap": XiaoYuanHistoricalMarketCapFetcher,
-        "KeyMetrics": XiaoYuanKeyMetricsFetcher,
-        "EquityValuationMultiples": XiaoYuanEquityValuationMultiplesFetcher,
-        "CalendarDividend": XiaoYuanCalendarDividendFetcher,
-        "HistoricalDividends": XiaoYuanHistoricalDividendsFetcher,
-    },
+    fetcher_dict=LazyFetcherDict("openbb_xiaoyuan.models", FETCHERS),  # type: ignore
 )
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve `from openbb_xiaoyuan import XiaoYuan...Fetcher` lazily."""
+    try:
+        return openbb_xiaoyuan_provider.fetcher_dict.find(name)  # type: ignore
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
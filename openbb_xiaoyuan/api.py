@@ -0,0 +1,22 @@
+"""openbb_xiaoyuan REST API.
+
+The OpenBB REST API with the XiaoYuan Arrow routes mounted next to the
+commands, e.g. `GET /api/v1/xiaoyuan/arrow/EquityHistorical?symbol=SH600519`.
+"""
+
+from openbb_core.api.app_loader import AppLoader
+from openbb_core.api.rest_api import app, system
+
+from openbb_xiaoyuan.utils.arrow import create_arrow_router
+
+AppLoader.add_routers(
+    app=app,
+    routers=[create_arrow_router()],
+    prefix=f"{system.api_settings.prefix}/xiaoyuan",
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("openbb_xiaoyuan.api:app", reload=True)
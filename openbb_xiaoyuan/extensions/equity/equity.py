@@ -35,3 +35,25 @@ async def historical_market_cap(
 ) -> OBBject:
     """Get the historical market cap of a ticker symbol."""
     return await OBBject.from_query(Query(**locals()))
+
+
+@router.command(
+    model="EquityScreener",
+    examples=[
+        APIEx(
+            parameters={
+                "filters": "市盈率（滚动）>0,市盈率（滚动）<20",
+                "sort_by": "总市值",
+                "provider": "xiaoyuan",
+            }
+        )
+    ],
+)
+async def screener(
+    cc: CommandContext,
+    provider_choices: ProviderChoices,
+    standard_params: StandardParams,
+    extra_params: ExtraParams,
+) -> OBBject:
+    """Screen the whole A-share universe on a date, filtered and ranked by factor."""
+    return await OBBject.from_query(Query(**locals()))
@@ -417,6 +417,28 @@ async def metrics(
     return await OBBject.from_query(Query(**locals()))
 
 
+@router.command(
+    model="CompanyFundamentals",
+    examples=[
+        APIEx(
+            parameters={
+                "symbol": "SH600519",
+                "period": "annual",
+                "provider": "xiaoyuan",
+            }
+        )
+    ],
+)
+async def fundamentals(
+    cc: CommandContext,
+    provider_choices: ProviderChoices,
+    standard_params: StandardParams,
+    extra_params: ExtraParams,
+) -> OBBject:
+    """Get the balance sheet, income statement, cash flow, ratios and key metrics in one call."""
+    return await OBBject.from_query(Query(**locals()))
+
+
 @router.command(
     model="FinancialRatios",
     examples=[
@@ -2,7 +2,7 @@
 
 # pylint: disable=unused-argument
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.balance_sheet import (
@@ -14,23 +14,24 @@ from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
 )
 from openbb_core.provider.utils.errors import EmptyDataError
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, field_validator
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanBalanceSheetQueryParams(BalanceSheetQueryParams):
     """XiaoYuan Balance Sheet Query."""
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -144,17 +145,45 @@ class XiaoYuanBalanceSheetData(BalanceSheetData):
     )
     net_debt: Optional[float] = Field(description="Net debt.", default=None)
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):  # pylint: disable=no-self-argument
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
+
+BALANCE_SHEET_FACTORS = [
+    "应收账款",
+    "预付款项",
+    "存货",
+    "其他流动资产",
+    "流动资产合计",
+    "固定资产",
+    "无形资产",
+    "商誉",
+    "其他非流动资产",
+    "非流动资产合计",
+    "资产总计",
+    "应付账款",
+    "应付利息",
+    "其他流动负债",
+    "流动负债合计",
+    "其他非流动负债",
+    "非流动负债合计",
+    "负债合计",
+    "少数股东权益",
+    "股东权益合计",
+    "负债和股东权益合计",
+    "应付股利",
+    "减：库存股",
+    "其他综合收益",
+    "净债务",
+]
+
+BALANCE_SHEET_POST_PROCESS = PostProcess(
+    XiaoYuanBalanceSheetData,
+    dates=["报告期"],
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
 
+@with_timings
 class XiaoYuanBalanceSheetFetcher(
     Fetcher[
         XiaoYuanBalanceSheetQueryParams,
@@ -173,53 +202,19 @@ class XiaoYuanBalanceSheetFetcher(
         query: XiaoYuanBalanceSheetQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[Dict]:
+    ) -> "DataFrame":
         """Return the raw data from the XiaoYuan endpoint."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        factors = [
-            "应收账款",
-            "预付款项",
-            "存货",
-            "其他流动资产",
-            "流动资产合计",
-            "固定资产",
-            "无形资产",
-            "商誉",
-            "其他非流动资产",
-            "非流动资产合计",
-            "资产总计",
-            "应付账款",
-            "应付利息",
-            "其他流动负债",
-            "流动负债合计",
-            "其他非流动负债",
-            "非流动负债合计",
-            "负债合计",
-            "少数股东权益",
-            "股东权益合计",
-            "负债和股东权益合计",
-            "应付股利",
-            "减：库存股",
-            "其他综合收益",
-            "净债务",
-        ]
-        reader = get_jindata_reader()
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(factors, [query.symbol], report_month)
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            BALANCE_SHEET_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanBalanceSheetQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanBalanceSheetQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanBalanceSheetData]:
         """Return the transformed data."""
-
-        return [XiaoYuanBalanceSheetData.model_validate(d) for d in data]
+        return BALANCE_SHEET_POST_PROCESS.build(data, query.symbol.split(","))
@@ -1,6 +1,6 @@
 """XiaoYuan Balance Sheet Growth Model."""
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.utils.errors import EmptyDataError
@@ -12,14 +12,14 @@ from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
     QUERY_DESCRIPTIONS,
 )
-from pydantic import Field, model_validator
+from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess, percent
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanBalanceSheetGrowthQueryParams(BalanceSheetGrowthQueryParams):
@@ -29,9 +29,10 @@ class XiaoYuanBalanceSheetGrowthQueryParams(BalanceSheetGrowthQueryParams):
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -263,17 +264,22 @@ class XiaoYuanBalanceSheetGrowthData(BalanceSheetGrowthData):
         description="Growth rate of net debt.",
     )
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
 
+BALANCE_SHEET_GROWTH_FACTORS = [
+    "总资产同比增长率（百分比）",
+]
+
+BALANCE_SHEET_GROWTH_POST_PROCESS = PostProcess(
+    XiaoYuanBalanceSheetGrowthData,
+    dates=["报告期"],
+    scale=percent(BALANCE_SHEET_GROWTH_FACTORS),
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
+
+@with_timings
 class XiaoYuanBalanceSheetGrowthFetcher(
     Fetcher[
         XiaoYuanBalanceSheetGrowthQueryParams,
@@ -290,38 +296,24 @@ class XiaoYuanBalanceSheetGrowthFetcher(
         return XiaoYuanBalanceSheetGrowthQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanBalanceSheetGrowthQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanBalanceSheetGrowthData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
-        FIN_METRICS_PER_SHARE = [
-            "总资产同比增长率（百分比）",
-        ]
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(
-            FIN_METRICS_PER_SHARE, [query.symbol], report_month
-        )
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            BALANCE_SHEET_GROWTH_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        columns_to_divide = FIN_METRICS_PER_SHARE
-        df[columns_to_divide] /= 100
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        data = df.to_dict(orient="records")
-        return data
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanBalanceSheetGrowthQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanBalanceSheetGrowthQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanBalanceSheetGrowthData]:
         """Return the transformed data."""
-        return [XiaoYuanBalanceSheetGrowthData.model_validate(d) for d in data]
+        return BALANCE_SHEET_GROWTH_POST_PROCESS.build(data, query.symbol.split(","))
@@ -1,7 +1,7 @@
 """XiaoYuan Dividend Calendar Model."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from dateutil.relativedelta import relativedelta
 
@@ -10,9 +10,16 @@ from openbb_core.provider.standard_models.calendar_dividend import (
     CalendarDividendData,
     CalendarDividendQueryParams,
 )
-from pandas.errors import EmptyDataError
+from openbb_core.provider.utils.errors import EmptyDataError
 from pydantic import field_validator
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.helpers import convert_to_db_date_format
+from openbb_xiaoyuan.utils.postprocess import PostProcess
 from openbb_xiaoyuan.utils.references import get_dividend_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanCalendarDividendQueryParams(CalendarDividendQueryParams):
@@ -46,9 +53,19 @@ class XiaoYuanCalendarDividendData(CalendarDividendData):
     @classmethod
     def date_validate(cls, v: str):  # pylint: disable=E0213
         """Return the date as a datetime object."""
+        if not isinstance(v, str):
+            return v
         return datetime.strptime(v, "%Y-%m-%d") if v else None
 
 
+CALENDAR_DIVIDEND_POST_PROCESS = PostProcess(
+    XiaoYuanCalendarDividendData,
+    dates=["date", "recordDate", "paymentDate"],
+    sort_by="date",
+)
+
+
+@with_timings
 class XiaoYuanCalendarDividendFetcher(
     Fetcher[
         XiaoYuanCalendarDividendQueryParams,
@@ -71,33 +88,27 @@ class XiaoYuanCalendarDividendFetcher(
         return XiaoYuanCalendarDividendQueryParams(**transformed_params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanCalendarDividendQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanCalendarDividendData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
+        reader = get_pooled_reader()
 
-        historical_start = reader.convert_to_db_date_format(query.start_date)
-        historical_end = reader.convert_to_db_date_format(query.end_date)
+        historical_start = convert_to_db_date_format(query.start_date)
+        historical_end = convert_to_db_date_format(query.end_date)
         dividend_sql = get_dividend_sql(historical_start, historical_end)
 
-        df = reader._run_query(dividend_sql)
+        df = await reader.arun_query(dividend_sql)
         if df is None or df.empty:
             raise EmptyDataError()
-        df.sort_values(by="date", ascending=False, inplace=True)
-        date_columns = ["date", "recordDate", "paymentDate"]
-        for col in date_columns:
-            df[col] = df[col].dt.strftime("%Y-%m-%d")
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanCalendarDividendQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanCalendarDividendQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanCalendarDividendData]:
         """Return the transformed data."""
-        return [XiaoYuanCalendarDividendData.model_validate(d) for d in data]
+        return CALENDAR_DIVIDEND_POST_PROCESS.build(data)
@@ -1,6 +1,6 @@
 """XiaoYuan Finance Cash Flow Statement Model."""
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.cash_flow import (
@@ -12,23 +12,24 @@ from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
 )
 from openbb_core.provider.utils.errors import EmptyDataError
-from pydantic import Field, model_validator
+from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanCashFlowStatementQueryParams(CashFlowStatementQueryParams):
     """XiaoYuan Finance Cash Flow Statement Query."""
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -71,17 +72,26 @@ class XiaoYuanCashFlowStatementData(CashFlowStatementData):
         description="Depreciation and amortization.", default=None
     )
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):  # pylint: disable=no-self-argument
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
 
+CASH_FLOW_FACTORS = [
+    "经营活动产生的现金流量净额",
+    "投资活动产生的现金流量净额",
+    "发行债券收到的现金",
+    "偿还债务支付的现金",
+    "筹资活动产生的现金流量净额",
+    "折旧与摊销",
+]
+
+CASH_FLOW_POST_PROCESS = PostProcess(
+    XiaoYuanCashFlowStatementData,
+    dates=["报告期"],
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
+
+@with_timings
 class XiaoYuanCashFlowStatementFetcher(
     Fetcher[
         XiaoYuanCashFlowStatementQueryParams,
@@ -96,41 +106,25 @@ class XiaoYuanCashFlowStatementFetcher(
         return XiaoYuanCashFlowStatementQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanCashFlowStatementQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanCashFlowStatementData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        factors = [
-            "经营活动产生的现金流量净额",
-            "投资活动产生的现金流量净额",
-            "发行债券收到的现金",
-            "偿还债务支付的现金",
-            "筹资活动产生的现金流量净额",
-            "折旧与摊销",
-        ]
-        reader = get_jindata_reader()
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(factors, [query.symbol], report_month)
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
-        )
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(CASH_FLOW_FACTORS, symbols, query.period, query.limit)
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
         # pylint: disable=unused-argument
         query: XiaoYuanCashFlowStatementQueryParams,
-        data: List[Dict],
+        data: "DataFrame",
         **kwargs: Any,
     ) -> List[XiaoYuanCashFlowStatementData]:
         """Transform the data."""
-        return [XiaoYuanCashFlowStatementData.model_validate(d) for d in data]
+        return CASH_FLOW_POST_PROCESS.build(data, query.symbol.split(","))
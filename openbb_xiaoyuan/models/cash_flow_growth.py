@@ -1,6 +1,6 @@
 """XiaoYuan Cash Flow Statement Growth Model."""
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.utils.errors import EmptyDataError
@@ -15,12 +15,12 @@ from openbb_core.provider.utils.descriptions import (
 
 from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess, percent
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanCashFlowStatementGrowthQueryParams(CashFlowStatementGrowthQueryParams):
@@ -30,9 +30,10 @@ class XiaoYuanCashFlowStatementGrowthQueryParams(CashFlowStatementGrowthQueryPar
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -231,6 +232,21 @@ class XiaoYuanCashFlowStatementGrowthData(CashFlowStatementGrowthData):
     )
 
 
+CASH_FLOW_GROWTH_FACTORS = [
+    "净利润同比增长率（百分比）",
+    "经营活动产生的现金流量净额同比增长率（百分比）",
+]
+
+CASH_FLOW_GROWTH_POST_PROCESS = PostProcess(
+    XiaoYuanCashFlowStatementGrowthData,
+    dates=["报告期"],
+    scale=percent(CASH_FLOW_GROWTH_FACTORS),
+    sort_by="报告期",
+    by_symbols=True,
+)
+
+
+@with_timings
 class XiaoYuanCashFlowStatementGrowthFetcher(
     Fetcher[
         XiaoYuanCashFlowStatementGrowthQueryParams,
@@ -247,41 +263,26 @@ class XiaoYuanCashFlowStatementGrowthFetcher(
         return XiaoYuanCashFlowStatementGrowthQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanCashFlowStatementGrowthQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanCashFlowStatementGrowthData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
-        FIN_METRICS_PER_SHARE = [
-            "净利润同比增长率（百分比）",
-            "经营活动产生的现金流量净额同比增长率（百分比）",
-        ]
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(
-            FIN_METRICS_PER_SHARE, [query.symbol], report_month
-        )
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            CASH_FLOW_GROWTH_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        columns_to_divide = FIN_METRICS_PER_SHARE
-        df[columns_to_divide] /= 100
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        data = df.to_dict(orient="records")
-        return data
+        return df
 
     @staticmethod
     def transform_data(
         query: XiaoYuanCashFlowStatementGrowthQueryParams,
-        data: List[Dict],
+        data: "DataFrame",
         **kwargs: Any,
     ) -> List[XiaoYuanCashFlowStatementGrowthData]:
         """Return the transformed data."""
-        return [XiaoYuanCashFlowStatementGrowthData.model_validate(d) for d in data]
+        return CASH_FLOW_GROWTH_POST_PROCESS.build(data, query.symbol.split(","))
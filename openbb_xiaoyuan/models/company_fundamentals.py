@@ -0,0 +1,172 @@
+"""XiaoYuan Company Fundamentals Model."""
+
+# pylint: disable=unused-argument
+
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
+
+from openbb_core.provider.abstract.fetcher import Fetcher
+from openbb_core.provider.utils.descriptions import QUERY_DESCRIPTIONS
+from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field
+
+from openbb_xiaoyuan.models.balance_sheet import (
+    BALANCE_SHEET_FACTORS,
+    BALANCE_SHEET_POST_PROCESS,
+    XiaoYuanBalanceSheetData,
+)
+from openbb_xiaoyuan.models.cash_flow import (
+    CASH_FLOW_FACTORS,
+    CASH_FLOW_POST_PROCESS,
+    XiaoYuanCashFlowStatementData,
+)
+from openbb_xiaoyuan.models.financial_ratios import (
+    FINANCIAL_RATIOS_FACTORS,
+    FINANCIAL_RATIOS_POST_PROCESS,
+    XiaoYuanFinancialRatiosData,
+)
+from openbb_xiaoyuan.models.income_statement import (
+    INCOME_STATEMENT_FACTORS,
+    INCOME_STATEMENT_POST_PROCESS,
+    XiaoYuanIncomeStatementData,
+)
+from openbb_xiaoyuan.models.key_metrics import (
+    KEY_METRICS_FACTORS,
+    KEY_METRICS_POST_PROCESS,
+    XiaoYuanKeyMetricsData,
+)
+from openbb_xiaoyuan.standard_models.company_fundamentals import (
+    CompanyFundamentalsData,
+    CompanyFundamentalsQueryParams,
+)
+from openbb_xiaoyuan.utils.finance import aquery_finance_asof_daily
+from openbb_xiaoyuan.utils.models import build_models
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.timings import with_timings
+from openbb_xiaoyuan.utils.universe import aget_symbol_universe
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+STATEMENT_FACTORS = {
+    "balance_sheet": BALANCE_SHEET_FACTORS,
+    "income_statement": INCOME_STATEMENT_FACTORS,
+    "cash_flow": CASH_FLOW_FACTORS,
+    "financial_ratios": FINANCIAL_RATIOS_FACTORS,
+    "key_metrics": KEY_METRICS_FACTORS,
+}
+
+STATEMENT_POST_PROCESS = {
+    "balance_sheet": BALANCE_SHEET_POST_PROCESS,
+    "income_statement": INCOME_STATEMENT_POST_PROCESS,
+    "cash_flow": CASH_FLOW_POST_PROCESS,
+    "financial_ratios": FINANCIAL_RATIOS_POST_PROCESS,
+    "key_metrics": KEY_METRICS_POST_PROCESS,
+}
+
+
+class XiaoYuanCompanyFundamentalsQueryParams(CompanyFundamentalsQueryParams):
+    """XiaoYuan Company Fundamentals Query."""
+
+    __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
+        "period": {
+            "choices": ["annual", "ytd"],
+        },
+    }
+
+    period: Literal["annual", "ytd"] = Field(
+        default="annual",
+        description=QUERY_DESCRIPTIONS.get("period", ""),
+    )
+
+
+class XiaoYuanCompanyFundamentalsData(CompanyFundamentalsData):
+    """XiaoYuan Company Fundamentals Data."""
+
+    __alias_dict__ = {
+        "period_ending": "报告期",
+    }
+
+    balance_sheet: Optional[XiaoYuanBalanceSheetData] = Field(
+        default=None, description="Balance sheet of the period."
+    )
+    income_statement: Optional[XiaoYuanIncomeStatementData] = Field(
+        default=None, description="Income statement of the period."
+    )
+    cash_flow: Optional[XiaoYuanCashFlowStatementData] = Field(
+        default=None, description="Cash flow statement of the period."
+    )
+    financial_ratios: Optional[XiaoYuanFinancialRatiosData] = Field(
+        default=None, description="Financial ratios of the period."
+    )
+    key_metrics: Optional[XiaoYuanKeyMetricsData] = Field(
+        default=None, description="Key metrics of the period."
+    )
+
+
+COMPANY_FUNDAMENTALS_POST_PROCESS = PostProcess(
+    XiaoYuanCompanyFundamentalsData, dates=["报告期"], sort_by="报告期", by_symbols=True
+)
+
+
+@with_timings
+class XiaoYuanCompanyFundamentalsFetcher(
+    Fetcher[
+        XiaoYuanCompanyFundamentalsQueryParams,
+        List[XiaoYuanCompanyFundamentalsData],
+    ]
+):
+    """Fetch every statement of a company with a single finance query."""
+
+    @staticmethod
+    def transform_query(
+        params: Dict[str, Any]
+    ) -> XiaoYuanCompanyFundamentalsQueryParams:
+        """Transform the query params."""
+        return XiaoYuanCompanyFundamentalsQueryParams(**params)
+
+    @staticmethod
+    async def aextract_data(
+        query: XiaoYuanCompanyFundamentalsQueryParams,
+        credentials: Optional[Dict[str, str]],
+        **kwargs: Any,
+    ) -> "DataFrame":
+        """Return the raw data from the XiaoYuan endpoint."""
+        symbols = (await aget_symbol_universe()).filter(query.symbol.split(","))
+        if not symbols:
+            raise EmptyDataError()
+        factors = list(
+            dict.fromkeys(f for fs in STATEMENT_FACTORS.values() for f in fs)
+        )
+        df = await aquery_finance_asof_daily(
+            factors, KEY_METRICS_FACTORS, symbols, query.period, query.limit
+        )
+        if df is None or df.empty:
+            raise EmptyDataError()
+        return df
+
+    @staticmethod
+    def transform_data(
+        query: XiaoYuanCompanyFundamentalsQueryParams,
+        data: "DataFrame",
+        **kwargs: Any,
+    ) -> List[XiaoYuanCompanyFundamentalsData]:
+        """Return the transformed data."""
+        df = COMPANY_FUNDAMENTALS_POST_PROCESS.apply(data, query.symbol.split(","))
+        keys = ["symbol", "报告期", "fiscal_period", "fiscal_year"]
+        statements = {}
+        for name, statement_factors in STATEMENT_FACTORS.items():
+            columns = keys + [f for f in statement_factors if f in df.columns]
+            statements[name] = STATEMENT_POST_PROCESS[name].build(
+                df[columns], sort=False
+            )
+        # Key metrics without market data are dropped, as in the KeyMetrics fetcher.
+        statements["key_metrics"] = [
+            metrics if has_market_cap else None
+            for metrics, has_market_cap in zip(
+                statements["key_metrics"], df["总市值"].notna()
+            )
+        ]
+        return build_models(
+            XiaoYuanCompanyFundamentalsData, df[keys].assign(**statements)
+        )
@@ -6,8 +6,17 @@ from dateutil.relativedelta import relativedelta
 from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
 )
+import os
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Optional,
+)
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.equity_historical import (
@@ -16,7 +25,21 @@ from openbb_core.provider.standard_models.equity_historical import (
 )
 from openbb_core.provider.utils.descriptions import QUERY_DESCRIPTIONS
 from openbb_core.provider.utils.errors import EmptyDataError
-from pydantic import Field
+from pydantic import Field, model_validator
+
+from openbb_xiaoyuan.utils.arrow import to_arrow_table
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.helpers import batched, convert_to_db_date_format
+from openbb_xiaoyuan.utils.models import build_models
+from openbb_xiaoyuan.utils.references import BAR_ENDS, get_resample_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from pyarrow import Table
+
+CHUNK_DAYS = int(os.environ.get("XIAOYUAN_CHUNK_DAYS", 250))
+CHUNK_SYMBOLS = int(os.environ.get("XIAOYUAN_CHUNK_SYMBOLS", 100))
 
 
 class XiaoYuanEquityHistoricalQueryParams(EquityHistoricalQueryParams):
@@ -28,12 +51,34 @@ class XiaoYuanEquityHistoricalQueryParams(EquityHistoricalQueryParams):
     __alias_dict__ = {"start_date": "from", "end_date": "to"}
     __json_schema_extra__ = {
         "symbol": {"multiple_items_allowed": True},
-        "interval": {"choices": ["1d"]},
+        "interval": {"choices": ["1d", "1W", "1M", "1Q"]},
+        "adjustment": {"choices": ["none", "forward", "backward"]},
     }
 
-    interval: Literal["1d"] = Field(
-        default="1d", description=QUERY_DESCRIPTIONS.get("interval", "")
+    interval: Literal["1d", "1W", "1M", "1Q"] = Field(
+        default="1d",
+        description=QUERY_DESCRIPTIONS.get("interval", "")
+        + " Weekly, monthly and quarterly bars are aggregated on the server"
+        + " and dated on their last trading day.",
+    )
+    adjustment: Literal["none", "forward", "backward"] = Field(
+        default="none",
+        description="Adjust the OHLC prices for dividends and splits: `forward`"
+        + " keeps the latest prices, `backward` the first ones. `adj_close` then"
+        + " equals `close`, and volume is left unadjusted. Daily bars only.",
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Serve cached days locally and only fetch the days after them."
+        + " Only daily bars are cached.",
+    )
+
+    @model_validator(mode="after")
+    def check_adjustment(self):
+        """Adjusted bars would need the factors of each day inside them."""
+        if self.adjustment != "none" and self.interval != "1d":
+            raise ValueError("Adjusted prices are only available for daily bars.")
+        return self
 
 
 class XiaoYuanEquityHistoricalData(EquityHistoricalData):
@@ -62,6 +107,72 @@ class XiaoYuanEquityHistoricalData(EquityHistoricalData):
     )
 
 
+# How the daily columns reduce to a bar; `ref_close` is the close before it.
+BAR_AGGREGATIONS = {
+    "开盘价（不复权）": "first",
+    "最高价（不复权）": "max",
+    "最低价（不复权）": "min",
+    "收盘价（不复权）": "last",
+    "成交量（不复权）": "sum",
+    "收盘价（前复权）": "last",
+    "ref_close": "first",
+}
+
+
+async def aiter_history(
+    symbols: List[str], after: Any, until: Any, interval: Optional[str] = None
+) -> AsyncIterator["DataFrame"]:
+    """Yield the rows of `symbols` in (after, until], chunk by chunk.
+
+    Frames come by date window, then by symbol batch. Every window loads
+    from the trading day before its start, so the `REF`-based change
+    columns stay continuous across window boundaries. With an `interval` of
+    `BAR_ENDS`, the rows are aggregated into bars on the server, and the
+    windows are aligned to whole bars.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.calendar import aget_trading_calendar
+
+    reader = get_pooled_reader()
+    calendar = await aget_trading_calendar()
+
+    factors = list(XiaoYuanEquityHistoricalData.__alias_dict__.values())
+    factors.remove(XiaoYuanEquityHistoricalData.__alias_dict__["date"])
+
+    close = XiaoYuanEquityHistoricalData.__alias_dict__["close"]
+    resample = get_resample_sql("t", interval, BAR_AGGREGATIONS) if interval else ""
+
+    windows = calendar.windows(after, until, CHUNK_DAYS, interval)
+    for window_after, window_until in windows:
+        historical_start = convert_to_db_date_format(calendar.previous(window_after))
+        historical_end = convert_to_db_date_format(window_until)
+        for batch in batched(list(symbols), CHUNK_SYMBOLS):
+            historical_sql = f"""
+                use mytt
+                t = select timestamp, symbol, factor_name ,value 
+                from loadTable("dfs://factors_6M", `cn_factors_1D) 
+                where factor_name in factorNames 
+                and timestamp between {historical_start} 
+                and {historical_end} 
+                and symbol in symbols;
+
+                t = select value from t pivot by timestamp, symbol, factor_name;
+                update t set ref_close = REF({close}, 1) context by symbol;
+                t = select * from t where timestamp > {convert_to_db_date_format(window_after)};
+                {resample}
+                update t set change = {close} - ref_close;
+                update t set changeOverTime = change / ref_close;
+                t;
+            """
+            df = await reader.arun_query(
+                script=historical_sql,
+                variables={"factorNames": factors, "symbols": list(batch)},
+            )
+            if df is not None and not df.empty:
+                yield df
+
+
+@with_timings
 class XiaoYuanEquityHistoricalFetcher(
     Fetcher[
         XiaoYuanEquityHistoricalQueryParams,
@@ -85,53 +196,104 @@ class XiaoYuanEquityHistoricalFetcher(
         return XiaoYuanEquityHistoricalQueryParams(**transformed_params)
 
     @staticmethod
-    def extract_data(
+    async def aiter_chunks(
+        query: XiaoYuanEquityHistoricalQueryParams,
+    ) -> AsyncIterator["DataFrame"]:
+        """Yield the result in frames of at most CHUNK_DAYS x CHUNK_SYMBOLS rows."""
+        async for df in aiter_history(
+            query.symbol.split(","),
+            query.start_date,
+            query.end_date,
+            query.interval if query.interval in BAR_ENDS else None,
+        ):
+            yield df
+
+    @staticmethod
+    async def aiter_frames(
+        query: XiaoYuanEquityHistoricalQueryParams,
+    ) -> AsyncIterator["DataFrame"]:
+        """Yield the requested rows frame by frame, adjusted when asked for.
+
+        Cached daily rows come from the price store in batches of
+        CHUNK_SYMBOLS symbols, anything else straight from `aiter_chunks`.
+        """
+        # pylint: disable=import-outside-toplevel
+        from openbb_xiaoyuan.utils.adjustments import (
+            adjust_prices,
+            get_adjustment_factors,
+        )
+        from openbb_xiaoyuan.utils.prices import get_price_store
+
+        symbols = query.symbol.split(",")
+        if query.use_cache and query.interval == "1d":
+            frames = get_price_store().aiter(
+                symbols,
+                query.start_date,
+                query.end_date,
+                fetch=aiter_history,
+                batch_size=CHUNK_SYMBOLS,
+            )
+        else:
+            frames = XiaoYuanEquityHistoricalFetcher.aiter_chunks(query)
+        factors = None
+        if query.adjustment != "none":
+            factors = await get_adjustment_factors().aget(symbols)
+        async for df in frames:
+            if factors is not None:
+                df = adjust_prices(df, factors, query.adjustment)
+            yield df
+
+    @staticmethod
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanEquityHistoricalQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanEquityHistoricalData]:
+    ) -> List["DataFrame"]:
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
+        chunks = [
+            df async for df in XiaoYuanEquityHistoricalFetcher.aiter_frames(query)
+        ]
+        if not chunks:
+            raise EmptyDataError()
+        return chunks
 
-        reader = get_jindata_reader()
+    @classmethod
+    async def fetch_data(
+        cls,
+        params: Dict[str, Any],
+        credentials: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> List[XiaoYuanEquityHistoricalData]:
+        """Fetch the data, validating each frame as soon as it arrives.
 
-        historical_start = reader.convert_to_db_date_format(
-            reader.get_adjacent_trade_day(query.start_date, -1)
-        )
-        historical_end = reader.convert_to_db_date_format(query.end_date)
-
-        symbols_list = query.symbol.split(",")
-
-        factors = list(XiaoYuanEquityHistoricalData.__alias_dict__.values())
-        factors.remove(XiaoYuanEquityHistoricalData.__alias_dict__["date"])
-
-        historical_sql = f"""
-            use mytt
-            t = select timestamp, symbol, factor_name ,value 
-            from loadTable("dfs://factors_6M", `cn_factors_1D) 
-            where factor_name in {factors} 
-            and timestamp between {historical_start} 
-            and {historical_end} 
-            and symbol in {symbols_list};
-
-            t = select value from t pivot by timestamp, symbol, factor_name;
-            update t set ref_close = REF({XiaoYuanEquityHistoricalData.__alias_dict__["close"]}, 1) context by symbol;
-            update t set change = {XiaoYuanEquityHistoricalData.__alias_dict__["close"]} - ref_close context by symbol;
-            update t set changeOverTime = change / ref_close  context by symbol;
-            select * from t where timestamp > {reader.convert_to_db_date_format(query.start_date)};
+        Unlike `aextract_data` followed by `transform_data`, only one frame
+        is alive at a time next to the models built so far.
         """
-        df = reader._run_query(
-            script=historical_sql,
-        )
-        if df is None or df.empty:
+        query = cls.transform_query(params=params)
+        results: List[XiaoYuanEquityHistoricalData] = []
+        async for df in cls.aiter_frames(query):
+            results.extend(cls.transform_data(query=query, data=[df], **kwargs))
+        if not results:
             raise EmptyDataError()
-        return df.to_dict(orient="records")
+        return results
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanEquityHistoricalQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanEquityHistoricalQueryParams,
+        data: List["DataFrame"],
+        **kwargs: Any,
     ) -> List[XiaoYuanEquityHistoricalData]:
         """Return the transformed data."""
+        results: List[XiaoYuanEquityHistoricalData] = []
+        for df in data:
+            results.extend(build_models(XiaoYuanEquityHistoricalData, df))
+        return results
 
-        return [XiaoYuanEquityHistoricalData.model_validate(d) for d in data]
+    @staticmethod
+    def transform_arrow(
+        query: XiaoYuanEquityHistoricalQueryParams,
+        data: List["DataFrame"],
+    ) -> "Table":
+        """Return the extracted data as an Arrow table, skipping the models."""
+        return to_arrow_table(XiaoYuanEquityHistoricalData, data)
@@ -0,0 +1,202 @@
+"""XiaoYuan Equity Screener Model."""
+
+import re
+from datetime import date as dateType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from openbb_core.provider.abstract.fetcher import Fetcher
+from openbb_core.provider.standard_models.equity_screener import (
+    EquityScreenerData,
+    EquityScreenerQueryParams,
+)
+from openbb_core.provider.utils.descriptions import (
+    DATA_DESCRIPTIONS,
+    QUERY_DESCRIPTIONS,
+)
+from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field, PositiveInt, field_validator, model_validator
+
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.query import Compare
+from openbb_xiaoyuan.utils.references import get_screener_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+from openbb_xiaoyuan.utils.universe import aget_symbol_universe
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+# Factor names are used as column names in the script, so only word
+# characters and full-width brackets are accepted.
+_FACTOR = re.compile(r"[\w（）]+")
+_FILTER = re.compile(
+    r"\s*([\w（）]+)\s*(<=|>=|!=|=|<|>)\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*"
+)
+
+
+def split_factors(factors: Optional[str]) -> List[str]:
+    """Split a comma-separated factor list, keeping the order."""
+    return list(
+        dict.fromkeys(f.strip() for f in (factors or "").split(",") if f.strip())
+    )
+
+
+def parse_filters(filters: Optional[str]) -> List[Tuple[str, str, float]]:
+    """Parse `factor<op>number` conditions separated by commas."""
+    parsed = []
+    for condition in split_factors(filters):
+        match = _FILTER.fullmatch(condition)
+        if match is None:
+            raise ValueError(f"Invalid filter: {condition}")
+        factor, op, value = match.groups()
+        parsed.append((factor, op, float(value)))
+    return parsed
+
+
+class XiaoYuanEquityScreenerQueryParams(EquityScreenerQueryParams):
+    """XiaoYuan Equity Screener Query."""
+
+    __json_schema_extra__ = {
+        "daily_factors": {"multiple_items_allowed": True},
+        "report_factors": {"multiple_items_allowed": True},
+        "filters": {"multiple_items_allowed": True},
+    }
+
+    date: Optional[dateType] = Field(
+        default=None,
+        description=QUERY_DESCRIPTIONS.get("date", "")
+        + " Rolled back to a trading day; the last trading day before today by default.",
+    )
+    daily_factors: str = Field(
+        default="市盈率（滚动）,总市值,股息率",
+        description="Factors of the daily factor table to return.",
+    )
+    report_factors: Optional[str] = Field(
+        default=None,
+        description="Factors of the financial reports to return, as their latest"
+        " value published by the screening date.",
+    )
+    filters: Optional[str] = Field(
+        default=None,
+        description="Conditions a stock must meet, such as `市盈率（滚动）>0`."
+        " Each one compares a returned factor with a number.",
+    )
+    sort_by: Optional[str] = Field(
+        default=None, description="The returned factor to rank the stocks by."
+    )
+    ascending: bool = Field(
+        default=False, description="Rank in ascending order, largest first otherwise."
+    )
+    limit: Optional[PositiveInt] = Field(
+        default=50, description=QUERY_DESCRIPTIONS.get("limit", "")
+    )
+
+    @field_validator("daily_factors", "report_factors", "sort_by", mode="after")
+    @classmethod
+    def check_factors(cls, v: Optional[str]) -> Optional[str]:
+        """Reject factor names that cannot be used as column names."""
+        for factor in split_factors(v):
+            if not _FACTOR.fullmatch(factor):
+                raise ValueError(f"Invalid factor name: {factor}")
+        return v
+
+    @model_validator(mode="after")
+    def check_columns(self):
+        """Only returned factors can be filtered and sorted on."""
+        daily = split_factors(self.daily_factors)
+        report = split_factors(self.report_factors)
+        if not daily:
+            raise ValueError("At least one daily factor is required.")
+        if set(daily) & set(report):
+            raise ValueError("A factor cannot be both a daily and a report factor.")
+        columns = set(daily) | set(report)
+        used = [f for f, _, _ in parse_filters(self.filters)]
+        used += [self.sort_by] if self.sort_by else []
+        unknown = [f for f in used if f not in columns]
+        if unknown:
+            raise ValueError(
+                f"Filters and sort_by must use returned factors: {unknown}"
+            )
+        return self
+
+
+class XiaoYuanEquityScreenerData(EquityScreenerData):
+    """XiaoYuan Equity Screener Data.
+
+    The requested factors are returned under their factor names.
+    """
+
+    date: dateType = Field(description=DATA_DESCRIPTIONS.get("date", ""))
+
+
+EQUITY_SCREENER_POST_PROCESS = PostProcess(XiaoYuanEquityScreenerData, dates=["date"])
+
+
+@with_timings
+class XiaoYuanEquityScreenerFetcher(
+    Fetcher[
+        XiaoYuanEquityScreenerQueryParams,
+        List[XiaoYuanEquityScreenerData],
+    ]
+):
+    """Transform the query, extract and transform the data from the XiaoYuan endpoints."""
+
+    @staticmethod
+    def transform_query(params: Dict[str, Any]) -> XiaoYuanEquityScreenerQueryParams:
+        """Transform the query params."""
+        return XiaoYuanEquityScreenerQueryParams(**params)
+
+    @staticmethod
+    async def aextract_data(
+        # pylint: disable=unused-argument
+        query: XiaoYuanEquityScreenerQueryParams,
+        credentials: Optional[Dict[str, str]],
+        **kwargs: Any,
+    ) -> "DataFrame":
+        """Screen the universe on the server and return the qualifying rows."""
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        from openbb_xiaoyuan.utils.calendar import aget_trading_calendar
+
+        calendar = await aget_trading_calendar()
+        if query.date is None:
+            day = calendar.previous(dateType.today())[()]
+        else:
+            day = calendar.rollback(query.date)[()]
+        day = pd.Timestamp(day).date()
+
+        predicates = [Compare(*f) for f in parse_filters(query.filters)]
+        order_by = None
+        if query.sort_by:
+            order_by = f"{query.sort_by} {'asc' if query.ascending else 'desc'}"
+        variables: Dict[str, Any] = {}
+        sql = get_screener_sql(
+            day,
+            split_factors(query.daily_factors),
+            split_factors(query.report_factors),
+            predicates,
+            order_by,
+            query.limit,
+            variables,
+            # Every listed company reports at least once a year.
+            report_since=(pd.Timestamp(day) - pd.DateOffset(years=1)).date(),
+        )
+        df = await get_pooled_reader().arun_query(sql, variables=variables)
+        if df is None or df.empty:
+            raise EmptyDataError()
+
+        listing = (await aget_symbol_universe()).listing
+        if "name" in listing.columns:
+            df["name"] = df["symbol"].map(listing["name"])
+        df["date"] = day
+        return df
+
+    @staticmethod
+    def transform_data(
+        query: XiaoYuanEquityScreenerQueryParams,
+        data: "DataFrame",
+        **kwargs: Any,
+    ) -> List[XiaoYuanEquityScreenerData]:
+        """Return the transformed data."""
+        return EQUITY_SCREENER_POST_PROCESS.build(data)
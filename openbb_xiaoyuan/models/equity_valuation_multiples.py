@@ -1,8 +1,8 @@
 """XiaoYuan Equity Valuation Multiples Model."""
 
-from typing import Any, Dict, List, Optional
+from datetime import date as dateType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import pandas as pd
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.equity_valuation_multiples import (
     EquityValuationMultiplesData,
@@ -12,10 +12,14 @@ from openbb_core.provider.utils.descriptions import DATA_DESCRIPTIONS
 from openbb_core.provider.utils.errors import EmptyDataError
 from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_specific_daily_sql,
-    get_recent_1q_query_finance_sql,
-)
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.references import get_valuation_snapshot_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+from openbb_xiaoyuan.utils.universe import aget_symbol_universe
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 # pylint: disable=unused-argument
@@ -26,6 +30,11 @@ class XiaoYuanEquityValuationMultiplesQueryParams(EquityValuationMultiplesQueryP
 
     __json_schema_extra__ = {"symbol": {"multiple_items_allowed": True}}
 
+    all_symbols: bool = Field(
+        default=False,
+        description="Snapshot every listed symbol instead of those in `symbol`.",
+    )
+
 
 class XiaoYuanEquityValuationMultiplesData(EquityValuationMultiplesData):
     """XiaoYuan Equity Valuation Multiples Data."""
@@ -43,6 +52,15 @@ class XiaoYuanEquityValuationMultiplesData(EquityValuationMultiplesData):
     )
 
 
+FINANCE_FACTORS = ["投入资本回报率ROIC（TTM）（百分比）"]
+DAILY_FACTORS = ["市盈率（滚动）", "市销率（滚动）"]
+
+EQUITY_VALUATION_MULTIPLES_POST_PROCESS = PostProcess(
+    XiaoYuanEquityValuationMultiplesData, drop=["报告期", "timestamp", "day"]
+)
+
+
+@with_timings
 class XiaoYuanEquityValuationMultiplesFetcher(
     Fetcher[
         XiaoYuanEquityValuationMultiplesQueryParams,
@@ -63,60 +81,34 @@ class XiaoYuanEquityValuationMultiplesFetcher(
         query: XiaoYuanEquityValuationMultiplesQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[Dict]:
+    ) -> "DataFrame":
         """Return the raw data from the XiaoYuan endpoint."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        symbols = query.symbol.split(",")
-        factors = [
-            "市盈率（滚动）",
-            "市销率（滚动）",
-            "投入资本回报率ROIC（TTM）（百分比）",
-        ]
-        reader = get_jindata_reader()
-        stock_listing_info = reader.get_stocks().symbol.tolist()
-        symbols = [s for s in symbols if s in stock_listing_info]
-        if not symbols:
-            raise EmptyDataError()
-        # 获取当前时间
-        cur_date = pd.Timestamp.now().strftime("%Y.%m.%d")
-        # 获取最近一个报告期的财务数据
-        df_sql = get_recent_1q_query_finance_sql(
-            factors, symbols, reader.convert_to_db_date_format(cur_date)
+        universe = await aget_symbol_universe()
+        symbols = None
+        if not query.all_symbols:
+            symbols = universe.filter(query.symbol.split(","))
+            if not symbols:
+                raise EmptyDataError()
+        variables: Dict[str, Any] = {}
+        sql = get_valuation_snapshot_sql(
+            FINANCE_FACTORS,
+            DAILY_FACTORS,
+            symbols,
+            dateType.today(),
+            variables,
         )
-        df = reader._run_query(df_sql)
+        df = await get_pooled_reader().arun_query(sql, variables=variables)
         if df is None or df.empty:
             raise EmptyDataError()
-        date_list = df["报告期"].tolist()
-        date_list = [
-            (
-                reader.get_adjacent_trade_day(i, 0).strftime("%Y.%m.%d")
-                if reader.get_adjacent_trade_day(i, 0).strftime("%Y.%m.%d") == i
-                else reader.get_adjacent_trade_day(i, 1).strftime("%Y.%m.%d")
-            )
-            for i in date_list
-        ]
-
-        daily_sql = get_specific_daily_sql(factors, symbols, date_list)
-        df_daily = reader._run_query(daily_sql)
-        df = pd.merge_asof(
-            df,
-            df_daily,
-            left_on=["报告期"],
-            right_on=["timestamp"],
-            direction="forward",
-        )
-
-        df = df.drop(columns=["timestamp_y", "symbol_y", "报告期", "timestamp_x"])
-        df = df.rename(columns={"symbol_x": "symbol"})
-        data = df.to_dict(orient="records")
-        return data
+        if symbols is None:
+            df = df[df["symbol"].isin(universe.symbols)]
+        return df
 
     @staticmethod
     def transform_data(
         query: XiaoYuanEquityValuationMultiplesQueryParams,
-        data: List[Dict],
+        data: "DataFrame",
         **kwargs: Any,
     ) -> List[XiaoYuanEquityValuationMultiplesData]:
         """Return the transformed data."""
-        return [XiaoYuanEquityValuationMultiplesData.model_validate(d) for d in data]
+        return EQUITY_VALUATION_MULTIPLES_POST_PROCESS.build(data)
@@ -1,6 +1,6 @@
 """XiaoYuan Financial Ratios Model."""
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.financial_ratios import (
@@ -9,14 +9,14 @@ from openbb_core.provider.standard_models.financial_ratios import (
 )
 from openbb_core.provider.utils.descriptions import QUERY_DESCRIPTIONS
 from openbb_core.provider.utils.errors import EmptyDataError
-from pydantic import Field, model_validator
+from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess, percent
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanFinancialRatiosQueryParams(FinancialRatiosQueryParams):
@@ -26,9 +26,10 @@ class XiaoYuanFinancialRatiosQueryParams(FinancialRatiosQueryParams):
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -252,17 +253,56 @@ class XiaoYuanFinancialRatiosData(FinancialRatiosData):
         default=None, description="Price fair value."
     )
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):  # pylint: disable=no-self-argument
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
+
+FINANCIAL_RATIOS_FACTORS = [
+    "流动比率",
+    "速动比率",
+    "固定资产周转率",
+    "总资产周转率",
+    "存货周转率",
+    "存货周转天数",
+    "应收账款周转率（含应收票据）",
+    "应收账款周转天数（含应收票据）",
+    "营业周期",
+    "应付账款周转率",
+    "应付账款周转天数（含应付票据）",
+    "净资产收益率ROE（摊薄）（百分比）",
+    "总资产净利率ROA（百分比）",
+    "投入资本回报率ROIC（百分比）",
+    "销售毛利率（百分比）",
+    "净利润比营业总收入（百分比）",
+    "营业利润比营业总收入（百分比）",
+    "净利润比利润总额",
+    "利润总额比息税前利润",
+    "息税前利润比营业总收入",
+    "资产负债率",
+    "产权比率",
+]
+
+FINANCIAL_RATIOS_PERCENT_FACTORS = [
+    "净资产收益率ROE（摊薄）（百分比）",
+    "总资产净利率ROA（百分比）",
+    "投入资本回报率ROIC（百分比）",
+    "销售毛利率（百分比）",
+    "净利润比营业总收入（百分比）",
+    "营业利润比营业总收入（百分比）",
+    "净利润比利润总额",
+    "利润总额比息税前利润",
+    "息税前利润比营业总收入",
+    "资产负债率",
+]
+
+FINANCIAL_RATIOS_POST_PROCESS = PostProcess(
+    XiaoYuanFinancialRatiosData,
+    dates=["报告期"],
+    scale=percent(FINANCIAL_RATIOS_PERCENT_FACTORS),
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
 
+@with_timings
 class XiaoYuanFinancialRatiosFetcher(
     Fetcher[
         XiaoYuanFinancialRatiosQueryParams,
@@ -277,69 +317,24 @@ class XiaoYuanFinancialRatiosFetcher(
         return XiaoYuanFinancialRatiosQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanFinancialRatiosQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanFinancialRatiosData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
-        FIN_METRICS_PER_SHARE = [
-            "流动比率",
-            "速动比率",
-            "固定资产周转率",
-            "总资产周转率",
-            "存货周转率",
-            "存货周转天数",
-            "应收账款周转率（含应收票据）",
-            "应收账款周转天数（含应收票据）",
-            "营业周期",
-            "应付账款周转率",
-            "应付账款周转天数（含应付票据）",
-            "净资产收益率ROE（摊薄）（百分比）",
-            "总资产净利率ROA（百分比）",
-            "投入资本回报率ROIC（百分比）",
-            "销售毛利率（百分比）",
-            "净利润比营业总收入（百分比）",
-            "营业利润比营业总收入（百分比）",
-            "净利润比利润总额",
-            "利润总额比息税前利润",
-            "息税前利润比营业总收入",
-            "资产负债率",
-            "产权比率",
-        ]
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(
-            FIN_METRICS_PER_SHARE, [query.symbol], report_month
-        )
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            FINANCIAL_RATIOS_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        columns_to_divide = [
-            "净资产收益率ROE（摊薄）（百分比）",
-            "总资产净利率ROA（百分比）",
-            "投入资本回报率ROIC（百分比）",
-            "销售毛利率（百分比）",
-            "净利润比营业总收入（百分比）",
-            "营业利润比营业总收入（百分比）",
-            "净利润比利润总额",
-            "利润总额比息税前利润",
-            "息税前利润比营业总收入",
-            "资产负债率",
-        ]
-        df[columns_to_divide] /= 100
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanFinancialRatiosQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanFinancialRatiosQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanFinancialRatiosData]:
         """Return the transformed data."""
-        return [XiaoYuanFinancialRatiosData.model_validate(d) for d in data]
+        return FINANCIAL_RATIOS_POST_PROCESS.build(data, query.symbol.split(","))
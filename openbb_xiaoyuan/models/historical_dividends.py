@@ -4,7 +4,7 @@ from datetime import (
     date as dateType,
     datetime,
 )
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from dateutil.relativedelta import relativedelta
 from openbb_core.provider.abstract.fetcher import Fetcher
@@ -12,10 +12,17 @@ from openbb_core.provider.standard_models.historical_dividends import (
     HistoricalDividendsData,
     HistoricalDividendsQueryParams,
 )
-from pandas.errors import EmptyDataError
+from openbb_core.provider.utils.errors import EmptyDataError
 from pydantic import Field, field_validator
 
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.helpers import convert_to_db_date_format
+from openbb_xiaoyuan.utils.postprocess import PostProcess
 from openbb_xiaoyuan.utils.references import get_dividend_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanHistoricalDividendsQueryParams(HistoricalDividendsQueryParams):
@@ -57,6 +64,14 @@ class XiaoYuanHistoricalDividendsData(HistoricalDividendsData):
         return dateType.fromisoformat(v) if v else None
 
 
+HISTORICAL_DIVIDENDS_POST_PROCESS = PostProcess(
+    XiaoYuanHistoricalDividendsData,
+    dates=["date", "recordDate", "paymentDate"],
+    sort_by="date",
+)
+
+
+@with_timings
 class XiaoYuanHistoricalDividendsFetcher(
     Fetcher[
         XiaoYuanHistoricalDividendsQueryParams,
@@ -81,36 +96,29 @@ class XiaoYuanHistoricalDividendsFetcher(
         return XiaoYuanHistoricalDividendsQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanHistoricalDividendsQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanHistoricalDividendsData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
+        reader = get_pooled_reader()
 
-        historical_start = reader.convert_to_db_date_format(query.start_date)
-        historical_end = reader.convert_to_db_date_format(query.end_date)
+        historical_start = convert_to_db_date_format(query.start_date)
+        historical_end = convert_to_db_date_format(query.end_date)
         dividend_sql = get_dividend_sql(
             historical_start, historical_end, query.symbol[-6:]
         )
 
-        df = reader._run_query(dividend_sql)
+        df = await reader.arun_query(dividend_sql)
         if df is None or df.empty:
             raise EmptyDataError()
-        df.sort_values(by="date", ascending=False, inplace=True)
-        date_columns = ["date", "recordDate", "paymentDate"]
-        for col in date_columns:
-            df[col] = df[col].dt.strftime("%Y-%m-%d")
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanHistoricalDividendsQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanHistoricalDividendsQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanHistoricalDividendsData]:
         """Return the transformed data."""
-
-        return [XiaoYuanHistoricalDividendsData.model_validate(d) for d in data]
+        return HISTORICAL_DIVIDENDS_POST_PROCESS.build(data)
@@ -1,15 +1,27 @@
 """XiaoYuan Historical Market Cap Model."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
-from jinniuai_data_store.reader import get_jindata_reader
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.historical_market_cap import (
     HistoricalMarketCapData,
     HistoricalMarketCapQueryParams,
 )
+from openbb_core.provider.utils.descriptions import QUERY_DESCRIPTIONS
 from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field
+
+from openbb_xiaoyuan.utils.arrow import to_arrow_table
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.helpers import convert_to_db_date_format
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.references import BAR_ENDS, get_resample_sql
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from pyarrow import Table
 
 
 class XiaoYuanHistoricalMarketCapQueryParams(HistoricalMarketCapQueryParams):
@@ -21,8 +33,16 @@ class XiaoYuanHistoricalMarketCapQueryParams(HistoricalMarketCapQueryParams):
 
     __json_schema_extra__ = {
         "symbol": {"multiple_items_allowed": True},
+        "interval": {"choices": ["1d", "1W", "1M", "1Q"]},
     }
 
+    interval: Literal["1d", "1W", "1M", "1Q"] = Field(
+        default="1d",
+        description=QUERY_DESCRIPTIONS.get("interval", "")
+        + " Weekly, monthly and quarterly values are the last of each bar,"
+        + " taken on the server.",
+    )
+
 
 class XiaoYuanHistoricalMarketCapData(HistoricalMarketCapData):
     """XiaoYuan Historical Market Cap Data."""
@@ -33,6 +53,12 @@ class XiaoYuanHistoricalMarketCapData(HistoricalMarketCapData):
     }
 
 
+HISTORICAL_MARKET_CAP_POST_PROCESS = PostProcess(
+    XiaoYuanHistoricalMarketCapData, sort_by="timestamp"
+)
+
+
+@with_timings
 class XiaoYuanHistoricalMarketCapFetcher(
     Fetcher[
         XiaoYuanHistoricalMarketCapQueryParams,
@@ -61,47 +87,65 @@ class XiaoYuanHistoricalMarketCapFetcher(
         return XiaoYuanHistoricalMarketCapQueryParams(**transformed_params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanHistoricalMarketCapQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanHistoricalMarketCapData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        reader = get_jindata_reader()
+        reader = get_pooled_reader()
 
-        historical_start = reader.convert_to_db_date_format(query.start_date)
-        historical_end = reader.convert_to_db_date_format(query.end_date)
+        historical_start = convert_to_db_date_format(query.start_date)
+        historical_end = convert_to_db_date_format(query.end_date)
 
         symbols_list = query.symbol.split(",")
 
         factors = list(XiaoYuanHistoricalMarketCapData.__alias_dict__.values())
         factors.remove(XiaoYuanHistoricalMarketCapData.__alias_dict__["date"])
 
+        resample = ""
+        if query.interval in BAR_ENDS:
+            resample = get_resample_sql(
+                "t", query.interval, {factor: "last" for factor in factors}
+            )
+
         historical_sql = f"""
             t = select timestamp, symbol, factor_name ,value 
             from loadTable("dfs://factors_6M", `cn_factors_1D) 
-            where factor_name in {factors} 
+            where factor_name in factorNames 
             and timestamp between {historical_start} 
             and {historical_end} 
-            and symbol in {symbols_list};
+            and symbol in symbols;
 
-            select value from t pivot by timestamp, symbol, factor_name;
+            t = select value from t pivot by timestamp, symbol, factor_name;
+            {resample}
+            t;
         """
-        df = reader._run_query(
+        df = await reader.arun_query(
             script=historical_sql,
+            variables={"factorNames": factors, "symbols": symbols_list},
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df.sort_values(by="timestamp", ascending=False, inplace=True)
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
         query: XiaoYuanHistoricalMarketCapQueryParams,
-        data: List[Dict],
+        data: "DataFrame",
         **kwargs: Any,
     ) -> List[XiaoYuanHistoricalMarketCapData]:
         """Return the transformed data."""
+        return HISTORICAL_MARKET_CAP_POST_PROCESS.build(data)
 
-        return [XiaoYuanHistoricalMarketCapData.model_validate(d) for d in data]
+    @staticmethod
+    def transform_arrow(
+        query: XiaoYuanHistoricalMarketCapQueryParams,
+        data: "DataFrame",
+    ) -> "Table":
+        """Return the extracted data as an Arrow table, skipping the models."""
+        return to_arrow_table(
+            XiaoYuanHistoricalMarketCapData,
+            HISTORICAL_MARKET_CAP_POST_PROCESS.apply(data),
+        )
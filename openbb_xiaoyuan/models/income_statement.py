@@ -1,7 +1,7 @@
 """ XiaoYuan Income Statement Model."""
 
 # pylint: disable=unused-argument
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.income_statement import (
@@ -13,23 +13,24 @@ from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
 )
 from openbb_core.provider.utils.errors import EmptyDataError
-from pydantic import Field, model_validator
+from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanIncomeStatementQueryParams(IncomeStatementQueryParams):
     """XiaoYuan Income Statement Query."""
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "ytd"],
-        }
+        },
     }
 
     period: Literal["annual", "ytd"] = Field(
@@ -102,17 +103,35 @@ class XiaoYuanIncomeStatementData(IncomeStatementData):
         description="Depreciation and amortization.", default=None
     )
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):  # pylint: disable=no-self-argument
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
+
+INCOME_STATEMENT_FACTORS = [
+    "营业总收入",
+    "营业总成本",
+    "营业成本",
+    "研发费用",
+    "每股收益",
+    "稀释每股收益",
+    "综合收益总额",
+    "其中：利息收入",
+    "利息支出",
+    "其他收益",
+    "持续经营净利润",
+    "终止经营净利润",
+    "息税折旧摊销前利润",
+    "折旧与摊销",
+]
+
+INCOME_STATEMENT_POST_PROCESS = PostProcess(
+    XiaoYuanIncomeStatementData,
+    drop=["cik"],
+    dates=["报告期"],
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
 
+@with_timings
 class XiaoYuanIncomeStatementFetcher(
     Fetcher[
         XiaoYuanIncomeStatementQueryParams,
@@ -131,44 +150,18 @@ class XiaoYuanIncomeStatementFetcher(
         query: XiaoYuanIncomeStatementQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[Dict]:
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        factors = [
-            "营业总收入",
-            "营业总成本",
-            "营业成本",
-            "研发费用",
-            "每股收益",
-            "稀释每股收益",
-            "综合收益总额",
-            "其中：利息收入",
-            "利息支出",
-            "其他收益",
-            "持续经营净利润",
-            "终止经营净利润",
-            "息税折旧摊销前利润",
-            "折旧与摊销",
-        ]
-        reader = get_jindata_reader()
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(factors, [query.symbol], report_month)
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+    ) -> "DataFrame":
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            INCOME_STATEMENT_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        data = df.to_dict(orient="records")
-        return data
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanIncomeStatementQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanIncomeStatementQueryParams, data: "DataFrame", **kwargs: Any
     ) -> List[XiaoYuanIncomeStatementData]:
         """Return the transformed data."""
-        for result in data:
-            result.pop("symbol", None)
-            result.pop("cik", None)
-        return [XiaoYuanIncomeStatementData.model_validate(d) for d in data]
+        return INCOME_STATEMENT_POST_PROCESS.build(data, query.symbol.split(","))
@@ -1,6 +1,6 @@
 """XiaoYuan Income Statement Growth Model."""
 
-from typing import Any, Dict, List, Literal, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.income_statement_growth import (
@@ -11,15 +11,15 @@ from openbb_core.provider.utils.descriptions import (
     DATA_DESCRIPTIONS,
     QUERY_DESCRIPTIONS,
 )
-from pandas.errors import EmptyDataError
-from pydantic import Field, model_validator
+from openbb_core.provider.utils.errors import EmptyDataError
+from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-    get_query_finance_sql,
-    get_report_month,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance
+from openbb_xiaoyuan.utils.postprocess import PostProcess, percent
+from openbb_xiaoyuan.utils.timings import with_timings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanIncomeStatementGrowthQueryParams(IncomeStatementGrowthQueryParams):
@@ -29,9 +29,10 @@ class XiaoYuanIncomeStatementGrowthQueryParams(IncomeStatementGrowthQueryParams)
     """
 
     __json_schema_extra__ = {
+        "symbol": {"multiple_items_allowed": True},
         "period": {
             "choices": ["annual", "quarter"],
-        }
+        },
     }
 
     period: Literal["annual", "quarter"] = Field(
@@ -205,17 +206,25 @@ class XiaoYuanIncomeStatementGrowthData(IncomeStatementGrowthData):
         json_schema_extra={"x-unit_measurement": "percent", "x-frontend_multiply": 100},
     )
 
-    @model_validator(mode="before")
-    @classmethod
-    def replace_zero(cls, values):
-        """Check for zero values and replace with None."""
-        return (
-            {k: None if v == 0 else v for k, v in values.items()}
-            if isinstance(values, dict)
-            else values
-        )
+
+INCOME_STATEMENT_GROWTH_FACTORS = [
+    "营业总收入同比增长率（百分比）",
+    "营业收入同比增长率",
+    "基本每股收益同比增长率（百分比）",
+    "稀释每股收益同比增长率（百分比）",
+]
+
+INCOME_STATEMENT_GROWTH_POST_PROCESS = PostProcess(
+    XiaoYuanIncomeStatementGrowthData,
+    dates=["报告期"],
+    scale=percent(INCOME_STATEMENT_GROWTH_FACTORS),
+    zero_to_none=True,
+    sort_by="报告期",
+    by_symbols=True,
+)
 
 
+@with_timings
 class XiaoYuanIncomeStatementGrowthFetcher(
     Fetcher[
         XiaoYuanIncomeStatementGrowthQueryParams,
@@ -232,40 +241,26 @@ class XiaoYuanIncomeStatementGrowthFetcher(
         return XiaoYuanIncomeStatementGrowthQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         # pylint: disable=unused-argument
         query: XiaoYuanIncomeStatementGrowthQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[XiaoYuanIncomeStatementGrowthData]:
+    ) -> "DataFrame":
         """Extract the data from the XiaoYuan Finance endpoints."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        reader = get_jindata_reader()
-        FIN_METRICS_PER_SHARE = [
-            "营业总收入同比增长率（百分比）",
-            "营业收入同比增长率",
-            "基本每股收益同比增长率（百分比）",
-            "稀释每股收益同比增长率（百分比）",
-        ]
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(
-            FIN_METRICS_PER_SHARE, [query.symbol], report_month
-        )
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        symbols = query.symbol.split(",")
+        df = await aquery_finance(
+            INCOME_STATEMENT_GROWTH_FACTORS, symbols, query.period, query.limit
         )
         if df is None or df.empty:
             raise EmptyDataError()
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        columns_to_divide = FIN_METRICS_PER_SHARE
-        df[columns_to_divide] /= 100
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        return df.to_dict(orient="records")
+        return df
 
     @staticmethod
     def transform_data(
-        query: XiaoYuanIncomeStatementGrowthQueryParams, data: List[Dict], **kwargs: Any
+        query: XiaoYuanIncomeStatementGrowthQueryParams,
+        data: "DataFrame",
+        **kwargs: Any,
     ) -> List[XiaoYuanIncomeStatementGrowthData]:
         """Return the transformed data."""
-        return [XiaoYuanIncomeStatementGrowthData.model_validate(d) for d in data]
+        return INCOME_STATEMENT_GROWTH_POST_PROCESS.build(data, query.symbol.split(","))
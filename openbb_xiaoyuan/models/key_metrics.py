@@ -2,10 +2,9 @@
 
 # pylint: disable=unused-argument
 
-from typing import Any, Dict, List, Optional, Literal
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Literal
 from warnings import warn
 
-import pandas as pd
 from openbb_core.provider.abstract.fetcher import Fetcher
 from openbb_core.provider.standard_models.key_metrics import (
     KeyMetricsData,
@@ -18,13 +17,14 @@ from openbb_core.provider.utils.descriptions import (
 from openbb_core.provider.utils.errors import EmptyDataError
 from pydantic import Field
 
-from openbb_xiaoyuan.utils.references import (
-    get_report_month,
-    get_query_finance_sql,
-    extractMonthDayFromTime,
-    getFiscalQuarterFromTime,
-    get_specific_daily_sql,
-)
+from openbb_xiaoyuan.utils.finance import aquery_finance_asof_daily
+from openbb_xiaoyuan.utils.models import build_models
+from openbb_xiaoyuan.utils.postprocess import PostProcess
+from openbb_xiaoyuan.utils.timings import with_timings
+from openbb_xiaoyuan.utils.universe import aget_symbol_universe
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class XiaoYuanKeyMetricsQueryParams(KeyMetricsQueryParams):
@@ -121,6 +121,37 @@ class XiaoYuanKeyMetricsData(KeyMetricsData):
     dividend_yield: Optional[float] = Field(description="Dividend yield.", default=None)
 
 
+KEY_METRICS_FACTORS = [
+    "每股收益EPSTTM（元）",
+    "营运资本",
+    "毛利",
+    "息税前利润",
+    "企业自由现金流量",
+    "每股收益",
+    "存货周转率",
+    "存货周转天数",
+    "应收账款周转率（含应收票据）",
+    "应收账款周转天数（含应收票据）",
+    "应付账款周转率",
+    "应付账款周转天数（含应付票据）",
+    "净资产收益率ROE（摊薄）（百分比）",
+    "总资产净利率ROA（百分比）",
+    "投入资本回报率ROIC（百分比）",
+    "流动比率",
+    "速动比率",
+    "息税折旧摊销前利润",
+    "总市值",
+    "市盈率（静态）",
+    "市净率（静态）",
+    "股息率",
+]
+
+KEY_METRICS_POST_PROCESS = PostProcess(
+    XiaoYuanKeyMetricsData, dates=["报告期"], sort_by="报告期", by_symbols=True
+)
+
+
+@with_timings
 class XiaoYuanKeyMetricsFetcher(
     Fetcher[
         XiaoYuanKeyMetricsQueryParams,
@@ -144,103 +175,28 @@ class XiaoYuanKeyMetricsFetcher(
         query: XiaoYuanKeyMetricsQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
-    ) -> List[Dict]:
+    ) -> "DataFrame":
         """Return the raw data from the  XiaoYuan endpoint."""
-        from jinniuai_data_store.reader import get_jindata_reader
-
-        factors = [
-            "每股收益EPSTTM（元）",
-            "营运资本",
-            "毛利",
-            "息税前利润",
-            "企业自由现金流量",
-            "每股收益",
-            "存货周转率",
-            "存货周转天数",
-            "应收账款周转率（含应收票据）",
-            "应收账款周转天数（含应收票据）",
-            "应付账款周转率",
-            "应付账款周转天数（含应付票据）",
-            "净资产收益率ROE（摊薄）（百分比）",
-            "总资产净利率ROA（百分比）",
-            "投入资本回报率ROIC（百分比）",
-            "流动比率",
-            "速动比率",
-            "息税折旧摊销前利润",
-            "总市值",
-            "市盈率（静态）",
-            "市净率（静态）",
-            "股息率",
-        ]
-        reader = get_jindata_reader()
         symbols = query.symbol.split(",")
-        stock_listing_info = reader.get_stocks().symbol.tolist()
-        symbols = [s for s in symbols if s in stock_listing_info]
+        symbols = (await aget_symbol_universe()).filter(symbols)
         if not symbols:
             raise EmptyDataError()
-        report_month = get_report_month(query.period, -query.limit)
-        finance_sql = get_query_finance_sql(factors, symbols, report_month)
-        df = reader._run_query(
-            script=extractMonthDayFromTime + getFiscalQuarterFromTime + finance_sql,
+        df = await aquery_finance_asof_daily(
+            KEY_METRICS_FACTORS, KEY_METRICS_FACTORS, symbols, query.period, query.limit
         )
-        df = df.sort_values(by=["报告期"])
         if df is None or df.empty:
             raise EmptyDataError()
-        date_list = df["报告期"].tolist()
-        date_list = [
-            reader.get_adjacent_trade_day(i, -1).strftime("%Y.%m.%d") for i in date_list
-        ]
-
-        daily_sql = get_specific_daily_sql(factors, symbols, date_list)
-        df_daily = reader._run_query(daily_sql)
-        df = pd.merge_asof(
-            df,
-            df_daily,
-            left_on=["报告期"],
-            right_on=["timestamp"],
-            direction="backward",
-        )
-        # 删除不必要的列
-        df = df.drop(columns=["timestamp_y", "symbol_y"])
-        df = df.rename(columns={"timestamp_x": "timestamp", "symbol_x": "symbol"})
-        df["报告期"] = df["报告期"].dt.strftime("%Y-%m-%d")
-        df.sort_values(by="报告期", ascending=False, inplace=True)
-        data = df.to_dict(orient="records")
-        return data
+        return df
 
     @staticmethod
     def transform_data(
         query: XiaoYuanKeyMetricsQueryParams,
-        data: List[Dict],
+        data: "DataFrame",
         **kwargs: Any,
     ) -> List[XiaoYuanKeyMetricsData]:
         """Validate and transform the data."""
-
-        # Sort the results by the order of the symbols in the query.
-        symbols = query.symbol.split(",")
-        data = sorted(
-            data,
-            key=(
-                lambda item: (
-                    symbols.index(item["symbol"])
-                    if item["symbol"] in symbols
-                    else len(symbols)
-                )
-            ),
-        )
-
-        results: List[XiaoYuanKeyMetricsData] = []
-        for item in data:
-
-            if item.get("总市值") is None or isinstance(item.get("总市值"), dict):
-                warn(f"Symbol Error: No data found for {item.get('symbol')}")
-                continue
-
-            for key, value in item.copy().items():
-                # A bad response in a field will return a dict here, so we remove it.
-                if isinstance(value, dict):
-                    _ = item.pop(key)
-
-            results.append(XiaoYuanKeyMetricsData.model_validate(item))
-
-        return results
+        df = KEY_METRICS_POST_PROCESS.apply(data, query.symbol.split(","))
+        missing = df["总市值"].isna()
+        for symbol in df.loc[missing, "symbol"]:
+            warn(f"Symbol Error: No data found for {symbol}")
+        return build_models(XiaoYuanKeyMetricsData, df[~missing])
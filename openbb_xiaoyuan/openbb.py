@@ -5,10 +5,13 @@ from typing import List, Optional, Union
 
 from openbb_core.app.static.app_factory import BaseApp as _BaseApp
 from openbb_core.app.static.app_factory import create_app as _create_app
-from openbb_core.app.static.package_builder import PackageBuilder as _PackageBuilder
+
+from openbb_xiaoyuan.utils.build import auto_build as _auto_build
+from openbb_xiaoyuan.utils.build import extension_fingerprint as _fingerprint
+from openbb_xiaoyuan.utils.build import write_fingerprint as _write_fingerprint
 
 _this_dir = Path(__file__).parent.resolve()
-_PackageBuilder(_this_dir).auto_build()
+_auto_build(_this_dir)
 
 
 def build(
@@ -29,7 +32,13 @@ def build(
     verbose : bool, optional
         Enable/disable verbose mode
     """
-    _PackageBuilder(_this_dir, lint, verbose).build(modules)
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.app.static.package_builder import PackageBuilder
+
+    PackageBuilder(_this_dir, lint, verbose).build(modules)
+    # A partial build leaves the other modules as stale as they were.
+    if modules is None:
+        _write_fingerprint(_this_dir, _fingerprint())
 
 
 try:
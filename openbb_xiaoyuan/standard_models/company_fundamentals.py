@@ -0,0 +1,43 @@
+"""Company Fundamentals Standard Model."""
+
+from datetime import date as dateType
+from typing import Optional
+
+from openbb_core.provider.abstract.data import Data
+from openbb_core.provider.abstract.query_params import QueryParams
+from openbb_core.provider.utils.descriptions import (
+    DATA_DESCRIPTIONS,
+    QUERY_DESCRIPTIONS,
+)
+from pydantic import Field, NonNegativeInt, field_validator
+
+
+class CompanyFundamentalsQueryParams(QueryParams):
+    """Company Fundamentals Query."""
+
+    symbol: str = Field(description=QUERY_DESCRIPTIONS.get("symbol", ""))
+    limit: Optional[NonNegativeInt] = Field(
+        default=5, description=QUERY_DESCRIPTIONS.get("limit", "")
+    )
+
+    @field_validator("symbol", mode="before", check_fields=False)
+    @classmethod
+    def to_upper(cls, v: str):
+        """Convert field to uppercase."""
+        return v.upper()
+
+
+class CompanyFundamentalsData(Data):
+    """Company Fundamentals Data.
+
+    One record per symbol and reporting period, bundling every statement.
+    """
+
+    symbol: str = Field(description=DATA_DESCRIPTIONS.get("symbol", ""))
+    period_ending: dateType = Field(description="The end date of the reporting period.")
+    fiscal_period: Optional[str] = Field(
+        description="The fiscal period of the report.", default=None
+    )
+    fiscal_year: Optional[int] = Field(
+        description="The fiscal year of the fiscal period.", default=None
+    )
@@ -0,0 +1,223 @@
+"""XiaoYuan price adjustment factors."""
+
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import date as dateType
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from openbb_xiaoyuan.utils.calendar import to_datetime64
+from openbb_xiaoyuan.utils.connection import get_pooled_reader
+from openbb_xiaoyuan.utils.helpers import batched
+from openbb_xiaoyuan.utils.prices import ADJ_CLOSE
+from openbb_xiaoyuan.utils.references import get_adjustment_factors_sql
+from openbb_xiaoyuan.utils.timings import timed
+
+CLOSE = "收盘价（不复权）"
+PRICE_COLUMNS = ("开盘价（不复权）", "最高价（不复权）", "最低价（不复权）", CLOSE)
+ADJUSTMENTS = ("none", "forward", "backward")
+ADJUSTMENT_MAX_SYMBOLS = int(os.environ.get("XIAOYUAN_ADJUSTMENT_MAX_SYMBOLS", 6000))
+
+FIRST_DAY = dateType(1990, 1, 1)
+BATCH_SYMBOLS = 500
+# Relative factor moves below this are rounding noise, not ex-dates.
+TOLERANCE = 1e-9
+
+
+class Factors:
+    """Backward adjustment factors of one symbol, as a step function.
+
+    `factors[i]` applies from `days[i]` until the next change, relative to
+    the symbol's first trading day; `until` is the last day with a price.
+    """
+
+    __slots__ = ("days", "factors", "until", "checked_on")
+
+    def __init__(self, days: Any, factors: Any, until: Any, checked_on: dateType):
+        """Initialize the factors."""
+        self.days = days
+        self.factors = factors
+        self.until = until
+        self.checked_on = checked_on
+
+    def at(self, days: Any, strictly_before: bool = False) -> np.ndarray:
+        """Return the factor of each day, or of the trading day before it."""
+        side = "left" if strictly_before else "right"
+        index = np.searchsorted(self.days, to_datetime64(days), side=side) - 1
+        return np.where(
+            index >= 0, self.factors[np.clip(index, 0, None)], np.nan
+        ).astype(float)
+
+
+def _steps(factors: np.ndarray, tolerance: float = TOLERANCE) -> np.ndarray:
+    """Return the positions where the factor moves by more than `tolerance`."""
+    keep = [0]
+    for i in range(1, len(factors)):
+        if abs(factors[i] - factors[keep[-1]]) > tolerance * factors[keep[-1]]:
+            keep.append(i)
+    return np.asarray(keep)
+
+
+class AdjustmentFactors:
+    """Per-symbol adjustment factors, loaded once and then only extended.
+
+    A symbol's factor, the forward-adjusted close over the unadjusted one,
+    only moves on ex-dates, and every new ex-date rescales all the forward
+    factors before it. Taken relative to the first trading day instead, the
+    factors never change once published: they are kept as backward step
+    functions, extended at most once a day from the last day with a price,
+    and forward factors are the backward ones over the latest.
+    """
+
+    def __init__(self, max_symbols: int = ADJUSTMENT_MAX_SYMBOLS):
+        """Initialize an empty cache holding at most `max_symbols` symbols."""
+        self.max_symbols = max_symbols
+        self._entries: "OrderedDict[str, Factors]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, symbol: object) -> bool:
+        """Check whether a symbol has cached factors."""
+        return symbol in self._entries
+
+    def _store(self, symbol: str, entry: Factors) -> None:
+        with self._lock:
+            self._entries[symbol] = entry
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_symbols:
+                self._entries.popitem(last=False)
+
+    async def _fetch(self, symbols: List[str], after: Any, until: Any) -> Any:
+        frames = []
+        for batch in batched(symbols, BATCH_SYMBOLS):
+            variables: Dict[str, Any] = {}
+            sql = get_adjustment_factors_sql(
+                CLOSE, ADJ_CLOSE, list(batch), after, until, variables, TOLERANCE
+            )
+            df = await get_pooled_reader().arun_query(sql, variables=variables)
+            if df is not None and not df.empty:
+                frames.append(df)
+        if not frames:
+            return {}
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        df = pd.concat(frames, ignore_index=True).sort_values("timestamp")
+        return {
+            symbol: (to_datetime64(g["timestamp"]), g["factor"].to_numpy(dtype=float))
+            for symbol, g in df.groupby("symbol", sort=False)
+        }
+
+    async def aget(self, symbols: List[str]) -> Dict[str, Factors]:
+        """Return the factors of `symbols`, up to date with the latest prices."""
+        today = dateType.today()
+        reload: List[str] = []
+        extend: Dict[np.datetime64, List[str]] = defaultdict(list)
+        for symbol in dict.fromkeys(symbols):
+            entry = self._entries.get(symbol)
+            if entry is None:
+                reload.append(symbol)
+            elif entry.checked_on != today:
+                extend[entry.until].append(symbol)
+
+        for until, batch in extend.items():
+            with timed("adjustment_factors", symbols=len(batch)):
+                fetched = await self._fetch(batch, until, today)
+            for symbol in batch:
+                entry = self._entries[symbol]
+                if symbol not in fetched:
+                    entry.checked_on = today
+                    continue
+                days, factors = fetched[symbol]
+                if days[0] != until:
+                    # The last known day is gone, so the two runs cannot be chained.
+                    reload.append(symbol)
+                    continue
+                factors = entry.factors[-1] * factors / factors[0]
+                days = np.concatenate([entry.days[-1:], days[1:]])
+                factors = np.concatenate([entry.factors[-1:], factors[1:]])
+                keep = _steps(factors)[1:]
+                self._store(
+                    symbol,
+                    Factors(
+                        np.concatenate([entry.days, days[keep]]),
+                        np.concatenate([entry.factors, factors[keep]]),
+                        days[-1],
+                        today,
+                    ),
+                )
+
+        if reload:
+            with timed("adjustment_factors", symbols=len(reload)):
+                fetched = await self._fetch(reload, FIRST_DAY, today)
+            for symbol, (days, factors) in fetched.items():
+                factors = factors / factors[0]
+                keep = _steps(factors)
+                self._store(symbol, Factors(days[keep], factors[keep], days[-1], today))
+
+        return {s: self._entries[s] for s in symbols if s in self._entries}
+
+    def clear(self) -> None:
+        """Drop every cached symbol."""
+        with self._lock:
+            self._entries.clear()
+
+
+def adjust_prices(df: Any, factors: Dict[str, Factors], adjustment: str) -> Any:
+    """Return the daily rows with their OHLC and change columns adjusted.
+
+    `forward` keeps the latest prices and scales the earlier ones,
+    `backward` keeps the first prices and scales the later ones. The
+    adjusted close is set to the adjusted close of the same adjustment, so
+    it matches `close` either way. Volume is left unadjusted: the factors
+    also move on cash dividends, which change no share count. Rows of a
+    symbol without factors come back as NaN.
+    """
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(f"Invalid adjustment: {adjustment}")
+    if adjustment == "none" or df.empty:
+        return df
+    days = to_datetime64(df["timestamp"])
+    scale = np.full(len(df), np.nan)
+    previous = np.full(len(df), np.nan)
+    for symbol, rows in df.groupby("symbol", sort=False).indices.items():
+        entry = factors.get(symbol)
+        if entry is None:
+            continue
+        base = entry.factors[-1] if adjustment == "forward" else 1.0
+        scale[rows] = entry.at(days[rows]) / base
+        previous[rows] = entry.at(days[rows], strictly_before=True) / base
+
+    df = df.copy()
+    for column in PRICE_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].to_numpy(dtype=float) * scale
+    if ADJ_CLOSE in df.columns and CLOSE in df.columns:
+        df[ADJ_CLOSE] = df[CLOSE]
+    if "ref_close" in df.columns:
+        df["ref_close"] = df["ref_close"].to_numpy(dtype=float) * previous
+        df["change"] = df[CLOSE] - df["ref_close"]
+        df["changeOverTime"] = df["change"] / df["ref_close"]
+    return df
+
+
+_adjustment_factors: Optional[AdjustmentFactors] = None
+_adjustment_factors_lock = threading.Lock()
+
+
+def get_adjustment_factors() -> AdjustmentFactors:
+    """Return the provider-wide adjustment factor cache."""
+    global _adjustment_factors  # pylint: disable=global-statement
+    if _adjustment_factors is None:
+        with _adjustment_factors_lock:
+            if _adjustment_factors is None:
+                _adjustment_factors = AdjustmentFactors()
+    return _adjustment_factors
+
+
+def set_adjustment_factors(factors: Optional[AdjustmentFactors]) -> None:
+    """Replace the provider-wide adjustment factor cache."""
+    global _adjustment_factors  # pylint: disable=global-statement
+    with _adjustment_factors_lock:
+        _adjustment_factors = factors
@@ -0,0 +1,146 @@
+"""XiaoYuan columnar Arrow output."""
+
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Type
+
+from openbb_core.provider.abstract.data import Data
+
+from openbb_xiaoyuan.utils.models import field_kind, rename_columns
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from fastapi import APIRouter
+    from fastapi.responses import Response
+
+MEDIA_TYPES = {
+    "ipc": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, which the Arrow output mode requires."""
+    try:
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Arrow output; "
+            "install it with `pip install pyarrow`."
+        ) from e
+    return pa
+
+
+def to_arrow_table(model: Type[Data], df: Any) -> "pa.Table":
+    """Convert a result frame to an Arrow table named after the model fields.
+
+    Numeric and timestamp columns keep their native types; fields typed as
+    plain dates are stored as `date32`. A list of frames is converted chunk
+    by chunk and concatenated.
+    """
+    pa = _import_pyarrow()
+    if isinstance(df, list):
+        return pa.concat_tables(
+            [to_arrow_table(model, chunk) for chunk in df], promote_options="default"
+        )
+    df = rename_columns(model, df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name, field in model.model_fields.items():
+        if name not in table.column_names or field_kind(field.annotation) != "date":
+            continue
+        i = table.column_names.index(name)
+        if pa.types.is_timestamp(table.schema.field(i).type):
+            table = table.set_column(i, name, table.column(i).cast(pa.date32()))
+    metadata = {**(table.schema.metadata or {}), b"model": model.__name__.encode()}
+    return table.replace_schema_metadata(metadata)
+
+
+def to_ipc_bytes(table: "pa.Table") -> bytes:
+    """Serialize a table in the Arrow IPC streaming format."""
+    pa = _import_pyarrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet_bytes(table: "pa.Table", compression: str = "zstd") -> bytes:
+    """Serialize a table as a Parquet file."""
+    pa = _import_pyarrow()
+    # pylint: disable=import-outside-toplevel
+    from pyarrow import parquet
+
+    sink = pa.BufferOutputStream()
+    parquet.write_table(table, sink, compression=compression)
+    return sink.getvalue().to_pybytes()
+
+
+def from_ipc_bytes(data: bytes) -> "pa.Table":
+    """Read a table written by `to_ipc_bytes`."""
+    pa = _import_pyarrow()
+    return pa.ipc.open_stream(data).read_all()
+
+
+async def afetch_arrow(
+    fetcher: Any,
+    params: Dict[str, Any],
+    credentials: Optional[Dict[str, str]] = None,
+    output_format: Literal["ipc", "parquet"] = "ipc",
+) -> "Response":
+    """Run a fetcher and return its result as an Arrow IPC stream or Parquet file.
+
+    For bulk consumers that want columns rather than an OBBject: the models
+    are never built, `fetcher.transform_arrow(query, data)` converts the
+    extracted frames instead. The response can be returned as is from a
+    FastAPI route.
+    """
+    # pylint: disable=import-outside-toplevel
+    from fastapi.responses import Response
+
+    if output_format not in MEDIA_TYPES:
+        raise ValueError(f"Invalid Arrow output format: {output_format}")
+    query = fetcher.transform_query(dict(params))
+    data = await fetcher.aextract_data(query, credentials)
+    table = fetcher.transform_arrow(query, data)
+    if output_format == "parquet":
+        content = to_parquet_bytes(table)
+    else:
+        content = to_ipc_bytes(table)
+    return Response(content=content, media_type=MEDIA_TYPES[output_format])
+
+
+def create_arrow_router() -> "APIRouter":
+    """Return the FastAPI routes serving fetcher results as Arrow.
+
+    `GET /arrow/{model}` runs the provider's fetcher of `model` on the query
+    string, validated by its query params, and answers with an Arrow IPC
+    stream, or a Parquet file for `output_format=parquet`. Only fetchers
+    with a `transform_arrow` are served. `openbb_xiaoyuan.api` mounts these
+    routes on the OpenBB REST API.
+    """
+    # pylint: disable=import-outside-toplevel
+    from fastapi import APIRouter, HTTPException, Request
+    from fastapi.responses import Response
+    from pydantic import ValidationError
+
+    from openbb_xiaoyuan import openbb_xiaoyuan_provider
+
+    fetchers = openbb_xiaoyuan_provider.fetcher_dict
+    router = APIRouter(prefix="/arrow", tags=["arrow"])
+
+    @router.get("/{model}", response_class=Response)
+    async def arrow(
+        model: str,
+        request: Request,
+        output_format: Literal["ipc", "parquet"] = "ipc",
+    ) -> "Response":
+        """Return the results of a XiaoYuan fetcher as Arrow IPC or Parquet."""
+        if model not in fetchers or not hasattr(fetchers[model], "transform_arrow"):
+            raise HTTPException(404, f"No Arrow output for {model}.")
+        params = {k: v for k, v in request.query_params.items() if k != "output_format"}
+        try:
+            return await afetch_arrow(
+                fetchers[model], params, output_format=output_format
+            )
+        except ValidationError as e:
+            raise HTTPException(422, str(e)) from e
+
+    return router
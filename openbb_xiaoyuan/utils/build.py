@@ -0,0 +1,88 @@
+"""XiaoYuan extension package build check."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+FINGERPRINT_FILE = Path("assets") / "fingerprint"
+
+
+def extension_fingerprint() -> str:
+    """Return a digest of openbb-core's version and the installed extensions.
+
+    These are what the static package is built from, so the package needs
+    a rebuild exactly when the digest changes. Reading the entry points
+    takes milliseconds, against seconds for the builder's route map.
+    """
+    # pylint: disable=import-outside-toplevel
+    from importlib.metadata import entry_points, version
+
+    from openbb_core.app.extension_loader import OpenBBGroups
+
+    installed = entry_points()
+    lines = [f"openbb-core@{version('openbb-core')}"]
+    for group in OpenBBGroups.groups():
+        lines.extend(
+            sorted(
+                f"{group}:{e.name}@{getattr(e.dist, 'version', '')}"
+                for e in installed.select(group=group)
+            )
+        )
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def read_fingerprint(directory: Path) -> Optional[str]:
+    """Return the fingerprint saved with the built package, if any."""
+    try:
+        return (directory / FINGERPRINT_FILE).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def write_fingerprint(directory: Path, fingerprint: str) -> bool:
+    """Save the fingerprint next to the built package.
+
+    A package installed read-only keeps working, it only rebuilds on every
+    import, so a failed write is logged rather than raised. Returns whether
+    the fingerprint was saved.
+    """
+    path = directory / FINGERPRINT_FILE
+    # Written aside and renamed, so concurrent workers never read half a file.
+    temporary = path.with_name(f"{path.name}.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(fingerprint, encoding="utf-8")
+        os.replace(temporary, path)
+    except OSError as error:
+        # pylint: disable=import-outside-toplevel
+        from loguru import logger
+
+        logger.warning(f"Could not save the XiaoYuan build fingerprint: {error}")
+        if temporary.exists():
+            temporary.unlink()
+        return False
+    return True
+
+
+def auto_build(directory: Path) -> bool:
+    """Run `PackageBuilder.auto_build` unless the extensions are unchanged.
+
+    Honours `OPENBB_AUTO_BUILD`. The fingerprint is only saved once the
+    builder returns, so a failed build is retried on the next import.
+    Returns whether the builder ran.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.env import Env
+
+    if not Env().AUTO_BUILD:
+        return False
+    fingerprint = extension_fingerprint()
+    if read_fingerprint(directory) == fingerprint:
+        return False
+
+    from openbb_core.app.static.package_builder import PackageBuilder
+
+    PackageBuilder(directory).auto_build()
+    write_fingerprint(directory, fingerprint)
+    return True
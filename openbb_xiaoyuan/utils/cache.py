@@ -0,0 +1,197 @@
+"""XiaoYuan two-tier DataFrame cache."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+DEFAULT_MAX_BYTES = int(os.environ.get("XIAOYUAN_CACHE_MAX_BYTES", 256 * 1024**2))
+DEFAULT_MAX_DISK_BYTES = int(
+    os.environ.get("XIAOYUAN_CACHE_MAX_DISK_BYTES", 2 * 1024**3)
+)
+DEFAULT_CACHE_DIR = os.environ.get(
+    "XIAOYUAN_CACHE_DIR", str(Path.home() / ".cache" / "openbb_xiaoyuan")
+)
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable cache key from normalized query parts."""
+    normalized = [
+        sorted(set(part)) if isinstance(part, (list, tuple, set)) else part
+        for part in parts
+    ]
+    return hashlib.sha1(repr(normalized).encode("utf-8")).hexdigest()
+
+
+def _frame_nbytes(df: Any) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameCache:
+    """In-process LRU of DataFrames bounded by bytes, backed by Arrow files on disk.
+
+    Every entry is stored with a ``version``; a lookup with a different
+    version is a miss, so advancing the version invalidates both tiers. The
+    disk tier uses the Feather (Arrow IPC) format and is read memory-mapped;
+    it is disabled when ``pyarrow`` is not installed or ``directory`` is None.
+    Files are touched when read, and the least recently used ones are deleted
+    once the directory holds more than ``max_disk_bytes``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[str] = DEFAULT_CACHE_DIR,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """Initialize the cache."""
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory: Optional[Path] = None
+        if directory:
+            try:
+                import pyarrow  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+
+                self.directory = Path(directory) / name
+            except ImportError:
+                logger.debug("pyarrow is not installed, disk cache disabled.")
+        self._memory: "OrderedDict[str, Tuple[Any, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    def _path(self, key: str, version: Any) -> Path:
+        tag = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:12]
+        return self.directory / f"{key}-{tag}.arrow"  # type: ignore
+
+    def _put_memory(self, key: str, version: Any, df: Any) -> None:
+        nbytes = _frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._bytes -= self._memory.pop(key)[2]
+            self._memory[key] = (version, df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._memory.popitem(last=False)
+                self._bytes -= evicted
+                self._stats["evictions"] += 1
+
+    def get(self, key: str, version: Any) -> Optional[Any]:
+        """Return a copy of the cached frame, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == version:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[1].copy()
+
+        if self.directory is not None:
+            path = self._path(key, version)
+            if path.exists():
+                # pylint: disable=import-outside-toplevel
+                from pyarrow import feather
+
+                try:
+                    df = feather.read_table(path, memory_map=True).to_pandas()
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning(f"Discarding unreadable cache file {path}.")
+                    path.unlink(missing_ok=True)
+                else:
+                    try:
+                        os.utime(path)
+                    except OSError:
+                        pass
+                    self._put_memory(key, version, df)
+                    with self._lock:
+                        self._stats["disk_hits"] += 1
+                    return df.copy()
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, version: Any, df: Any) -> None:
+        """Store a frame in both tiers, replacing older versions."""
+        df = df.reset_index(drop=True)
+        self._put_memory(key, version, df)
+        if self.directory is None:
+            return
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        from pyarrow import feather
+
+        path = self._path(key, version)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for stale in self.directory.glob(f"{key}-*.arrow"):
+                stale.unlink(missing_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            feather.write_feather(
+                pa.Table.from_pandas(df, preserve_index=False),
+                tmp,
+                compression="uncompressed",
+            )
+            os.replace(tmp, path)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Delete the least recently used files beyond `max_disk_bytes`."""
+        files = []
+        for path in self.directory.glob("*.arrow"):  # type: ignore
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            with self._lock:
+                self._stats["disk_evictions"] += evicted
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob("*.arrow"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the memory tier occupancy."""
+        with self._lock:
+            lookups = sum(
+                self._stats[k] for k in ("memory_hits", "disk_hits", "misses")
+            )
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
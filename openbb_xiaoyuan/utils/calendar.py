@@ -0,0 +1,166 @@
+"""XiaoYuan trading calendar."""
+
+import threading
+from datetime import date as dateType
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from openbb_xiaoyuan.utils.connection import get_connection_pool, get_pooled_reader
+from openbb_xiaoyuan.utils.timings import timed
+
+TRADING_CALENDAR_SQL = """
+    table(getMarketCalendar("XSHG", 1990.01.01, temporalAdd(today(), 1, "y")) as timestamp)
+"""
+
+_NAT = np.datetime64("NaT", "D")
+
+# Pandas period frequencies of the bars of `references.BAR_ENDS`.
+BAR_FREQUENCIES = {"1W": "W-FRI", "1M": "M", "1Q": "Q"}
+
+
+def to_datetime64(dates: Any) -> np.ndarray:
+    """Convert a date, a string or any array-like of them to datetime64[D]."""
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    if isinstance(dates, (str, dateType, np.datetime64, pd.Timestamp)):
+        return np.asarray(pd.Timestamp(str(dates).replace(".", "-")), "datetime64[D]")
+    return np.asarray(pd.to_datetime(dates), "datetime64[D]")
+
+
+def to_db_dates(days: np.ndarray) -> list:
+    """Format datetime64 values as DolphinDB date literals."""
+    return np.char.replace(np.datetime_as_string(days, unit="D"), "-", ".").tolist()
+
+
+class TradingCalendar:
+    """Sorted trading days with vectorized adjacent-day lookups.
+
+    Every lookup accepts a scalar or an array of dates and answers with
+    ``numpy.searchsorted`` over the whole input at once. Dates outside the
+    calendar map to NaT.
+    """
+
+    def __init__(self, days: Any, loaded_on: Optional[dateType] = None):
+        """Initialize the calendar from any iterable of trading days."""
+        self.days = np.unique(to_datetime64(days))
+        self.loaded_on = loaded_on or dateType.today()
+
+    def __len__(self) -> int:
+        """Return the number of trading days."""
+        return len(self.days)
+
+    def _take(self, index: np.ndarray) -> np.ndarray:
+        valid = (index >= 0) & (index < len(self.days))
+        return np.where(valid, self.days[np.clip(index, 0, len(self.days) - 1)], _NAT)
+
+    def is_trading_day(self, dates: Any) -> np.ndarray:
+        """Return whether each date is a trading day."""
+        dates = to_datetime64(dates)
+        index = np.searchsorted(self.days, dates, side="left")
+        return self._take(index) == dates
+
+    def shift(self, dates: Any, n: int) -> np.ndarray:
+        """Return the n-th trading day strictly before (n < 0) or after (n > 0) each date.
+
+        ``n == 0`` returns the date itself when it is a trading day and the
+        next trading day otherwise.
+        """
+        dates = to_datetime64(dates)
+        if n < 0:
+            index = np.searchsorted(self.days, dates, side="left") + n
+        elif n > 0:
+            index = np.searchsorted(self.days, dates, side="right") + n - 1
+        else:
+            index = np.searchsorted(self.days, dates, side="left")
+        return self._take(index)
+
+    def previous(self, dates: Any) -> np.ndarray:
+        """Return the last trading day strictly before each date."""
+        return self.shift(dates, -1)
+
+    def next(self, dates: Any) -> np.ndarray:
+        """Return the first trading day strictly after each date."""
+        return self.shift(dates, 1)
+
+    def rollforward(self, dates: Any) -> np.ndarray:
+        """Return each date if it is a trading day, else the next trading day."""
+        return self.shift(dates, 0)
+
+    def rollback(self, dates: Any) -> np.ndarray:
+        """Return each date if it is a trading day, else the previous trading day."""
+        dates = to_datetime64(dates)
+        return self._take(np.searchsorted(self.days, dates, side="right") - 1)
+
+    def windows(
+        self, start: Any, end: Any, size: int, interval: Optional[str] = None
+    ) -> List[Tuple[Any, Any]]:
+        """Split the range (start, end] into windows of at most `size` trading days.
+
+        Each window is an ``(after, until)`` pair covering the trading days
+        strictly after ``after`` up to and including ``until``; the windows
+        are contiguous, so each one starts where the previous one ended.
+        With an `interval` of `BAR_FREQUENCIES`, windows only end on the last
+        trading day of a bar, so no bar spans two windows; a bar longer than
+        `size` days makes a window of its own.
+        """
+        start, end = to_datetime64(start)[()], to_datetime64(end)[()]
+        days = self.days[(self.days > start) & (self.days <= end)]
+        if interval is None:
+            untils = list(days[size - 1 : -1 : size]) + [end]
+            return list(zip([start] + untils[:-1], untils))
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        bars = pd.PeriodIndex(days, freq=BAR_FREQUENCIES[interval]).asi8
+        ends = np.flatnonzero(bars[1:] != bars[:-1])
+        untils, first, previous = [], 0, None
+        for last in ends:
+            if previous is not None and last - first >= size:
+                untils.append(days[previous])
+                first = previous + 1
+            previous = last
+        if previous is not None and previous >= first and len(days) - first > size:
+            untils.append(days[previous])
+        untils.append(end)
+        return list(zip([start] + untils[:-1], untils))
+
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def _is_fresh(calendar: Optional[TradingCalendar]) -> bool:
+    return calendar is not None and calendar.loaded_on == dateType.today()
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """Return the process-wide trading calendar, reloading it once a day."""
+    global _calendar  # pylint: disable=global-statement
+    calendar = _calendar
+    if _is_fresh(calendar):
+        return calendar  # type: ignore
+    with _calendar_lock:
+        if not _is_fresh(_calendar):
+            with timed("calendar"):
+                df = get_pooled_reader()._run_query(  # pylint: disable=protected-access
+                    script=TRADING_CALENDAR_SQL
+                )
+                _calendar = TradingCalendar(df["timestamp"])
+        return _calendar  # type: ignore
+
+
+async def aget_trading_calendar() -> TradingCalendar:
+    """Return the trading calendar without blocking the event loop on a reload."""
+    calendar = _calendar
+    if _is_fresh(calendar):
+        return calendar  # type: ignore
+    return await get_connection_pool().run(get_trading_calendar)
+
+
+def set_trading_calendar(calendar: Optional[TradingCalendar]) -> None:
+    """Replace the process-wide trading calendar."""
+    global _calendar  # pylint: disable=global-statement
+    with _calendar_lock:
+        _calendar = calendar
@@ -0,0 +1,340 @@
+"""XiaoYuan DolphinDB connection pool."""
+
+import asyncio
+import contextvars
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import takewhile
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from openbb_xiaoyuan.utils.references import SESSION_FUNCTIONS
+from openbb_xiaoyuan.utils.timings import frame_info, timed
+
+DEFAULT_POOL_SIZE = int(os.environ.get("XIAOYUAN_POOL_SIZE", 4))
+DEFAULT_IDLE_TIMEOUT = float(os.environ.get("XIAOYUAN_POOL_IDLE_TIMEOUT", 300))
+DEFAULT_HEALTH_CHECK_INTERVAL = float(
+    os.environ.get("XIAOYUAN_POOL_HEALTH_CHECK_INTERVAL", 60)
+)
+DEFAULT_ACQUIRE_TIMEOUT = float(os.environ.get("XIAOYUAN_POOL_ACQUIRE_TIMEOUT", 30))
+# Lists with at least this many items are uploaded instead of inlined.
+UPLOAD_THRESHOLD = int(os.environ.get("XIAOYUAN_UPLOAD_THRESHOLD", 64))
+
+
+def _connect_like(template: Any) -> Any:
+    """Open a new DolphinDB session on the server and account of `template`."""
+    # pylint: disable=import-outside-toplevel
+    import dolphindb as ddb
+
+    session = ddb.session()
+    session.connect(template.host, template.port, template.userid, template.password)
+    return session
+
+
+def _default_reader_factory() -> Any:
+    """Create a jinniuai data store reader on a DolphinDB session of its own.
+
+    `get_jindata_reader` hands every caller the same reader and session, so
+    each pooled connection gets a shallow copy bound to a new session.
+    """
+    # pylint: disable=import-outside-toplevel
+    from jinniuai_data_store.reader import get_jindata_reader
+
+    reader = copy.copy(get_jindata_reader())
+    reader.session = _connect_like(reader.session)
+    return reader
+
+
+class PooledConnection:
+    """A reader owned by the pool together with its per-session state."""
+
+    def __init__(self, reader: Any):
+        """Wrap a freshly created reader."""
+        self.reader = reader
+        # Anything defined on the server session (helper functions, uploaded
+        # variables, ...) is recorded here so it is only set up once.
+        self.state: Dict[str, Any] = {}
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+
+    def ping(self) -> bool:
+        """Check that the underlying session still answers."""
+        try:
+            self.reader._run_query(script="1")  # pylint: disable=protected-access
+        except Exception:  # pylint: disable=broad-except
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    def run_query(
+        self, script: str, variables: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Run a script after binding `variables` on the session.
+
+        Large values are uploaded through the reader's DolphinDB session, so
+        the script text does not grow with them; small values, and every
+        value when the reader exposes no session, are assigned inline. The
+        shared helper functions are defined the first time a script calls
+        one of them and are then reused for the life of the session.
+        """
+        session = getattr(self.reader, "session", None)
+        can_upload = callable(getattr(session, "upload", None))
+        prelude: List[str] = []
+        upload: Dict[str, Any] = {}
+        for name, value in (variables or {}).items():
+            if can_upload and len(value) >= UPLOAD_THRESHOLD:
+                upload[name] = value
+            else:
+                prelude.append(f"{name} = {value};")
+        if upload:
+            session.upload(upload)  # type: ignore[union-attr]
+
+        defined = self.state.setdefault("functions", set())
+        missing = {n: d for n, d in SESSION_FUNCTIONS.items() if n not in defined}
+        if missing and any(f"{name}(" in script for name in SESSION_FUNCTIONS):
+            prelude.extend(missing.values())
+        else:
+            missing = {}
+
+        if prelude:
+            # `use` statements have to stay at the top of the script.
+            lines = script.lstrip().split("\n")
+            n = len(
+                list(takewhile(lambda line: line.strip().startswith("use "), lines))
+            )
+            script = "\n".join(lines[:n] + prelude + lines[n:])
+        try:
+            # pylint: disable=protected-access
+            result = self.reader._run_query(script=script, **kwargs)
+        except Exception:
+            # The session may have been reset; define everything again next time.
+            defined.clear()
+            raise
+        defined.update(missing)
+        return result
+
+    def close(self) -> None:
+        """Close the underlying session, if the reader supports it."""
+        for target in (self.reader, getattr(self.reader, "session", None)):
+            close = getattr(target, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:  # pylint: disable=broad-except
+                    logger.debug("Failed to close XiaoYuan connection.")
+                return
+
+
+class ConnectionPool:
+    """Thread-safe pool of jinniuai readers.
+
+    Connections are created lazily up to ``size``, handed out LIFO so the warm
+    ones are reused first, pinged before reuse once ``health_check_interval``
+    seconds have passed, and closed after ``idle_timeout`` seconds unused.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any] = _default_reader_factory,
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+    ):
+        """Initialize the pool."""
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}")
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._factory = factory
+        self._idle: List[PooledConnection] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _reap_idle(self) -> None:
+        """Close connections that have been idle for too long. Caller holds the lock."""
+        now = time.monotonic()
+        expired = [c for c in self._idle if now - c.last_used > self.idle_timeout]
+        for conn in expired:
+            self._idle.remove(conn)
+            self._created -= 1
+            conn.close()
+
+    def acquire(self) -> PooledConnection:
+        """Check a connection out of the pool, creating one if there is room."""
+        deadline = time.monotonic() + self.acquire_timeout
+        conn: Optional[PooledConnection] = None
+        with self._cond:
+            self._reap_idle()
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No XiaoYuan connection available after {self.acquire_timeout}s."
+                    )
+                self._cond.wait(remaining)
+
+        if conn is not None:
+            if time.monotonic() - conn.last_checked < self.health_check_interval:
+                return conn
+            if conn.ping():
+                return conn
+            logger.warning("Dropping unhealthy XiaoYuan connection.")
+            conn.close()
+
+        try:
+            return PooledConnection(self._factory())
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: PooledConnection, discard: bool = False) -> None:
+        """Return a connection to the pool."""
+        with self._cond:
+            if discard:
+                self._created -= 1
+                conn.close()
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+            self._reap_idle()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Context manager around `acquire` and `release`."""
+        with timed("acquire"):
+            conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            # Query errors and broken sessions look the same from here, so
+            # force a health check before the connection is handed out again.
+            conn.last_checked = float("-inf")
+            raise
+        finally:
+            self.release(conn)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker threads for blocking queries, one per pooled connection."""
+        if self._executor is None:
+            with self._cond:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.size, thread_name_prefix="xiaoyuan-db"
+                    )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable on the pool's executor and await the result."""
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. the request timings) into the worker.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, partial(context.run, func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Close every idle connection and stop the executor."""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current pool occupancy."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+            }
+
+
+class PooledReader:
+    """Stand-in for the jinniuai reader that runs every call on a pooled connection."""
+
+    def __init__(self, pool: ConnectionPool):
+        """Initialize the reader."""
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        """Proxy reader methods through a checked-out connection."""
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self._pool.connection() as conn:
+                return getattr(conn.reader, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    async def acall(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Call a reader method on a pooled connection without blocking the event loop."""
+        return await self._pool.run(getattr(self, name), *args, **kwargs)
+
+    def run_query(
+        self, script: str, variables: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Run a DolphinDB script with `variables` bound on the session."""
+        with self._pool.connection() as conn:
+            with timed("query", script_bytes=len(script)) as record:
+                result = conn.run_query(script, variables, **kwargs)
+                record.update(frame_info(result))
+        return result
+
+    async def arun_query(
+        self, script: str, variables: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Asynchronously run a DolphinDB script."""
+        return await self._pool.run(self.run_query, script, variables, **kwargs)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the provider-wide connection pool, creating it on first use."""
+    global _pool  # pylint: disable=global-statement
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def set_connection_pool(pool: Optional[ConnectionPool]) -> None:
+    """Replace the provider-wide connection pool, closing the previous one."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is not None and _pool is not pool:
+            _pool.close()
+        _pool = pool
+
+
+def get_pooled_reader() -> PooledReader:
+    """Return a reader whose calls are spread over the connection pool."""
+    return PooledReader(get_connection_pool())
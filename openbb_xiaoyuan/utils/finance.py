@@ -0,0 +1,138 @@
+"""XiaoYuan cached fundamental queries."""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from openbb_xiaoyuan.utils.cache import FrameCache, make_key
+from openbb_xiaoyuan.utils.connection import get_connection_pool, get_pooled_reader
+from openbb_xiaoyuan.utils.references import (
+    get_finance_asof_daily_sql,
+    get_query_finance_sql,
+    get_report_month,
+)
+from openbb_xiaoyuan.utils.timings import timed
+
+WATERMARK_TTL = float(os.environ.get("XIAOYUAN_CACHE_WATERMARK_TTL", 300))
+
+FINANCE_WATERMARK_SQL = """
+    select max(timestamp) as timestamp
+    from loadTable("dfs://finance_factors_1Y", `cn_finance_factors_1Q)
+"""
+
+_finance_cache: Optional[FrameCache] = None
+_watermark: Optional[Any] = None
+_watermark_checked = float("-inf")
+_lock = threading.Lock()
+_watermark_lock = threading.Lock()
+
+
+def get_finance_cache() -> FrameCache:
+    """Return the cache for `cn_finance_factors_1Q` query results."""
+    global _finance_cache  # pylint: disable=global-statement
+    if _finance_cache is None:
+        with _lock:
+            if _finance_cache is None:
+                _finance_cache = FrameCache("finance")
+    return _finance_cache
+
+
+def set_finance_cache(cache: Optional[FrameCache]) -> None:
+    """Replace the finance query cache and forget the disclosure watermark."""
+    global _finance_cache, _watermark_checked  # pylint: disable=global-statement
+    with _lock:
+        _finance_cache = cache
+        _watermark_checked = float("-inf")
+
+
+def _watermark_is_fresh() -> bool:
+    return time.monotonic() - _watermark_checked < WATERMARK_TTL
+
+
+def get_finance_watermark() -> Any:
+    """Return the latest disclosure timestamp, re-checked every WATERMARK_TTL seconds.
+
+    Concurrent callers wait for a single check instead of each running one.
+    """
+    global _watermark, _watermark_checked  # pylint: disable=global-statement
+    if _watermark_is_fresh():
+        return _watermark
+    with _watermark_lock:
+        if not _watermark_is_fresh():
+            df = get_pooled_reader().run_query(script=FINANCE_WATERMARK_SQL)
+            _watermark = (
+                None if df is None or df.empty else str(df["timestamp"].iloc[0])
+            )
+            _watermark_checked = time.monotonic()
+        return _watermark
+
+
+async def aget_finance_watermark() -> Any:
+    """Return the disclosure watermark without blocking the event loop on a check."""
+    if _watermark_is_fresh():
+        return _watermark
+    return await get_connection_pool().run(get_finance_watermark)
+
+
+async def aquery_finance(
+    factors: List[str], symbols: List[str], period: str, limit: int
+) -> Any:
+    """Run the standard pivoted finance query, served from cache when possible.
+
+    Results are keyed on the normalized factor set, symbols, period and limit,
+    and are invalidated as soon as a newer disclosure lands in the table.
+    """
+    cache = get_finance_cache()
+    key = make_key("finance", factors, symbols, period, limit)
+    version = await aget_finance_watermark()
+    with timed("finance_cache") as record:
+        df = cache.get(key, version)
+        record["hit"] = df is not None
+    if df is not None:
+        return df
+
+    report_month = get_report_month(period, -limit)
+    variables: Dict[str, Any] = {}
+    finance_sql = get_query_finance_sql(factors, symbols, report_month, variables)
+    df = await get_pooled_reader().arun_query(
+        script=finance_sql,
+        variables=variables,
+    )
+    if df is not None and not df.empty:
+        cache.put(key, version, df)
+    return df
+
+
+async def aquery_finance_asof_daily(
+    factors: List[str],
+    daily_factors: List[str],
+    symbols: List[str],
+    period: str,
+    limit: int,
+) -> Any:
+    """Run the finance query joined with the daily factors before each report date.
+
+    Each report is joined with the last trading day before it in the same
+    script, and the joined result is cached like `aquery_finance`: a report's daily row predates it, so
+    only a new disclosure can change the result.
+    """
+    cache = get_finance_cache()
+    key = make_key("finance_daily", factors, daily_factors, symbols, period, limit)
+    version = await aget_finance_watermark()
+    with timed("finance_cache") as record:
+        df = cache.get(key, version)
+        record["hit"] = df is not None
+    if df is not None:
+        return df
+
+    report_month = get_report_month(period, -limit)
+    variables: Dict[str, Any] = {}
+    sql = get_finance_asof_daily_sql(
+        factors, daily_factors, symbols, report_month, variables
+    )
+    df = await get_pooled_reader().arun_query(script=sql, variables=variables)
+    if df is not None and not df.empty:
+        df = df.drop(columns=["asof_day", "day", "d_day"], errors="ignore")
+        cache.put(key, version, df)
+    return df
@@ -0,0 +1,32 @@
+"""XiaoYuan helpers."""
+
+from datetime import date as dateType
+from typing import Any, Iterator, List, Sequence, Union
+
+
+def convert_to_db_date_format(value: Union[str, dateType]) -> str:
+    """Format a date as a DolphinDB date literal, e.g. 2024.01.31."""
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    ts = pd.Timestamp(str(value).replace(".", "-"))
+    # strftime does not zero-pad years before 1000.
+    return f"{ts.year:04d}.{ts.month:02d}.{ts.day:02d}"
+
+
+def sort_by_symbols(
+    df: Any, symbols: List[str], by: str = "报告期", ascending: bool = False
+) -> Any:
+    """Order rows by the position of their symbol in the query, then `by`."""
+    rank = df["symbol"].map({s: i for i, s in enumerate(dict.fromkeys(symbols))})
+    return (
+        df.assign(_rank=rank)
+        .sort_values(by=["_rank", by], ascending=[True, ascending], na_position="last")
+        .drop(columns="_rank")
+    )
+
+
+def batched(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Yield consecutive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
@@ -0,0 +1,57 @@
+"""XiaoYuan lazily imported fetchers."""
+
+import importlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+
+class LazyFetcherDict(Mapping):
+    """Model name to fetcher class, importing a fetcher's module on first access.
+
+    Membership, iteration and length only look at the names, so building the
+    provider imports no model module and none of their dependencies. The
+    platform's registry map reads every item at startup and so imports all
+    model modules; their heavy dependencies still load on the first fetch.
+    """
+
+    def __init__(self, package: str, fetchers: Dict[str, Tuple[str, str]]):
+        """Initialize the mapping from `{model: (module, class name)}` in `package`."""
+        self.package = package
+        self.fetchers = dict(fetchers)
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, model: str) -> Any:
+        """Return the fetcher class of a model, importing it if needed."""
+        fetcher = self._loaded.get(model)
+        if fetcher is None:
+            module, name = self.fetchers[model]
+            module = importlib.import_module(f"{self.package}.{module}")
+            fetcher = self._loaded[model] = getattr(module, name)
+        return fetcher
+
+    def __contains__(self, model: object) -> bool:
+        """Check whether a model has a fetcher, without importing it."""
+        return model in self.fetchers
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the model names."""
+        return iter(self.fetchers)
+
+    def __len__(self) -> int:
+        """Return the number of models."""
+        return len(self.fetchers)
+
+    def __repr__(self) -> str:
+        """Return the model names and their fetchers' locations."""
+        return f"{type(self).__name__}({self.package!r}, {self.fetchers!r})"
+
+    def loaded(self) -> Dict[str, Any]:
+        """Return the fetchers imported so far."""
+        return dict(self._loaded)
+
+    def find(self, name: str) -> Any:
+        """Return the fetcher class called `name`, importing it if needed."""
+        for model, (_, fetcher) in self.fetchers.items():
+            if fetcher == name:
+                return self[model]
+        raise KeyError(name)
@@ -0,0 +1,152 @@
+"""XiaoYuan bulk model construction."""
+
+from datetime import date as dateType, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type, Union, get_args, get_origin
+
+from pydantic import TypeAdapter
+
+from openbb_core.provider.abstract.data import Data
+
+# Validators whose effect `build_models` reproduces on the frame itself.
+FRAME_VALIDATORS = {"_use_alias", "date_validate"}
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[Data]) -> TypeAdapter:
+    """Return the cached batch validator of a model."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def field_kind(annotation: Any) -> Optional[str]:
+    """Classify a field annotation as number, int, str, date or datetime."""
+    args = {a for a in get_args(annotation) if a is not type(None)}
+    if get_origin(annotation) is Union:
+        if args <= {int, float}:
+            return "number"
+        if args == {dateType, datetime}:
+            return "datetime"
+        if len(args) == 1:
+            return field_kind(args.pop())
+        return None
+    return {
+        float: "number",
+        int: "int",
+        str: "str",
+        dateType: "date",
+        datetime: "datetime",
+    }.get(annotation)
+
+
+def column_aliases(model: Type[Data]) -> Dict[str, str]:
+    """Return the field name of each source column name of a model."""
+    aliases = {alias: name for name, alias in model.__alias_dict__.items()}
+    for name, field in model.model_fields.items():
+        if isinstance(field.validation_alias, str):
+            aliases.setdefault(field.validation_alias, name)
+    return aliases
+
+
+def rename_columns(model: Type[Data], df: Any) -> Any:
+    """Rename source columns to field names once for the whole frame."""
+    aliases = column_aliases(model)
+    return df.rename(columns={c: aliases[c] for c in df.columns if c in aliases})
+
+
+def is_trusted(model: Type[Data], df: Any) -> bool:
+    """Check whether a renamed frame already has the dtypes the model expects.
+
+    Such frames can skip validation: the required fields are present and
+    complete, every field column has a matching dtype and the model has no
+    validator other than those `build_models` applies to the frame.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pandas.api import types
+
+    decorators = model.__pydantic_decorators__
+    validators = {*decorators.field_validators, *decorators.model_validators}
+    if not validators <= FRAME_VALIDATORS:
+        return False
+    checks = {
+        "number": lambda s: types.is_numeric_dtype(s) and not types.is_bool_dtype(s),
+        "int": types.is_integer_dtype,
+        "str": lambda s: types.is_object_dtype(s) or types.is_string_dtype(s),
+        "date": types.is_datetime64_dtype,
+        "datetime": types.is_datetime64_dtype,
+    }
+    for name, field in model.model_fields.items():
+        if name not in df.columns:
+            if field.is_required():
+                return False
+            continue
+        check = checks.get(field_kind(field.annotation))
+        if check is None or not check(df[name]):
+            return False
+        if field.is_required() and df[name].isna().any():
+            return False
+    return True
+
+
+def _construct(model: Type[Data], rows: int, values: Dict[str, List[Any]]) -> List[Any]:
+    """Construct models without validation, as `model_construct` does per row."""
+    if model.__private_attributes__:
+        return [model.model_construct(**r) for r in _records(values)]
+    fields_set = {name for name in model.model_fields if name in values}
+    fields = {
+        name: values.get(name) or [field.get_default(call_default_factory=True)] * rows
+        for name, field in model.model_fields.items()
+    }
+    extras = {k: v for k, v in values.items() if k not in model.model_fields}
+
+    result = []
+    setattr_ = object.__setattr__
+    for row, extra in zip(_records(fields), _records(extras) or [{}] * rows):
+        obj = model.__new__(model)
+        setattr_(obj, "__dict__", row)
+        setattr_(obj, "__pydantic_fields_set__", set(fields_set))
+        setattr_(obj, "__pydantic_extra__", extra)
+        setattr_(obj, "__pydantic_private__", None)
+        result.append(obj)
+    return result
+
+
+def _records(values: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Zip column value lists into row dicts."""
+    columns = list(values)
+    return [dict(zip(columns, row)) for row in zip(*values.values())]
+
+
+def build_models(model: Type[Data], df: Any) -> List[Any]:
+    """Build a list of models from a frame in one pass.
+
+    Columns are renamed and dates converted once per column instead of once
+    per row.
+    Frames whose dtypes already match the model are constructed without
+    validation; anything else is validated as a single batch.
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    import pandas as pd
+
+    df = rename_columns(model, df)
+    trusted = is_trusted(model, df)
+    fields = model.model_fields
+
+    values = {}
+    for name in df.columns:
+        series = df[name]
+        field = fields.get(name)
+        if trusted and pd.api.types.is_datetime64_dtype(series):
+            kind = field_kind(field.annotation) if field is not None else None
+            converted = series.dt.date if kind == "date" else series.dt.to_pydatetime()
+            # `to_pydatetime` may return a Series with a fresh index; keep positions.
+            series = pd.Series(
+                np.asarray(converted, dtype=object), index=series.index, dtype=object
+            )
+        if field is None or not field.is_required():
+            series = series.astype(object).where(series.notna(), None)
+        values[str(name)] = series.tolist()
+
+    if trusted:
+        return _construct(model, len(df), values)
+    return _list_adapter(model).validate_python(_records(values))
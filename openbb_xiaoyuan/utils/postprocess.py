@@ -0,0 +1,115 @@
+"""XiaoYuan declarative post-processing of result frames."""
+
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from openbb_core.provider.abstract.data import Data
+
+from openbb_xiaoyuan.utils.helpers import sort_by_symbols
+from openbb_xiaoyuan.utils.models import build_models, column_aliases, field_kind
+
+
+def percent(columns: Sequence[str]) -> Dict[str, float]:
+    """Return the scale of columns reported in percent."""
+    return dict.fromkeys(columns, 100.0)
+
+
+class PostProcess:
+    """How a model's result frame is cleaned up before the models are built.
+
+    Each step runs on whole columns, in this order: `drop` removes columns,
+    `dates` are parsed to datetime64, `scale` divides columns by their unit,
+    `zero_to_none` nulls the zeros of numeric columns, rows are sorted on
+    `sort_by`, after the position of their symbol in the query when
+    `by_symbols`, `dates` not typed as dates in the model are formatted as
+    YYYY-MM-DD, and `rename` maps source columns to output ones. Steps refer
+    to source column names and skip columns missing from the frame.
+    """
+
+    __slots__ = (
+        "model",
+        "drop",
+        "dates",
+        "text_dates",
+        "scale",
+        "zero_to_none",
+        "sort_by",
+        "ascending",
+        "by_symbols",
+        "rename",
+    )
+
+    def __init__(
+        self,
+        model: Type[Data],
+        drop: Sequence[str] = (),
+        dates: Sequence[str] = (),
+        scale: Optional[Dict[str, float]] = None,
+        zero_to_none: bool = False,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+        by_symbols: bool = False,
+        rename: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the post-processing of `model` results."""
+        self.model = model
+        self.drop = list(drop)
+        self.dates = list(dates)
+        aliases = column_aliases(model)
+        fields = model.model_fields
+        # Dates only stay datetimes for fields typed as dates, extras included.
+        self.text_dates = [
+            column
+            for column in self.dates
+            if aliases.get(column, column) not in fields
+            or field_kind(fields[aliases.get(column, column)].annotation)
+            not in ("date", "datetime")
+        ]
+        self.scale = dict(scale or {})
+        self.zero_to_none = zero_to_none
+        self.sort_by = sort_by
+        self.ascending = ascending
+        self.by_symbols = by_symbols
+        self.rename = dict(rename or {})
+
+    def apply(
+        self, df: Any, symbols: Optional[List[str]] = None, sort: bool = True
+    ) -> Any:
+        """Return the post-processed frame, leaving `df` untouched.
+
+        `symbols` are the queried symbols, in order; `sort=False` keeps the
+        row order of `df`.
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+        import pandas as pd
+
+        df = df.drop(columns=[c for c in self.drop if c in df.columns])
+        for column in self.dates:
+            if column in df.columns and not pd.api.types.is_datetime64_dtype(
+                df[column]
+            ):
+                df[column] = pd.to_datetime(df[column])
+        columns = [c for c in self.scale if c in df.columns]
+        if columns:
+            units = np.array([self.scale[c] for c in columns])
+            df[columns] = df[columns].to_numpy(dtype=float) / units
+        if self.zero_to_none:
+            numeric = df.select_dtypes("number").columns
+            df[numeric] = df[numeric].mask(df[numeric] == 0)
+        if sort and self.sort_by in df.columns:
+            if self.by_symbols and symbols is not None:
+                df = sort_by_symbols(df, symbols, self.sort_by, self.ascending)
+            else:
+                df = df.sort_values(by=self.sort_by, ascending=self.ascending)
+        for column in self.text_dates:
+            if column in df.columns:
+                df[column] = df[column].dt.strftime("%Y-%m-%d")
+        if self.rename:
+            df = df.rename(columns=self.rename)
+        return df
+
+    def build(
+        self, df: Any, symbols: Optional[List[str]] = None, sort: bool = True
+    ) -> List[Any]:
+        """Post-process a frame and build the models from it."""
+        return build_models(self.model, self.apply(df, symbols, sort))
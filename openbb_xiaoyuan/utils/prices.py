@@ -0,0 +1,273 @@
+"""XiaoYuan incremental daily price store."""
+
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from openbb_xiaoyuan.utils.calendar import aget_trading_calendar, to_datetime64
+from openbb_xiaoyuan.utils.helpers import batched
+
+PRICE_STORE_MAX_BYTES = int(os.environ.get("XIAOYUAN_PRICE_STORE_MAX_BYTES", 1024**3))
+# Seconds a fetch that reached today is trusted, as today's bar may still land.
+PRICE_STORE_TODAY_TTL = float(os.environ.get("XIAOYUAN_PRICE_STORE_TODAY_TTL", 300))
+
+ADJ_CLOSE = "收盘价（前复权）"
+
+# fetch(symbols, after, until) yields the daily rows strictly after `after`.
+HistoryFetch = Callable[[List[str], Any, Any], AsyncIterator[Any]]
+
+
+class _Entry:
+    """Cached daily rows of one symbol, complete for every day in (after, until].
+
+    `checked_on` is the day the adjusted close of `last` was last compared
+    with the source.
+    """
+
+    __slots__ = (
+        "after",
+        "until",
+        "frame",
+        "last",
+        "nbytes",
+        "fetched_at",
+        "checked_on",
+    )
+
+    def __init__(self, after: np.datetime64, until: np.datetime64, frame: Any):
+        self.after = after
+        self.until = until
+        self.frame = frame
+        self.last = to_datetime64(frame["timestamp"].iloc[-1])[()]
+        self.nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        self.fetched_at = time.monotonic()
+        self.checked_on = date.today()
+
+
+class PriceStore:
+    """Per-symbol daily price history that only fetches what it does not have.
+
+    A request is served locally when every symbol's fetched span covers it,
+    whether or not the days in that span had rows, so requests ending on a
+    weekend or before the day's bar is published do not refetch. A span
+    reaching today is only trusted for `today_ttl` seconds. Otherwise only
+    the rows after the last cached day are fetched, together with that day
+    itself: its adjusted close is compared with the cached one,
+    and a mismatch (a new forward adjustment) triggers a full reload of the
+    symbol. An ex-date after a covered span rescales it all the same, so a
+    covered symbol not checked today has its last cached day fetched and
+    compared before it is served. Fetched rows carry their own `REF`-based
+    change columns, which stay correct because the overlapping day is part
+    of each fetch.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = PRICE_STORE_MAX_BYTES,
+        today_ttl: float = PRICE_STORE_TODAY_TTL,
+    ):
+        """Initialize an empty store holding at most `max_bytes` of rows."""
+        self.max_bytes = max_bytes
+        self.today_ttl = today_ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "checks": 0,
+            "incremental": 0,
+            "reloads": 0,
+            "evictions": 0,
+        }
+
+    def __contains__(self, symbol: object) -> bool:
+        """Check whether a symbol has cached rows."""
+        return symbol in self._entries
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += n
+
+    def _store(self, symbol: str, entry: _Entry) -> None:
+        with self._lock:
+            if symbol in self._entries:
+                self._bytes -= self._entries.pop(symbol).nbytes
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[symbol] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+
+    def _covers(self, entry: _Entry, end: np.datetime64) -> bool:
+        """Check whether `entry` holds every row up to `end`."""
+        if entry.until < end:
+            return False
+        today = to_datetime64(date.today())[()]
+        return end < today or time.monotonic() - entry.fetched_at < self.today_ttl
+
+    async def _fetch(
+        self, fetch: HistoryFetch, symbols: List[str], after: Any, until: Any
+    ) -> Dict[str, Any]:
+        # Chunks are split by symbol as they arrive, so only the per-symbol
+        # pieces are held, never every chunk together with their concatenation.
+        pieces: Dict[str, List[Any]] = defaultdict(list)
+        async for df in fetch(symbols, after, until):
+            for symbol, group in df.groupby("symbol", sort=False):
+                pieces[symbol].append(group)
+        return {
+            symbol: pd.concat(frames, ignore_index=True)
+            .sort_values("timestamp", kind="stable")
+            .reset_index(drop=True)
+            for symbol, frames in pieces.items()
+        }
+
+    async def _fill(
+        self, symbols: List[str], start: Any, end: Any, fetch: HistoryFetch
+    ) -> Dict[str, Any]:
+        """Fetch whatever the store misses for `symbols` in (start, end].
+
+        Returns the frame of every symbol with rows, which stays valid even
+        if the store evicts it before the caller reads it.
+        """
+        today = date.today()
+        frames: Dict[str, Any] = {}
+        reload: List[str] = []
+        # Fetched from the last cached day up to `until`, by (last, until).
+        incremental: Dict[Tuple[Any, Any], List[str]] = defaultdict(list)
+        for symbol in dict.fromkeys(symbols):
+            entry = self._entries.get(symbol)
+            if entry is None or entry.after > start:
+                reload.append(symbol)
+            elif not self._covers(entry, end):
+                incremental[(entry.last, end)].append(symbol)
+            elif entry.checked_on != today:
+                incremental[(entry.last, entry.last)].append(symbol)
+            else:
+                self._count("hits")
+                frames[symbol] = entry.frame
+
+        if incremental:
+            calendar = await aget_trading_calendar()
+        for (last, until), batch in incremental.items():
+            after = calendar.previous(last)[()]
+            fetched = await self._fetch(fetch, batch, after, until)
+            for symbol in batch:
+                entry, new = self._entries.get(symbol), fetched.get(symbol)
+                overlap = None if new is None else new[new["timestamp"] == last]
+                if (
+                    entry is None
+                    or overlap is None
+                    or overlap.empty
+                    or not np.allclose(
+                        overlap[ADJ_CLOSE].to_numpy(dtype=float),
+                        entry.frame[ADJ_CLOSE].iloc[-1:].to_numpy(dtype=float),
+                        equal_nan=True,
+                    )
+                ):
+                    reload.append(symbol)
+                    continue
+                if until == last:
+                    self._count("checks")
+                    entry.checked_on = today
+                    frames[symbol] = entry.frame
+                    continue
+                self._count("incremental")
+                frame = pd.concat(
+                    [entry.frame, new[new["timestamp"] > last]], ignore_index=True
+                )
+                self._store(symbol, _Entry(entry.after, end, frame))
+                frames[symbol] = frame
+
+        if reload:
+            self._count("reloads", len(reload))
+            for symbol, frame in (await self._fetch(fetch, reload, start, end)).items():
+                self._store(symbol, _Entry(start, end, frame))
+                frames[symbol] = frame
+        return frames
+
+    @staticmethod
+    def _rows(frames: Dict[str, Any], symbols: List[str], start: Any, end: Any) -> Any:
+        """Return the rows of `symbols` in (start, end]."""
+        selected = []
+        for symbol in symbols:
+            frame = frames.get(symbol)
+            if frame is None:
+                continue
+            days = to_datetime64(frame["timestamp"])
+            selected.append(frame[(days > start) & (days <= end)])
+        if not selected:
+            return pd.DataFrame()
+        return (
+            pd.concat(selected, ignore_index=True)
+            .sort_values(["timestamp", "symbol"], kind="stable")
+            .reset_index(drop=True)
+        )
+
+    async def aget(
+        self, symbols: List[str], start: Any, end: Any, fetch: HistoryFetch
+    ) -> Any:
+        """Return the daily rows of `symbols` in (start, end], sorted by date and symbol."""
+        start, end = to_datetime64(start)[()], to_datetime64(end)[()]
+        frames = await self._fill(symbols, start, end, fetch)
+        return self._rows(frames, list(dict.fromkeys(symbols)), start, end)
+
+    async def aiter(
+        self,
+        symbols: List[str],
+        start: Any,
+        end: Any,
+        fetch: HistoryFetch,
+        batch_size: int = 100,
+    ) -> AsyncIterator[Any]:
+        """Yield the daily rows of `symbols` in (start, end], `batch_size` symbols at a time.
+
+        Each frame is sorted by date and symbol, and only built when asked
+        for, so callers can process and drop them one by one.
+        """
+        start, end = to_datetime64(start)[()], to_datetime64(end)[()]
+        frames = await self._fill(symbols, start, end, fetch)
+        for batch in batched(list(dict.fromkeys(symbols)), batch_size):
+            df = self._rows(frames, list(batch), start, end)
+            if not df.empty:
+                yield df
+
+    def clear(self) -> None:
+        """Drop every cached symbol."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the store counters."""
+        with self._lock:
+            return {**self._stats, "symbols": len(self._entries), "bytes": self._bytes}
+
+
+_price_store: Optional[PriceStore] = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Return the provider-wide daily price store."""
+    global _price_store  # pylint: disable=global-statement
+    if _price_store is None:
+        with _price_store_lock:
+            if _price_store is None:
+                _price_store = PriceStore()
+    return _price_store
+
+
+def set_price_store(store: Optional[PriceStore]) -> None:
+    """Replace the provider-wide daily price store."""
+    global _price_store  # pylint: disable=global-statement
+    with _price_store_lock:
+        _price_store = store
@@ -0,0 +1,178 @@
+"""XiaoYuan typed DolphinDB query builder."""
+
+from abc import ABC, abstractmethod
+from datetime import date as dateType
+from typing import Any, List, Optional, Sequence
+
+from openbb_xiaoyuan.utils.helpers import convert_to_db_date_format
+
+
+class Raw:
+    """A DolphinDB expression emitted verbatim, e.g. a variable name."""
+
+    def __init__(self, expression: str):
+        """Initialize the expression."""
+        self.expression = expression
+
+    def __str__(self) -> str:
+        """Return the expression."""
+        return self.expression
+
+
+def literal(value: Any) -> str:
+    """Render a Python value as a DolphinDB literal."""
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(value, Raw):
+        return str(value)
+    if isinstance(value, (dateType, pd.Timestamp, np.datetime64)):
+        return convert_to_db_date_format(value)
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(literal(v) for v in value)}]"
+    if isinstance(value, str):
+        return repr(value)
+    return str(value)
+
+
+class Predicate(ABC):
+    """A boolean condition of a `where` clause."""
+
+    @abstractmethod
+    def render(self) -> str:
+        """Return the condition as DolphinDB text."""
+
+
+class Compare(Predicate):
+    """`column <op> value`."""
+
+    def __init__(self, column: str, op: str, value: Any):
+        """Initialize the comparison."""
+        if op not in ("=", "!=", "<", "<=", ">", ">="):
+            raise ValueError(f"Invalid operator: {op}")
+        self.column, self.op, self.value = column, op, value
+
+    def render(self) -> str:
+        """Return the condition as DolphinDB text."""
+        return f"{self.column} {self.op} {literal(self.value)}"
+
+
+class In(Predicate):
+    """`column in values`, where values is a list or a bound variable."""
+
+    def __init__(self, column: str, values: Any):
+        """Initialize the membership test."""
+        self.column, self.values = column, values
+
+    def render(self) -> str:
+        """Return the condition as DolphinDB text."""
+        return f"{self.column} in {literal(self.values)}"
+
+
+class Between(Predicate):
+    """`column between low and high`, both bounds included.
+
+    Range predicates on a partitioning column let the DFS engine skip the
+    partitions outside the range.
+    """
+
+    def __init__(self, column: str, low: Any, high: Any):
+        """Initialize the range."""
+        self.column, self.low, self.high = column, low, high
+
+    def render(self) -> str:
+        """Return the condition as DolphinDB text."""
+        return f"{self.column} between {literal(self.low)} and {literal(self.high)}"
+
+
+class Expression(Predicate):
+    """A condition written out in DolphinDB, e.g. one using `prev`."""
+
+    def __init__(self, expression: str):
+        """Initialize the condition."""
+        self.expression = expression
+
+    def render(self) -> str:
+        """Return the condition as DolphinDB text."""
+        return self.expression
+
+
+class Table:
+    """A DFS table, or a table held in a script variable."""
+
+    def __init__(self, name: str, database: Optional[str] = None):
+        """Initialize the table reference."""
+        self.name, self.database = name, database
+
+    def render(self) -> str:
+        """Return the table reference as DolphinDB text."""
+        if self.database is None:
+            return self.name
+        return f'loadTable("{self.database}", `{self.name})'
+
+
+class Select:
+    """A single `select` statement, built clause by clause."""
+
+    def __init__(self, table: Table, columns: Sequence[str] = ("*",)):
+        """Initialize the statement."""
+        self.table = table
+        self.columns = list(columns)
+        self.predicates: List[Predicate] = []
+        self.contexts: List[str] = []
+        self.groups: List[str] = []
+        self.orders: List[str] = []
+        self.pivots: List[str] = []
+        self.limit_n: Optional[int] = None
+
+    def where(self, *predicates: Predicate) -> "Select":
+        """Add conditions, combined with `and`."""
+        self.predicates.extend(predicates)
+        return self
+
+    def context_by(self, *columns: str) -> "Select":
+        """Group rows without aggregating them."""
+        self.contexts.extend(columns)
+        return self
+
+    def group_by(self, *columns: str) -> "Select":
+        """Aggregate rows by the given columns or expressions."""
+        self.groups.extend(columns)
+        return self
+
+    def order_by(self, *columns: str) -> "Select":
+        """Sort rows, within each context group if any."""
+        self.orders.extend(columns)
+        return self
+
+    def limit(self, n: int) -> "Select":
+        """Keep the first n rows, or the last -n rows when n is negative."""
+        self.limit_n = n
+        return self
+
+    def pivot_by(self, *columns: str) -> "Select":
+        """Pivot the selected value by the given columns, the last one spread."""
+        self.pivots.extend(columns)
+        return self
+
+    def render(self) -> str:
+        """Return the statement as DolphinDB text."""
+        parts = [f"select {', '.join(self.columns)}", f"from {self.table.render()}"]
+        if self.predicates:
+            parts.append(f"where {' and '.join(p.render() for p in self.predicates)}")
+        if self.groups:
+            parts.append(f"group by {', '.join(self.groups)}")
+        if self.pivots:
+            parts.append(f"pivot by {', '.join(self.pivots)}")
+        if self.contexts:
+            parts.append(f"context by {', '.join(self.contexts)}")
+        if self.orders:
+            parts.append(f"order by {', '.join(self.orders)}")
+        if self.limit_n is not None:
+            parts.append(f"limit {self.limit_n}")
+        return " ".join(parts)
+
+    def __str__(self) -> str:
+        """Return the statement as DolphinDB text."""
+        return self.render()
@@ -1,3 +1,24 @@
+from datetime import date as dateType, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from openbb_xiaoyuan.utils.query import (
+    Between,
+    Compare,
+    Expression,
+    In,
+    Predicate,
+    Raw,
+    Select,
+    Table,
+    literal,
+)
+
+FINANCE_TABLE = Table("cn_finance_factors_1Q", database="dfs://finance_factors_1Y")
+DAILY_TABLE = Table("cn_factors_1D", database="dfs://factors_6M")
+
+# DolphinDB functions mapping a day to the last day of its bar.
+BAR_ENDS = {"1W": "weekEnd", "1M": "monthEnd", "1Q": "quarterEnd"}
+
 extractMonthDayFromTime = """
 def extractMonthDayFromTime(time) {
     return substr(string(time), 5)
@@ -22,54 +43,219 @@ def getFiscalQuarterFromTime(time) {
     };
 """
 
+queryDailyFactors = """
+def queryDailyFactors(factorNames, symbols, dateList) {
+    timestamp_table = select datetime(date(timestamp)) from table(dateList as timestamp);
+    low = datetime(min(date(dateList)));
+    high = datetime(max(date(dateList)));
+    t = select timestamp, symbol, factor_name,value
+        from loadTable("dfs://factors_6M", `cn_factors_1D)
+        where factor_name in factorNames and
+        timestamp between low and high and
+        timestamp in timestamp_table
+        and symbol in symbols;
+    return select value from t where value is not null pivot by timestamp, symbol, factor_name;
+};
+"""
+
+queryDividends = """
+def queryDividends(startDate, endDate, stockCode, tableName) {
+    source = loadTable("dfs://cn_zvt", tableName);
+    if (isNull(stockCode)) {
+        t = select entity_id, dividend_per_share_before_tax, record_date, dividend_date
+            from source
+            where dividend_date between startDate and endDate;
+    } else {
+        t = select entity_id, dividend_per_share_before_tax, record_date, dividend_date
+            from source
+            where code = stockCode and dividend_date between startDate and endDate;
+    }
+    return select upper(split(entity_id,'_')[1])+split(entity_id,'_')[2] as symbol,
+        dividend_per_share_before_tax as dividend,
+        record_date as recordDate,
+        dividend_date as paymentDate,
+        dividend_date as date
+        from t;
+};
+"""
+
+# Functions defined once per server session and then called by name.
+SESSION_FUNCTIONS = {
+    "extractMonthDayFromTime": extractMonthDayFromTime,
+    "getFiscalQuarterFromTime": getFiscalQuarterFromTime,
+    "queryDailyFactors": queryDailyFactors,
+    "queryDividends": queryDividends,
+}
 
-def get_query_finance_sql(factor_names: list, symbol: list, report_month: str) -> str:
+
+def bind(variables: Optional[Dict[str, Any]], name: str, value: list) -> str:
+    """Return `name` after recording `value` in `variables`, or the inline literal."""
+    if variables is None:
+        return str(value)
+    variables[name] = value
+    return name
+
+
+def _finance_statements(
+    factor_names: list,
+    symbol: list,
+    report_month: "ReportPeriod",
+    variables: Optional[Dict[str, Any]] = None,
+    fiscal_columns: Sequence[str] = (),
+    today: Optional[dateType] = None,
+) -> List[Select]:
+    factors = Raw(bind(variables, "factorNames", factor_names))
+    symbols = Raw(bind(variables, "symbols", symbol))
+    select = Select(
+        FINANCE_TABLE, ["timestamp", "报告期", "symbol", "factor_name", "value"]
+    ).where(In("factor_name", factors), In("symbol", symbols))
+    pivot = Select(Table("t"), ["value"]).pivot_by(
+        "timestamp", "symbol", "报告期", "factor_name"
+    )
+    fiscal = Select(
+        Table("t"),
+        [
+            "*",
+            "getFiscalQuarterFromTime(报告期) as fiscal_period",
+            "year(报告期) as fiscal_year",
+            *fiscal_columns,
+        ],
+    ).context_by("symbol", "报告期")
+    return [report_month.apply(select, today), pivot, fiscal]
+
+
+def get_query_finance_sql(
+    factor_names: list,
+    symbol: list,
+    report_month: "ReportPeriod",
+    variables: Optional[Dict[str, Any]] = None,
+) -> str:
+    select, pivot, fiscal = _finance_statements(
+        factor_names, symbol, report_month, variables
+    )
     return f"""
-        t = select timestamp,报告期, symbol, factor_name ,value 
-        from loadTable("dfs://finance_factors_1Y", `cn_finance_factors_1Q) 
-        where factor_name in {factor_names} 
-            and symbol in {symbol} 
-            {report_month} 
-        t = select value from t pivot by timestamp,symbol,报告期,factor_name;
-        select *,getFiscalQuarterFromTime(报告期) as fiscal_period,year(报告期) as fiscal_year 
-        from t context by symbol,报告期;
+        t = {select};
+        t = {pivot};
+        {fiscal};
         """
 
 
-def get_recent_1q_query_finance_sql(
-    factor_names: list, symbol: list, cur_date: str
+def get_finance_asof_daily_sql(
+    factor_names: list,
+    daily_factor_names: list,
+    symbol: list,
+    report_month: "ReportPeriod",
+    variables: Optional[Dict[str, Any]] = None,
+    today: Optional[dateType] = None,
 ) -> str:
-    return f"""
-        t = select timestamp,报告期, symbol, factor_name ,value 
-        from loadTable("dfs://finance_factors_1Y", `cn_finance_factors_1Q) 
-        where factor_name in {factor_names} 
-            and symbol in {symbol} and timestamp <= {cur_date} context by symbol order by timestamp limit -1;
+    """Join each report with the daily factors of the last trading day before it.
 
-        t = select value from t where value is not null pivot by 报告期,timestamp,symbol, factor_name;
-        t
-        """
+    The pivoted finance query and the daily rows it needs run in one script:
+    each report is keyed on the last trading day strictly before its
+    `报告期`, found on the server's market calendar, and only the daily
+    rows of those days are loaded and joined on symbol and day.
+    """
+    select, pivot, fiscal = _finance_statements(
+        factor_names,
+        symbol,
+        report_month,
+        variables,
+        ["date(报告期) - 1 as asof_day"],
+        today,
+    )
+    lower = report_month.lower_bound(today)
+    # A month before the first report covers the longest market holiday.
+    first = (lower - timedelta(days=31)) if lower else dateType(1990, 1, 1)
+    daily = Select(
+        DAILY_TABLE, ["date(timestamp) as day", "symbol", "factor_name", "value"]
+    ).where(
+        In("factor_name", Raw(bind(variables, "dailyFactorNames", daily_factor_names))),
+        In("symbol", Raw(bind(variables, "symbols", symbol))),
+        Between("timestamp", Raw("firstDay"), Raw("lastDay")),
+        Expression("date(timestamp) in days"),
+    )
+    daily_pivot = Select(Table("d"), ["value"]).pivot_by("day", "symbol", "factor_name")
+    calendar = f"{literal(first)}, {literal(today or dateType.today())}"
+    return "\n".join(
+        [
+            f"t = {select};",
+            f"t = {pivot};",
+            f"t = {fiscal};",
+            f'tradingDays = getMarketCalendar("XSHG", {calendar});',
+            "update t set day = tradingDays[asof(tradingDays, asof_day)];",
+            "days = exec distinct day from t;",
+            "firstDay = min(days);",
+            "lastDay = max(days);",
+            f"d = {daily};",
+            f"d = {daily_pivot};",
+            "select * from lj(t, d, `symbol`day);",
+        ]
+    )
 
 
-def get_report_month(period: str, limit=-4) -> str:
-    period_to_month = {
-        "ytd": "",
-        "annual": "12",
-    }
-    if period not in period_to_month:
-        raise ValueError(f"Invalid period: {period}")
-    month = period_to_month[period]
-    return (
-        (
-            f" and monthOfYear(报告期) = {month}  context by symbol,factor_name,extractMonthDayFromTime(报告期) "
-            f"order by 报告期 limit {limit} ;"
+class ReportPeriod:
+    """Report-date filter of the pivoted finance query.
+
+    Keeps the last `-limit` reports of every month-day (all quarters for
+    ytd, December only for annual) and bounds `报告期` from below, so only
+    the partitions that can hold those reports are scanned. Symbols whose
+    last report predates the bound, e.g. delisted ones, return no rows.
+    """
+
+    MONTHS = {"ytd": None, "annual": 12}
+
+    def __init__(self, period: str, limit: int = -4):
+        """Initialize the filter."""
+        if period not in self.MONTHS:
+            raise ValueError(f"Invalid period: {period}")
+        self.period = period
+        self.month = self.MONTHS[period]
+        self.limit = limit
+
+    def lower_bound(self, today: Optional[dateType] = None) -> Optional[dateType]:
+        """Return the earliest report date that can be among the last reports."""
+        if not self.limit:
+            return None
+        today = today or dateType.today()
+        # One spare year covers reports of the last period not yet published.
+        return dateType(today.year - abs(self.limit) - 1, 1, 1)
+
+    def predicates(self, today: Optional[dateType] = None) -> List[Predicate]:
+        """Return the month filter and the partition-pruning bound."""
+        predicates: List[Predicate] = []
+        if self.month:
+            predicates.append(Compare("monthOfYear(报告期)", "=", self.month))
+        low = self.lower_bound(today)
+        if low is not None:
+            predicates.append(Compare("报告期", ">=", low))
+        return predicates
+
+    def apply(self, select: Select, today: Optional[dateType] = None) -> Select:
+        """Restrict a finance select to the last reports of the period."""
+        return (
+            select.where(*self.predicates(today))
+            .context_by("symbol", "factor_name", "extractMonthDayFromTime(报告期)")
+            .order_by("报告期")
+            .limit(self.limit)
         )
-        if month
-        else f"context by symbol,factor_name,extractMonthDayFromTime(报告期) "
-        f"order by 报告期 limit {limit};"
-    )
 
 
-def get_specific_daily_sql(factor_names: list, symbol: list, date_list: list) -> str:
+def get_report_month(period: str, limit=-4) -> ReportPeriod:
+    return ReportPeriod(period, limit)
+
+
+def get_specific_daily_sql(
+    factor_names: list,
+    symbol: list,
+    date_list: list,
+    variables: Optional[Dict[str, Any]] = None,
+) -> str:
+    if variables is not None:
+        bind(variables, "factorNames", factor_names)
+        bind(variables, "symbols", symbol)
+        bind(variables, "dateList", date_list)
+        return "queryDailyFactors(factorNames, symbols, dateList)"
+    prune = Between("timestamp", Raw(min(date_list)), Raw(max(date_list)))
     return f"""
         timestamp = {date_list};
         date_list_table = table(timestamp);
@@ -77,6 +263,7 @@ def get_specific_daily_sql(factor_names: list, symbol: list, date_list: list) ->
         t = select timestamp, symbol, factor_name,value
             from loadTable("dfs://factors_6M", `cn_factors_1D)
             where factor_name in {factor_names} and
+            {prune.render()} and
             timestamp in timestamp_table
             and symbol in {symbol};
         t = select value from t where value is not null pivot by timestamp, symbol, factor_name;
@@ -90,15 +277,176 @@ def get_dividend_sql(
     code: str = None,
     table_name: str = "dividend_detail",
 ) -> str:
-    dividend_sql = f"""
-        select upper(split(entity_id,'_')[1])+split(entity_id,'_')[2] as symbol, 
-        dividend_per_share_before_tax as dividend,
-        record_date as recordDate,
-        dividend_date as paymentDate,
-        dividend_date as date 
-        from loadTable("dfs://cn_zvt", `{table_name}) 
-        where dividend_date between {start_date} and {end_date} 
-        """
-    if code:
-        dividend_sql += f" and code = '{code[-6:]}'"
-    return dividend_sql
+    stock_code = f"'{code[-6:]}'" if code else "NULL"
+    return f'queryDividends({start_date}, {end_date}, {stock_code}, "{table_name}")'
+
+
+def get_screener_sql(
+    date: dateType,
+    daily_factors: list,
+    report_factors: list,
+    predicates: List[Predicate],
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    variables: Optional[Dict[str, Any]] = None,
+    report_since: Optional[dateType] = None,
+) -> str:
+    """Rank the whole universe on one day, filtered and sorted on the server.
+
+    The daily factors of `date` are joined on symbol with the latest reported
+    value of each report factor published on or before it, no earlier than
+    `report_since`; only the rows passing `predicates` come back.
+    """
+    daily = Select(DAILY_TABLE, ["value"]).where(
+        In("factor_name", Raw(bind(variables, "dailyFactors", daily_factors))),
+        Between("timestamp", date, date),
+    )
+    script = [f"t = {daily.pivot_by('symbol', 'factor_name')};"]
+    if report_factors:
+        latest = (
+            Select(FINANCE_TABLE, ["timestamp", "symbol", "factor_name", "value"])
+            .where(
+                In(
+                    "factor_name", Raw(bind(variables, "reportFactors", report_factors))
+                ),
+                Between("timestamp", report_since or dateType(1990, 1, 1), date),
+            )
+            .context_by("symbol", "factor_name")
+            .order_by("timestamp")
+            .limit(-1)
+        )
+        report = Select(Table("r"), ["value"]).pivot_by("symbol", "factor_name")
+        script += [f"r = {latest};", f"r = {report};", "t = lj(t, r, `symbol);"]
+    ranked = Select(Table("t")).where(*predicates)
+    if order_by:
+        ranked.order_by(order_by)
+    if limit:
+        ranked.limit(limit)
+    script.append(f"{ranked};")
+    return "\n".join(script)
+
+
+def get_resample_sql(table: str, interval: str, aggregations: Dict[str, str]) -> str:
+    """Aggregate the daily rows held in `table` into bars of `interval`.
+
+    `aggregations` maps each column to the function reducing it over a bar,
+    e.g. `first`, `max`, `min`, `last` or `sum`. A bar is dated on its last
+    trading day, and the statement assigns the bars back to `table`.
+    """
+    columns = ["last(timestamp) as timestamp"] + [
+        f"{function}({column}) as {column}" for column, function in aggregations.items()
+    ]
+    bars = Select(Table(table), columns).group_by(
+        "symbol", f"{BAR_ENDS[interval]}(timestamp) as bar"
+    )
+    ordered = Select(Table(table), ["timestamp", "symbol", *aggregations]).order_by(
+        "timestamp", "symbol"
+    )
+    return f"{table} = {bars};\n{table} = {ordered};"
+
+
+def get_adjustment_factors_sql(
+    close: str,
+    adj_close: str,
+    symbols: list,
+    after: dateType,
+    until: dateType,
+    variables: Optional[Dict[str, Any]] = None,
+    tolerance: float = 1e-9,
+) -> str:
+    """Return the days in [after, until] each symbol's adjustment factor changed.
+
+    The factor is the forward-adjusted close over the unadjusted one. It
+    only moves on ex-dates, so besides those days just the first and last
+    day of each symbol come back.
+    """
+    rows = Select(DAILY_TABLE, ["timestamp", "symbol", "factor_name", "value"]).where(
+        In("factor_name", [close, adj_close]),
+        In("symbol", Raw(bind(variables, "symbols", symbols))),
+        Between("timestamp", after, until),
+    )
+    pivot = Select(Table("t"), ["value"]).pivot_by("timestamp", "symbol", "factor_name")
+    factors = Select(
+        Table("t"), ["timestamp", "symbol", f"{adj_close} / {close} as factor"]
+    ).where(Compare(close, ">", 0), Compare(adj_close, ">", 0))
+    changes = Select(Table("t"), ["timestamp", "symbol", "factor"]).where(
+        Expression(
+            "isNull(previous) or isNull(following)"
+            f" or abs(factor - previous) > {tolerance} * previous"
+        )
+    )
+    return "\n".join(
+        [
+            f"t = {rows};",
+            f"t = {pivot};",
+            f"t = {factors};",
+            "update t set previous = prev(factor), following = next(factor)"
+            " context by symbol;",
+            f"{changes};",
+        ]
+    )
+
+
+def get_valuation_snapshot_sql(
+    finance_factors: list,
+    daily_factors: list,
+    symbols: Optional[list],
+    date: dateType,
+    variables: Optional[Dict[str, Any]] = None,
+    lookback_days: int = 730,
+) -> str:
+    """Return each symbol's latest report joined with its daily factors, in one script.
+
+    Every finance factor takes its latest value published by `date`, and
+    each symbol gets one row dated with its latest `报告期`; the daily
+    factors are those of the first trading day on or after that period,
+    found on the server's market calendar. Without `symbols` the snapshot
+    covers the whole table.
+    """
+    low = date - timedelta(days=lookback_days)
+    universe = []
+    if symbols is not None:
+        universe = [In("symbol", Raw(bind(variables, "symbols", symbols)))]
+    latest = (
+        Select(FINANCE_TABLE, ["timestamp", "报告期", "symbol", "factor_name", "value"])
+        .where(
+            In("factor_name", Raw(bind(variables, "financeFactors", finance_factors))),
+            *universe,
+            Between("timestamp", low, date),
+        )
+        .context_by("symbol", "factor_name")
+        .order_by("timestamp")
+        .limit(-1)
+    )
+    present = Select(Table("t")).where(Expression("value is not null"))
+    # Factors may come from different reports, so 报告期 is not a pivot key.
+    periods = Select(
+        Table("t"), ["max(报告期) as 报告期", "max(timestamp) as timestamp"]
+    ).group_by("symbol")
+    pivot = Select(Table("t"), ["value"]).pivot_by("symbol", "factor_name")
+    daily = Select(
+        DAILY_TABLE, ["date(timestamp) as day", "symbol", "factor_name", "value"]
+    ).where(
+        In("factor_name", Raw(bind(variables, "dailyFactors", daily_factors))),
+        *universe,
+        Between("timestamp", Raw("firstPeriod"), date),
+        Expression("date(timestamp) in days"),
+    )
+    daily_pivot = Select(Table("d"), ["value"]).pivot_by("day", "symbol", "factor_name")
+    return "\n".join(
+        [
+            f"t = {latest};",
+            f"t = {present};",
+            f"periods = {periods};",
+            f"t = {pivot};",
+            "t = lj(periods, t, `symbol);",
+            # The calendar has to start by the earliest period for asof to find it.
+            "firstPeriod = exec min(date(报告期)) from t;",
+            f'tradingDays = getMarketCalendar("XSHG", firstPeriod, {literal(date)});',
+            "update t set day = tradingDays[asof(tradingDays, date(报告期) - 1) + 1];",
+            "days = exec distinct day from t;",
+            f"d = {daily};",
+            f"d = {daily_pivot};",
+            "select * from lj(t, d, `symbol`day);",
+        ]
+    )
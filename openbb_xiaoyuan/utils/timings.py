@@ -0,0 +1,129 @@
+"""XiaoYuan per-request phase timings."""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+
+from loguru import logger
+
+TIMINGS_ENABLED = os.environ.get("XIAOYUAN_TIMINGS", "").lower() in ("1", "true")
+
+
+class Timings:
+    """Phases recorded while one fetcher call runs."""
+
+    def __init__(self, name: str):
+        """Start recording."""
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str, **info: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded dict takes extra figures such as rows."""
+        start = time.perf_counter()
+        record = {"phase": name, "start": round(start - self.started, 6), **info}
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            self.phases.append(record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the phases in start order, with the total and per-phase sums."""
+        phases = sorted(self.phases, key=lambda p: p["start"])
+        totals: Dict[str, float] = {}
+        for p in phases:
+            totals[p["phase"]] = round(totals.get(p["phase"], 0) + p["seconds"], 6)
+        return {
+            "fetcher": self.name,
+            "total": round(time.perf_counter() - self.started, 6),
+            "totals": totals,
+            "phases": phases,
+        }
+
+
+_current: ContextVar[Optional[Timings]] = ContextVar("xiaoyuan_timings", default=None)
+
+
+@contextmanager
+def timed(name: str, **info: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block in the current request; a no-op when timings are off."""
+    timings = _current.get()
+    if timings is None:
+        yield {}
+        return
+    with timings.phase(name, **info) as record:
+        yield record
+
+
+def frame_info(df: Any) -> Dict[str, int]:
+    """Return the row count and in-memory size of a query result."""
+    if df is None or not hasattr(df, "memory_usage"):
+        return {"rows": 0, "bytes": 0}
+    return {"rows": len(df), "bytes": int(df.memory_usage(index=False).sum())}
+
+
+def _timed_call(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a fetcher stage so it is recorded as a phase."""
+
+    @wraps(func)
+    def call(*args: Any, **kwargs: Any) -> Any:
+        with timed(name):
+            return func(*args, **kwargs)
+
+    @wraps(func)
+    async def acall(*args: Any, **kwargs: Any) -> Any:
+        with timed(name):
+            return await func(*args, **kwargs)
+
+    # pylint: disable=import-outside-toplevel
+    from inspect import iscoroutinefunction
+
+    return acall if iscoroutinefunction(func) else call
+
+
+def with_timings(cls: Type) -> Type:
+    """Record the phases of a fetcher when XIAOYUAN_TIMINGS is set.
+
+    The timings are logged and returned in the result metadata, which
+    OpenBB exposes as `OBBject.extra["results_metadata"]["timings"]`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.provider.abstract.annotated_result import AnnotatedResult
+
+    for stage, name in (
+        ("transform_query", "transform_query"),
+        ("extract_data", "extract"),
+        ("transform_data", "transform"),
+    ):
+        setattr(cls, stage, staticmethod(_timed_call(name, getattr(cls, stage))))
+
+    fetch_data = cls.fetch_data
+
+    async def fetch_with_timings(
+        _cls: Type, params: Dict[str, Any], credentials: Any = None, **kwargs: Any
+    ) -> Any:
+        if not TIMINGS_ENABLED:
+            return await fetch_data(params, credentials, **kwargs)
+        timings = Timings(cls.__name__)
+        token = _current.set(timings)
+        try:
+            result = await fetch_data(params, credentials, **kwargs)
+        finally:
+            _current.reset(token)
+        report = timings.to_dict()
+        logger.info(
+            f"{cls.__name__} took {report['total']:.3f}s: "
+            + ", ".join(f"{k} {v:.3f}s" for k, v in report["totals"].items())
+        )
+        if isinstance(result, AnnotatedResult):
+            metadata = {**(result.metadata or {}), "timings": report}
+            return AnnotatedResult(result=result.result, metadata=metadata)
+        return AnnotatedResult(result=result, metadata={"timings": report})
+
+    cls.fetch_data = classmethod(fetch_with_timings)
+    return cls
@@ -0,0 +1,77 @@
+"""XiaoYuan listed-symbol universe."""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from openbb_xiaoyuan.utils.connection import get_connection_pool, get_pooled_reader
+from openbb_xiaoyuan.utils.timings import timed
+
+UNIVERSE_TTL = float(os.environ.get("XIAOYUAN_UNIVERSE_TTL", 3600))
+
+
+class SymbolUniverse:
+    """Listed A-share symbols with hash-set membership.
+
+    The full listing frame returned by the reader (listing and delisting
+    dates included) is kept alongside, indexed by symbol.
+    """
+
+    def __init__(self, listing: Any, loaded_at: Optional[float] = None):
+        """Initialize the universe from the reader's `get_stocks()` frame."""
+        self.listing = listing.drop_duplicates("symbol").set_index("symbol", drop=False)
+        self.symbols = frozenset(self.listing.index)
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+
+    def __contains__(self, symbol: object) -> bool:
+        """Check whether a symbol is listed."""
+        return symbol in self.symbols
+
+    def __len__(self) -> int:
+        """Return the number of listed symbols."""
+        return len(self.symbols)
+
+    def filter(self, symbols: Iterable[str]) -> List[str]:
+        """Keep the listed symbols, in order and without duplicates."""
+        return list(dict.fromkeys(s for s in symbols if s in self.symbols))
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """Return the listing record of a symbol."""
+        return self.listing.loc[symbol].to_dict()
+
+    def is_stale(self, ttl: float = UNIVERSE_TTL) -> bool:
+        """Check whether the universe is older than `ttl` seconds."""
+        return time.monotonic() - self.loaded_at > ttl
+
+
+_universe: Optional[SymbolUniverse] = None
+_universe_lock = threading.Lock()
+
+
+def get_symbol_universe() -> SymbolUniverse:
+    """Return the provider-wide symbol universe, refreshing it after the TTL."""
+    global _universe  # pylint: disable=global-statement
+    universe = _universe
+    if universe is not None and not universe.is_stale():
+        return universe
+    with _universe_lock:
+        if _universe is None or _universe.is_stale():
+            with timed("universe"):
+                _universe = SymbolUniverse(get_pooled_reader().get_stocks())
+        return _universe
+
+
+async def aget_symbol_universe() -> SymbolUniverse:
+    """Return the symbol universe without blocking the event loop on a refresh."""
+    universe = _universe
+    if universe is not None and not universe.is_stale():
+        return universe
+    return await get_connection_pool().run(get_symbol_universe)
+
+
+def set_symbol_universe(universe: Optional[SymbolUniverse]) -> None:
+    """Replace the provider-wide symbol universe."""
+    global _universe  # pylint: disable=global-statement
+    with _universe_lock:
+        _universe = universe
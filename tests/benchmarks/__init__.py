@@ -0,0 +1 @@
+"""XiaoYuan benchmarks."""
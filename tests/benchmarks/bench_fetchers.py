@@ -0,0 +1,211 @@
+"""Benchmark every registered fetcher against a synthetic data store.
+
+Run with `python -m tests.benchmarks.bench_fetchers [--symbols N] [--years N]`.
+Each fetcher runs end to end on a `SyntheticStore`, with the caches dropped
+before every run, and reports its wall time, peak traced memory and the
+time and rows/sec of each phase recorded by `openbb_xiaoyuan.utils.timings`.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import warnings
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from openbb_xiaoyuan import openbb_xiaoyuan_provider
+from openbb_xiaoyuan.utils import timings
+from tests.benchmarks.synthetic import SyntheticStore, reset_caches
+
+
+def fetcher_params(store: SyntheticStore) -> Dict[str, Dict[str, Any]]:
+    """Return the query parameters of every fetcher, spanning the whole store."""
+    symbols = ",".join(store.symbols)
+    start, end = store.start.date(), store.today.date()
+    statements = {"symbol": symbols, "period": "annual", "limit": store.years}
+    prices = {"symbol": symbols, "start_date": start, "end_date": end}
+    return {
+        "CashFlowStatement": statements,
+        "FinancialRatios": statements,
+        "CashFlowStatementGrowth": statements,
+        "BalanceSheetGrowth": statements,
+        "BalanceSheet": statements,
+        "IncomeStatement": statements,
+        "IncomeStatementGrowth": statements,
+        "EquityHistorical": {**prices, "use_cache": False},
+        "HistoricalMarketCap": prices,
+        "KeyMetrics": statements,
+        "EquityValuationMultiples": {"symbol": symbols},
+        "CalendarDividend": {"start_date": start, "end_date": end},
+        "HistoricalDividends": {
+            "symbol": store.symbols[0],
+            "start_date": start,
+            "end_date": end + timedelta(days=1),
+        },
+        "CompanyFundamentals": statements,
+        "EquityScreener": {
+            "report_factors": "营业收入",
+            "filters": "市盈率（滚动）>0",
+            "sort_by": "总市值",
+            "limit": None,
+        },
+    }
+
+
+def count_rows(result: Any) -> int:
+    """Return the number of records or table rows a fetcher returned."""
+    return getattr(result, "num_rows", None) or len(result)
+
+
+def phase_rows(report: Dict[str, Any], output_rows: int) -> Dict[str, int]:
+    """Return the rows handled by each phase.
+
+    Phases that report rows (queries, merges) are summed; extract and
+    transform are credited with the rows the fetcher returned.
+    """
+    rows: Dict[str, int] = {}
+    for phase in report["phases"]:
+        if "rows" in phase:
+            rows[phase["phase"]] = rows.get(phase["phase"], 0) + phase["rows"]
+    for stage in ("extract", "transform"):
+        rows.setdefault(stage, output_rows)
+    return rows
+
+
+def fetch(fetcher: Any, params: Dict[str, Any]) -> Any:
+    """Run a fetcher on a fresh event loop.
+
+    `asyncio.run` is avoided on purpose: restoring its SIGINT handler builds
+    the repr of the finished task, result included, which costs seconds on
+    large outputs and is not part of the fetcher.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(fetcher.fetch_data(params, {}))
+    finally:
+        loop.close()
+
+
+def run_once(fetcher: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a fetcher on cold caches and return its timings report and output size."""
+    reset_caches()
+    start = time.perf_counter()
+    annotated = fetch(fetcher, params)
+    wall = time.perf_counter() - start
+    report = annotated.metadata["timings"]
+    rows = count_rows(annotated.result)
+    return {"wall": wall, "rows": rows, "report": report}
+
+
+def peak_memory(fetcher: Any, params: Dict[str, Any]) -> int:
+    """Return the peak traced memory of one run, in bytes."""
+    reset_caches()
+    tracemalloc.start()
+    try:
+        fetch(fetcher, params)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(
+    store: SyntheticStore,
+    names: Optional[List[str]] = None,
+    repeat: int = 1,
+    memory: bool = True,
+    echo: Callable[[str], Any] = print,
+) -> Dict[str, Dict[str, Any]]:
+    """Benchmark the fetchers in `names`, all registered ones by default."""
+    store.install()
+    params = fetcher_params(store)
+    fetchers = openbb_xiaoyuan_provider.fetcher_dict
+    results: Dict[str, Dict[str, Any]] = {}
+    enabled, timings.TIMINGS_ENABLED = timings.TIMINGS_ENABLED, True
+    try:
+        for name in names or list(fetchers):
+            try:
+                runs = [run_once(fetchers[name], params[name]) for _ in range(repeat)]
+                best = min(runs, key=lambda r: r["wall"])
+                peak = peak_memory(fetchers[name], params[name]) if memory else None
+            except Exception as exc:  # pylint: disable=broad-except
+                results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+                echo(f"{name}: failed, {results[name]['error']}")
+                continue
+            results[name] = summarize(best, peak)
+            echo(format_result(name, results[name]))
+    finally:
+        timings.TIMINGS_ENABLED = enabled
+    return results
+
+
+def summarize(best: Dict[str, Any], peak: Optional[int]) -> Dict[str, Any]:
+    """Return the wall time, output rows, peak memory and phases of a run."""
+    rows = phase_rows(best["report"], best["rows"])
+    phases = {
+        phase: {
+            "seconds": seconds,
+            "rows": rows.get(phase),
+            "rows_per_second": (
+                round(rows[phase] / seconds) if rows.get(phase) and seconds else None
+            ),
+        }
+        for phase, seconds in best["report"]["totals"].items()
+    }
+    return {
+        "wall": round(best["wall"], 6),
+        "rows": best["rows"],
+        "peak_bytes": peak,
+        "phases": phases,
+    }
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """Format one fetcher's result as a block of text."""
+    peak = result["peak_bytes"]
+    lines = [
+        f"{name}: {result['rows']} rows in {result['wall']:.3f}s"
+        + ("" if peak is None else f", peak {peak / 1024**2:.1f} MiB")
+    ]
+    for phase, figures in result["phases"].items():
+        speed = figures["rows_per_second"]
+        lines.append(
+            f"  {phase:<16} {figures['seconds']:>9.4f}s"
+            + ("" if speed is None else f" {speed:>12,} rows/s")
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--symbols", type=int, default=100, help="1 to 5,000")
+    parser.add_argument("--years", type=int, default=5, help="1 to 20")
+    parser.add_argument("--fetcher", action="append", help="repeatable")
+    parser.add_argument("--repeat", type=int, default=1, help="best of N runs")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Per-run timing logs and per-symbol warnings would drown the report.
+    logger.disable("openbb_xiaoyuan")
+    warnings.simplefilter("ignore")
+
+    store = SyntheticStore(symbols=args.symbols, years=args.years)
+    results = benchmark(
+        store, args.fetcher, repeat=args.repeat, memory=not args.no_memory
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(
+                {"symbols": args.symbols, "years": args.years, "results": results},
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark the import time of the provider.
+
+Run with `python -m tests.benchmarks.bench_import [--module M] [--repeat N]`.
+Each run imports the provider, or `--module openbb_xiaoyuan.openbb` for the
+platform extension, in a fresh interpreter under
+`-X importtime` and reports the total cumulative time, the slowest modules
+and whether any fetcher module or pandas was loaded along the way.
+`--fetchers` then also loads every fetcher, as the platform does when it
+builds its registry map at startup: that imports every model module, so
+only imports stopping short of the registry skip them, while pandas and
+the other heavy modules wait for the first fetch either way.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+MODULE = "openbb_xiaoyuan"
+HEAVY = ("pandas", "numpy", "pyarrow", "dolphindb", "jinniuai_data_store")
+# Imported with `__import__`, as `-X importtime` does not log `importlib` imports.
+LOAD_FETCHERS = (
+    f"fetchers = {MODULE}.{MODULE}_provider.fetcher_dict; "
+    "[__import__(f'{fetchers.package}.{m}') for m, _ in fetchers.fetchers.values()]"
+)
+
+
+def import_times(
+    module: str = MODULE, fetchers: bool = False
+) -> List[Tuple[str, int, bool]]:
+    """Return the cumulative import time of every module loaded, in microseconds.
+
+    Each entry also says whether the module was imported at the top level.
+    """
+    code = f"import {module}"
+    if fetchers:
+        code += f"; import {MODULE}; {LOAD_FETCHERS}"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times.append((name.strip(), int(cumulative), not name.startswith("  ")))
+    return times
+
+
+def run_once(
+    module: str = MODULE, top: int = 10, fetchers: bool = False
+) -> Dict[str, Any]:
+    """Import `module` once and return its total time and what it loaded."""
+    times = import_times(module, fetchers)
+    loaded = {name: micros for name, micros, _ in times}
+    # Modules imported as the interpreter starts are listed before `module`.
+    first = next(
+        i for i, (name, _, root) in enumerate(times) if root and name == module
+    )
+    return {
+        "seconds": sum(micros for _, micros, root in times[first:] if root) / 1e6,
+        "slowest": [
+            {"module": name, "seconds": micros / 1e6}
+            for name, micros, _ in sorted(times, key=lambda t: -t[1])[1 : top + 1]
+        ],
+        "models": sorted(m for m in loaded if m.startswith(f"{MODULE}.models")),
+        "heavy": [m for m in HEAVY if m in loaded],
+    }
+
+
+def benchmark(
+    module: str = MODULE, repeat: int = 3, top: int = 10, fetchers: bool = False
+) -> Dict[str, Any]:
+    """Return the fastest of `repeat` imports of `module`."""
+    runs = [run_once(module, top, fetchers) for _ in range(repeat)]
+    return min(runs, key=lambda r: r["seconds"])
+
+
+def format_result(module: str, result: Dict[str, Any]) -> str:
+    """Format a result as a block of text."""
+    lines = [f"{module}: {result['seconds']:.3f}s"]
+    for entry in result["slowest"]:
+        lines.append(f"  {entry['module']:<48} {entry['seconds']:>8.3f}s")
+    lines.append(f"  fetcher modules loaded: {len(result['models'])}")
+    lines.append(f"  heavy modules loaded: {', '.join(result['heavy']) or 'none'}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--module", default=MODULE, help="module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules shown")
+    parser.add_argument("--json", help="also write the result to this file")
+    parser.add_argument(
+        "--fetchers", action="store_true", help="also load every fetcher"
+    )
+    args = parser.parse_args()
+
+    result = benchmark(args.module, args.repeat, args.top, args.fetchers)
+    print(format_result(args.module, result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark per-row model validation against `build_models`.
+
+Run with `python tests/benchmarks/bench_model_construction.py [rows]`.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from openbb_xiaoyuan.models.equity_historical import XiaoYuanEquityHistoricalData
+from openbb_xiaoyuan.models.historical_market_cap import (
+    XiaoYuanHistoricalMarketCapData,
+)
+from openbb_xiaoyuan.utils.models import build_models
+
+
+def historical_frame(rows: int) -> pd.DataFrame:
+    """Return a pivoted daily price frame shaped like the historical query."""
+    rng = np.random.default_rng(0)
+    close = rng.uniform(5, 500, rows)
+    return pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(np.arange(rows) % 5000, unit="D"),
+            "symbol": [f"SH{600000 + i % 200}" for i in range(rows)],
+            "开盘价（不复权）": close * 0.99,
+            "收盘价（不复权）": close,
+            "最高价（不复权）": close * 1.02,
+            "最低价（不复权）": close * 0.98,
+            "成交量（不复权）": rng.uniform(1e5, 1e7, rows),
+            "收盘价（前复权）": close,
+            "ref_close": close * 1.01,
+            "change": close * -0.01,
+            "changeOverTime": np.full(rows, -0.0099),
+        }
+    )
+
+
+def legacy(model, df):
+    """Build models the way the fetchers used to."""
+    return [model.model_validate(d) for d in df.to_dict(orient="records")]
+
+
+def timed(func, *args):
+    """Return the result and the wall time of a call."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(rows: int) -> None:
+    """Run the benchmark."""
+    prices = historical_frame(rows)
+    market_cap = prices[["timestamp", "symbol"]].assign(
+        总市值=prices["收盘价（不复权）"]
+    )
+    for model, df in [
+        (XiaoYuanEquityHistoricalData, prices),
+        (XiaoYuanHistoricalMarketCapData, market_cap),
+    ]:
+        old, old_time = timed(legacy, model, df)
+        new, new_time = timed(build_models, model, df)
+        assert len(old) == len(new)
+        assert old[-1].date == new[-1].date and old[-1].symbol == new[-1].symbol
+        print(
+            f"{model.__name__}: {rows} rows, "
+            f"model_validate {old_time:.2f}s, build_models {new_time:.2f}s, "
+            f"{old_time / new_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
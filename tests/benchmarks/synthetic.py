@@ -0,0 +1,421 @@
+"""Synthetic in-process stand-in for the jinniuai data store.
+
+`SyntheticStore` generates `cn_factors_1D`, `cn_finance_factors_1Q` and
+`dividend_detail` rows for any number of symbols and years, and its
+readers answer the scripts the XiaoYuan fetchers send, so every fetcher
+can run end to end without a DolphinDB cluster. Values are a pure
+function of symbol, factor and date: repeated and overlapping queries
+agree, as they would against the real tables.
+"""
+
+import ast
+import re
+import zlib
+from datetime import date as dateType
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from openbb_xiaoyuan.utils.adjustments import set_adjustment_factors
+from openbb_xiaoyuan.utils.calendar import set_trading_calendar
+from openbb_xiaoyuan.utils.connection import ConnectionPool, set_connection_pool
+from openbb_xiaoyuan.utils.cache import FrameCache
+from openbb_xiaoyuan.utils.finance import get_finance_cache, set_finance_cache
+from openbb_xiaoyuan.utils.prices import set_price_store
+from openbb_xiaoyuan.utils.references import SESSION_FUNCTIONS
+from openbb_xiaoyuan.utils.universe import set_symbol_universe
+
+CLOSE = "收盘价（不复权）"
+
+# Factors held by `cn_factors_1D`; every other factor is a report factor.
+DAILY_MARKERS = ("复权", "市值", "市盈率", "市净率", "市销率", "市现率", "股息率")
+
+_DATE = re.compile(r"\d{4}\.\d{2}\.\d{2}")
+_ASSIGN = re.compile(r"^\s*(\w+) = (\[.*\]);\s*$", re.M)
+
+
+def make_symbols(n: int) -> List[str]:
+    """Return n symbols, starting with the ones the fetcher tests use."""
+    symbols = ["SH600519", "SZ002415"]
+    symbols += [f"SH{600000 + i:06d}" for i in range(n)]
+    symbols += [f"SZ{i:06d}" for i in range(1, n + 1)]
+    return list(dict.fromkeys(symbols))[:n]
+
+
+def _parse_date(value: Any) -> pd.Timestamp:
+    return pd.Timestamp(str(value).replace(".", "-"))
+
+
+def is_daily(factor: str) -> bool:
+    """Check whether a factor lives in the daily table."""
+    return any(marker in factor for marker in DAILY_MARKERS)
+
+
+def _factor_key(factor: str) -> int:
+    return zlib.crc32(factor.encode("utf-8")) % 997
+
+
+class SyntheticStore:
+    """Deterministic market and fundamental data for `symbols` over `years`."""
+
+    def __init__(self, symbols: int = 100, years: int = 5, today: Any = None):
+        """Initialize the store."""
+        self.symbols = make_symbols(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.years = years
+        self.today = pd.Timestamp(today or dateType.today()).normalize()
+        self.start = self.today - pd.DateOffset(years=years)
+        self.calendar = pd.bdate_range(
+            "1990-01-01", self.today + pd.DateOffset(years=1)
+        )
+        self.days = self.calendar[
+            (self.calendar >= self.start) & (self.calendar <= self.today)
+        ]
+
+    # Tables
+
+    def _values(
+        self, factors: List[str], codes: np.ndarray, ordinals: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Return positive values varying smoothly with the date ordinal."""
+        base = 10.0 + codes % 90
+        columns = {}
+        for factor in factors:
+            k = _factor_key(factor)
+            columns[factor] = (base + k % 7) * (
+                1.2 + 0.2 * np.sin(ordinals / 37.0 + codes + k)
+            )
+        return columns
+
+    def daily(self, factors: List[str], symbols: List[str], days: Any) -> Any:
+        """Return `cn_factors_1D` pivoted by timestamp, symbol and factor."""
+        factors = [f for f in factors if is_daily(f)]
+        symbols = [s for s in symbols if s in self.index]
+        days = pd.DatetimeIndex(days)
+        days = days[days.isin(self.days)]
+        codes = np.tile([self.index[s] for s in symbols], len(days))
+        stamps = np.repeat(days.values, len(symbols))
+        ordinals = stamps.astype("datetime64[D]").astype(np.int64)
+        return pd.DataFrame(
+            {
+                "timestamp": stamps,
+                "symbol": np.tile(np.array(symbols, dtype=object), len(days)),
+                **self._values(factors, codes, ordinals),
+            }
+        )
+
+    def reports(self, factors: List[str], symbols: List[str]) -> Any:
+        """Return every published `cn_finance_factors_1Q` report of `symbols`."""
+        factors = [f for f in factors if not is_daily(f)]
+        symbols = [s for s in symbols if s in self.index]
+        periods = pd.date_range(
+            f"{self.start.year - 1}-03-31", self.today, freq="QE-DEC"
+        )
+        codes = np.tile([self.index[s] for s in symbols], len(periods))
+        period = np.repeat(periods.values, len(symbols))
+        published = period + pd.to_timedelta(30 + codes % 60, unit="D").values
+        ordinals = period.astype("datetime64[D]").astype(np.int64)
+        df = pd.DataFrame(
+            {
+                "timestamp": published,
+                "symbol": np.tile(np.array(symbols, dtype=object), len(periods)),
+                "报告期": period,
+                **self._values(factors, codes, ordinals),
+            }
+        )
+        return df[df["timestamp"] <= self.today].reset_index(drop=True)
+
+    def dividends(self, start: Any, end: Any, code: Optional[str] = None) -> Any:
+        """Return `dividend_detail` rows paid between start and end.
+
+        Each symbol pays once a year, in a month that varies by symbol.
+        """
+        symbols = [s for s in self.symbols if code is None or s[-6:] == code]
+        years = np.arange(self.start.year, self.today.year + 1)
+        codes = np.tile([self.index[s] for s in symbols], len(years))
+        paid = pd.to_datetime(
+            {"year": np.repeat(years, len(symbols)), "month": 1 + codes % 12, "day": 1}
+        ) + pd.to_timedelta(codes % 30, unit="D")
+        df = pd.DataFrame(
+            {
+                "symbol": np.tile(np.array(symbols, dtype=object), len(years)),
+                "dividend": 0.1 + (codes % 50) / 10,
+                "recordDate": paid - pd.Timedelta(days=1),
+                "paymentDate": paid,
+                "date": paid,
+            }
+        )
+        mask = (df["date"] >= _parse_date(start)) & (df["date"] <= _parse_date(end))
+        mask &= (df["date"] >= self.start) & (df["date"] <= self.today)
+        return df[mask].reset_index(drop=True)
+
+    def listing(self) -> Any:
+        """Return the `get_stocks()` frame."""
+        return pd.DataFrame(
+            {
+                "symbol": self.symbols,
+                "name": self.symbols,
+                "list_date": pd.Timestamp("2000-01-04"),
+                "end_date": pd.NaT,
+            }
+        )
+
+    # Queries
+
+    def finance(self, script: str, factors: List[str], symbols: List[str]) -> Any:
+        """Answer the pivoted report query of `get_query_finance_sql`."""
+        df = self.reports(factors, symbols)
+        month = re.search(r"monthOfYear\(报告期\) = (\d+)", script)
+        if month:
+            df = df[df["报告期"].dt.month == int(month.group(1))]
+        low = re.search(r"报告期 >= (\S+)", script)
+        if low:
+            low_date = _parse_date(low.group(1))
+            df = df[df["报告期"] >= low_date]
+        limit = re.search(r"limit (-?\d+)", script)
+        if limit:
+            n = int(limit.group(1))
+            groups = df.sort_values("报告期").groupby(
+                ["symbol", df["报告期"].dt.month], sort=False
+            )
+            df = groups.tail(-n) if n < 0 else groups.head(n)
+        df = df.sort_values(["timestamp", "symbol", "报告期"], ignore_index=True)
+        quarter = df["报告期"].dt.quarter
+        return df.assign(
+            fiscal_period="q" + quarter.astype(str),
+            fiscal_year=df["报告期"].dt.year,
+        )
+
+    def finance_asof_daily(
+        self,
+        script: str,
+        factors: List[str],
+        daily_factors: List[str],
+        symbols: List[str],
+    ) -> Any:
+        """Answer `get_finance_asof_daily_sql`: reports joined with the prior day."""
+        df = self.finance(script, factors, symbols)
+        if df.empty:
+            return df
+        df["asof_day"] = df["报告期"] - pd.Timedelta(days=1)
+        index = self.calendar.searchsorted(df["asof_day"], side="right") - 1
+        df["day"] = self.calendar[index.clip(0)].where(index >= 0)
+        daily = self.daily(daily_factors, symbols, df["day"].dropna().unique())
+        daily = daily.rename(columns={"timestamp": "day"})
+        joined = df.merge(daily, "left", ["symbol", "day"])
+        return joined.sort_values(["timestamp", "symbol", "报告期"], ignore_index=True)
+
+    def valuation(self, script: str, variables: Dict[str, Any]) -> Any:
+        """Answer `get_valuation_snapshot_sql`."""
+        low, high = map(
+            _parse_date, re.search(r"between (\S+) and (\S+)", script).groups()
+        )
+        symbols = self.symbols
+        if "symbol in symbols" in script:
+            symbols = variables["symbols"]
+        df = self.reports(variables["financeFactors"], symbols)
+        df = df[df["timestamp"].between(low, high)]
+        df = df.sort_values("timestamp").groupby("symbol", sort=False).tail(1)
+        days = self.calendar[self.calendar.searchsorted(df["报告期"])]
+        df = df.assign(day=days).sort_values("symbol")
+        daily = self.daily(variables["dailyFactors"], symbols, days.unique())
+        daily = daily.rename(columns={"timestamp": "day"})
+        return df.merge(daily, "left", ["symbol", "day"]).reset_index(drop=True)
+
+    def prices(self, script: str, factors: List[str], symbols: List[str]) -> Any:
+        """Answer the `use mytt` price script, change columns included."""
+        low, high = re.search(r"between\s+(\S+)\s+and\s+(\S+)", script).groups()
+        days = self.days[
+            (self.days >= _parse_date(low)) & (self.days <= _parse_date(high))
+        ]
+        df = self.daily(factors, symbols, days)
+        if "use mytt" not in script:
+            return self.resample(df, script)
+        df["ref_close"] = df.groupby("symbol", sort=False)[CLOSE].shift(1)
+        after = re.search(r"timestamp > (\S+);", script).group(1)
+        df = self.resample(df[df["timestamp"] > _parse_date(after)], script)
+        df["change"] = df[CLOSE] - df["ref_close"]
+        df["changeOverTime"] = df["change"] / df["ref_close"]
+        return df
+
+    def adjustment_factors(self, script: str, symbols: List[str]) -> Any:
+        """Answer `get_adjustment_factors_sql`: the days each factor changed."""
+        close, adj_close = re.search(
+            r"factor_name in \['(.+?)', '(.+?)'\]", script
+        ).groups()
+        low, high = re.search(r"between\s+(\S+)\s+and\s+(\S+);", script).groups()
+        days = self.days[
+            (self.days >= _parse_date(low)) & (self.days <= _parse_date(high))
+        ]
+        df = self.daily([close, adj_close], symbols, days)
+        df["factor"] = df[adj_close] / df[close]
+        grouped = df.groupby("symbol", sort=False)["factor"]
+        previous, following = grouped.shift(1), grouped.shift(-1)
+        changed = previous.isna() | following.isna() | (df["factor"] != previous)
+        return df.loc[changed, ["timestamp", "symbol", "factor"]].reset_index(drop=True)
+
+    @staticmethod
+    def resample(df: Any, script: str) -> Any:
+        """Apply the bar aggregation of `get_resample_sql`, if the script has one."""
+        bar = re.search(r"group by symbol, (\w+)\(timestamp\) as bar", script)
+        if bar is None:
+            return df.reset_index(drop=True)
+        freq = {"weekEnd": "W-FRI", "monthEnd": "M", "quarterEnd": "Q"}[bar.group(1)]
+        # DolphinDB's `first` keeps nulls, unlike pandas'.
+        aggregations = dict(
+            (column, (lambda s: s.iloc[0]) if function == "first" else function)
+            for function, column in re.findall(r"(\w+)\(([^()]+)\) as \2", script)
+            if column != "timestamp"
+        )
+        bars = df["timestamp"].dt.to_period(freq).rename("bar")
+        grouped = df.groupby([df["symbol"], bars], sort=False)
+        df = grouped.agg({"timestamp": "last", **aggregations}).reset_index()
+        return df.sort_values(["timestamp", "symbol"], ignore_index=True)[
+            ["timestamp", "symbol", *aggregations]
+        ]
+
+    def screen(self, script: str, variables: Dict[str, Any]) -> Any:
+        """Answer the `get_screener_sql` script."""
+        day = _parse_date(re.search(r"between (\S+) and \1", script).group(1))
+        df = self.daily(variables["dailyFactors"], self.symbols, [day])
+        df = df.drop(columns="timestamp")
+        if "reportFactors" in variables and "lj(" in script:
+            since = _parse_date(
+                re.search(r"between (\S+) and", script.split("r = ")[1]).group(1)
+            )
+            reports = self.reports(variables["reportFactors"], self.symbols)
+            reports = reports[reports["timestamp"].between(since, day)]
+            latest = reports.sort_values("timestamp").groupby("symbol").tail(1)
+            df = df.merge(
+                latest.drop(columns=["timestamp", "报告期"]), "left", "symbol"
+            )
+        ranked = script.strip().split("\n")[-1]
+        where = re.search(r" where (.+?)(?: order by| limit|;)", ranked)
+        for condition in where.group(1).split(" and ") if where else []:
+            column, op, value = condition.split(" ")
+            op = {"=": "==", "!=": "!="}.get(op, op)
+            df = df[df.eval(f"`{column}` {op} {value}")]
+        order = re.search(r" order by (\S+) (asc|desc)", ranked)
+        if order:
+            df = df.sort_values(order.group(1), ascending=order.group(2) == "asc")
+        limit = re.search(r" limit (\d+)", ranked)
+        if limit:
+            df = df.head(int(limit.group(1)))
+        return df.reset_index(drop=True)
+
+    # Wiring
+
+    def reader(self) -> "SyntheticReader":
+        """Create a reader, the stand-in for `get_jindata_reader()`."""
+        return SyntheticReader(self)
+
+    def install(self, pool_size: int = 4) -> ConnectionPool:
+        """Route the provider's pool to this store and drop every cached result."""
+        pool = ConnectionPool(factory=self.reader, size=pool_size)
+        set_connection_pool(pool)
+        # Memory only, so runs neither read nor clear the on-disk cache.
+        set_finance_cache(FrameCache("finance", directory=None))
+        reset_caches()
+        set_trading_calendar(None)
+        set_symbol_universe(None)
+        return pool
+
+
+def reset_caches() -> None:
+    """Drop the cached price history, adjustment factors and finance results."""
+    set_price_store(None)
+    set_adjustment_factors(None)
+    get_finance_cache().clear()
+
+
+class SyntheticSession:
+    """Session stand-in accepting uploaded variables.
+
+    Unlike a DolphinDB session, uploads only last until the next script, so
+    no script is answered from variables an earlier one bound.
+    """
+
+    def __init__(self):
+        """Initialize the session."""
+        self.variables: Dict[str, Any] = {}
+
+    def upload(self, variables: Dict[str, Any]) -> None:
+        """Bind variables for the next script."""
+        self.variables.update(variables)
+
+    def take(self) -> Dict[str, Any]:
+        """Return the uploaded variables and forget them."""
+        variables, self.variables = self.variables, {}
+        return variables
+
+
+class SyntheticReader:
+    """Reader stand-in answering the XiaoYuan scripts from a `SyntheticStore`."""
+
+    def __init__(self, store: SyntheticStore):
+        """Initialize the reader."""
+        self.store = store
+        self.session = SyntheticSession()
+
+    def get_stocks(self) -> Any:
+        """Return the listed symbols."""
+        return self.store.listing()
+
+    @staticmethod
+    def _value(argument: str, variables: Dict[str, Any]) -> Any:
+        argument = argument.strip()
+        if argument in variables:
+            return variables[argument]
+        if argument == "NULL":
+            return None
+        if _DATE.fullmatch(argument):
+            return argument
+        return ast.literal_eval(argument)
+
+    def _call(
+        self, script: str, name: str, variables: Dict[str, Any]
+    ) -> Optional[List[Any]]:
+        match = re.search(rf"\b{name}\(([^)]*)\)", script)
+        if match is None:
+            return None
+        return [self._value(a, variables) for a in match.group(1).split(",")]
+
+    def _run_query(self, script: str, **kwargs: Any) -> Any:
+        """Answer a script, or raise for a shape the store does not know."""
+        store = self.store
+        if script.strip() == "1":
+            return 1
+        for definition in SESSION_FUNCTIONS.values():
+            script = script.replace(definition, "")
+        variables = self.session.take()
+        for name, value in _ASSIGN.findall(script):
+            variables[name] = ast.literal_eval(value)
+
+        if "asof_day" in script:
+            return store.finance_asof_daily(
+                script,
+                variables["factorNames"],
+                variables["dailyFactorNames"],
+                variables["symbols"],
+            )
+        if "tradingDays" in script:
+            return store.valuation(script, variables)
+        if "getMarketCalendar" in script:
+            return pd.DataFrame({"timestamp": store.calendar})
+        if "max(timestamp)" in script:
+            return pd.DataFrame({"timestamp": [store.today]})
+        if (args := self._call(script, "queryDailyFactors", variables)) is not None:
+            factors, symbols, dates = args
+            return store.daily(factors, symbols, [_parse_date(d) for d in dates])
+        if (args := self._call(script, "queryDividends", variables)) is not None:
+            return store.dividends(*args[:3])
+        if "dailyFactors" in variables and "pivot by symbol," in script:
+            return store.screen(script, variables)
+        if " as factor " in script:
+            return store.adjustment_factors(script, variables["symbols"])
+        if "cn_finance_factors_1Q" in script:
+            return store.finance(script, variables["factorNames"], variables["symbols"])
+        if "cn_factors_1D" in script:
+            return store.prices(script, variables["factorNames"], variables["symbols"])
+        raise ValueError(f"Unsupported script: {script[:200]}")
@@ -0,0 +1,215 @@
+"""Record and replay of XiaoYuan DolphinDB queries.
+
+A cassette holds the scripts one test sent through `_run_query` (and its
+`get_stocks` call) together with the frames that came back, each frame
+stored as a zstd-compressed Arrow file next to an `index.json`. Scripts
+are keyed by their normalized text, with the session function definitions
+removed and whitespace collapsed. On replay a script is looked up by that
+key first, then, in recording order, by the same text with its date
+literals masked, so queries bounded by "today" keep replaying as the
+calendar moves.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from openbb_xiaoyuan.utils.adjustments import set_adjustment_factors
+from openbb_xiaoyuan.utils.cache import FrameCache
+from openbb_xiaoyuan.utils.calendar import set_trading_calendar
+from openbb_xiaoyuan.utils.connection import ConnectionPool, set_connection_pool
+from openbb_xiaoyuan.utils.finance import set_finance_cache
+from openbb_xiaoyuan.utils.prices import set_price_store
+from openbb_xiaoyuan.utils.references import SESSION_FUNCTIONS
+from openbb_xiaoyuan.utils.universe import set_symbol_universe
+
+RECORD_MODES = ("none", "new", "all")
+
+_WHITESPACE = re.compile(r"\s+")
+_DATE = re.compile(r"\b\d{4}\.\d{2}\.\d{2}\b")
+
+
+class CassetteMiss(LookupError):
+    """A replayed script has no recorded result."""
+
+
+def normalize_script(script: str) -> str:
+    """Return the script without session function definitions or extra whitespace."""
+    for definition in SESSION_FUNCTIONS.values():
+        script = script.replace(definition, "")
+    return _WHITESPACE.sub(" ", script).strip()
+
+
+def mask_dates(script: str) -> str:
+    """Replace the date literals of a normalized script."""
+    return _DATE.sub("<date>", script)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """Recorded query results of one test.
+
+    In mode "none" every script must be in the cassette; "new" records the
+    missing ones and "all" records everything again.
+    """
+
+    def __init__(self, path: Path, mode: str = "none"):
+        """Load the cassette at `path`, if it exists."""
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Invalid record mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.entries: List[Dict[str, Any]] = []
+        self._played: set = set()
+        self._lock = threading.Lock()
+        index = self.path / "index.json"
+        if index.exists() and mode != "all":
+            self.entries = json.loads(index.read_text(encoding="utf-8"))
+
+    @property
+    def exists(self) -> bool:
+        """Check whether anything was recorded."""
+        return bool(self.entries)
+
+    @property
+    def recording(self) -> bool:
+        """Check whether missing scripts go to the live reader."""
+        return self.mode != "none"
+
+    def _find(self, script: str) -> Optional[Dict[str, Any]]:
+        for entry in self.entries:
+            if entry["script"] == script:
+                return entry
+        masked = mask_dates(script)
+        for i, entry in enumerate(self.entries):
+            if i not in self._played and mask_dates(entry["script"]) == masked:
+                return entry
+        return None
+
+    def play(self, script: str) -> Any:
+        """Return the recorded result of a normalized script."""
+        with self._lock:
+            entry = self._find(script)
+            if entry is None:
+                raise CassetteMiss(f"No recorded result in {self.path} for: {script}")
+            self._played.add(self.entries.index(entry))
+        if "value" in entry:
+            return entry["value"]
+        # pylint: disable=import-outside-toplevel
+        from pyarrow import feather
+
+        return feather.read_feather(self.path / entry["file"])
+
+    def record(self, script: str, result: Any) -> None:
+        """Write the result of a normalized script."""
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+        from pyarrow import feather
+
+        entry: Dict[str, Any] = {"script": script}
+        if isinstance(result, pd.DataFrame):
+            entry["file"] = f"{_digest(script)}.arrow"
+            self.path.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(
+                result.reset_index(drop=True),
+                self.path / entry["file"],
+                compression="zstd",
+            )
+        else:
+            entry["value"] = result
+        with self._lock:
+            self.entries = [e for e in self.entries if e["script"] != script]
+            self.entries.append(entry)
+            self._played.add(len(self.entries) - 1)
+
+    def save(self) -> None:
+        """Write the index and drop the frames no entry refers to."""
+        if not self.entries:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / "index.json").write_text(
+            json.dumps(self.entries, ensure_ascii=False, indent=1), encoding="utf-8"
+        )
+        files = {e["file"] for e in self.entries if "file" in e}
+        for path in self.path.glob("*.arrow"):
+            if path.name not in files:
+                path.unlink()
+
+
+class CassetteReader:
+    """Reader stand-in serving `_run_query` and `get_stocks` from a cassette.
+
+    It exposes no DolphinDB session, so bound variables are inlined into the
+    script text and become part of the key.
+    """
+
+    def __init__(self, cassette: Cassette, reader: Any = None):
+        """Initialize the reader, forwarding misses to `reader` when recording."""
+        self.cassette = cassette
+        self.reader = reader
+
+    def _call(self, key: str, call: Callable[[], Any]) -> Any:
+        cassette = self.cassette
+        if cassette.mode != "all":
+            try:
+                return cassette.play(key)
+            except CassetteMiss:
+                if not cassette.recording:
+                    raise
+        result = call()
+        cassette.record(key, result)
+        return result
+
+    def _run_query(self, script: str, **kwargs: Any) -> Any:
+        """Replay or record a script."""
+        if script.strip() == "1":
+            return 1  # Health check.
+        return self._call(
+            normalize_script(script),
+            lambda: self.reader._run_query(  # pylint: disable=protected-access
+                script=script, **kwargs
+            ),
+        )
+
+    def get_stocks(self) -> Any:
+        """Replay or record the listed symbols."""
+        return self._call("get_stocks()", lambda: self.reader.get_stocks())
+
+
+@contextmanager
+def use_cassette(
+    cassette: Cassette, factory: Optional[Callable[[], Any]] = None
+) -> Iterator[Cassette]:
+    """Serve the provider's queries from `cassette` with every cache cleared.
+
+    `factory` creates the live readers that record the missing scripts.
+    """
+
+    def reader() -> CassetteReader:
+        live = factory() if cassette.recording and factory is not None else None
+        return CassetteReader(cassette, live)
+
+    set_connection_pool(ConnectionPool(factory=reader))
+    set_finance_cache(FrameCache("finance", directory=None))
+    set_price_store(None)
+    set_adjustment_factors(None)
+    set_trading_calendar(None)
+    set_symbol_universe(None)
+    try:
+        yield cassette
+    finally:
+        set_connection_pool(None)
+        set_finance_cache(None)
+        set_price_store(None)
+        set_adjustment_factors(None)
+        set_trading_calendar(None)
+        set_symbol_universe(None)
+        if cassette.recording:
+            cassette.save()
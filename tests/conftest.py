@@ -0,0 +1,71 @@
+"""XiaoYuan test configuration."""
+
+from pathlib import Path
+
+import pytest
+
+from tests.cassette import RECORD_MODES, Cassette, use_cassette
+
+RECORD_DIR = Path(__file__).parent / "record"
+RECORD_SOURCES = ("live", "synthetic")
+
+
+def pytest_addoption(parser):
+    """Add the query recording option."""
+    parser.addoption(
+        "--record-queries",
+        choices=RECORD_MODES,
+        default="none",
+        help="Replay DolphinDB queries from cassettes ('none'), record the "
+        "missing ones ('new') or record all of them again ('all').",
+    )
+    parser.addoption(
+        "--record-from",
+        choices=RECORD_SOURCES,
+        default="live",
+        help="Record from the live store ('live') or from the synthetic "
+        "store of tests/benchmarks/synthetic.py ('synthetic').",
+    )
+
+
+def _reader_factory(source: str):
+    """Return the factory of the readers that record missing queries."""
+    # pylint: disable=import-outside-toplevel
+    if source == "synthetic":
+        from tests.benchmarks.synthetic import SyntheticStore
+
+        return SyntheticStore().reader
+    from openbb_xiaoyuan.utils.connection import _default_reader_factory
+
+    return _default_reader_factory
+
+
+def pytest_configure(config):
+    """Register the query recording marker."""
+    config.addinivalue_line(
+        "markers", "record_queries: serve the test's DolphinDB queries from a cassette"
+    )
+
+
+@pytest.fixture(autouse=True)
+def query_cassette(request):
+    """Replay, or record, the queries of tests marked `record_queries`."""
+    if request.node.get_closest_marker("record_queries") is None:
+        yield None
+        return
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    cassette = Cassette(
+        RECORD_DIR / module / request.node.name,
+        request.config.getoption("--record-queries"),
+    )
+    if not cassette.recording and not cassette.exists:
+        # A skip would let every fetcher test pass silently without cassettes.
+        pytest.fail(
+            f"No recorded queries in {cassette.path}, run with "
+            "--record-queries=new to record them from the live store, or "
+            "also with --record-from=synthetic to record them offline.",
+            pytrace=False,
+        )
+    factory = _reader_factory(request.config.getoption("--record-from"))
+    with use_cassette(cassette, factory):
+        yield cassette
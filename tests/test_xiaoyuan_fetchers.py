@@ -14,7 +14,11 @@ from openbb_xiaoyuan.models.cash_flow import XiaoYuanCashFlowStatementFetcher
 from openbb_xiaoyuan.models.cash_flow_growth import (
     XiaoYuanCashFlowStatementGrowthFetcher,
 )
+from openbb_xiaoyuan.models.company_fundamentals import (
+    XiaoYuanCompanyFundamentalsFetcher,
+)
 from openbb_xiaoyuan.models.equity_historical import XiaoYuanEquityHistoricalFetcher
+from openbb_xiaoyuan.models.equity_screener import XiaoYuanEquityScreenerFetcher
 from openbb_xiaoyuan.models.financial_ratios import (
     XiaoYuanFinancialRatiosFetcher,
 )
@@ -55,6 +59,7 @@ def vcr_config():
     }
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_financial_ratios_fetcher(credentials=test_credentials):
     """Test XiaoYuanFinancialRatiosFetcher."""
     params = {"symbol": "SH600519", "period": "annual", "limit": 4}
@@ -63,6 +68,7 @@ def test_xiaoyuan_financial_ratios_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_cash_growth_fetcher(credentials=test_credentials):
     """Test XiaoYuanCashFlowStatementGrowthFetcher."""
     params = {"symbol": "SH600519", "period": "annual", "limit": 4}
@@ -71,6 +77,7 @@ def test_xiaoyuan_cash_growth_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_balance_growth_fetcher(credentials=test_credentials):
     """Test XiaoYuanBalanceSheetGrowthFetcher."""
     params = {"symbol": "SH600519", "period": "annual", "limit": 4}
@@ -79,6 +86,7 @@ def test_xiaoyuan_balance_growth_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_cash_flow_fetcher(credentials=test_credentials):
     params = {
         "symbol": "SH600519",
@@ -90,6 +98,7 @@ def test_xiaoyuan_cash_flow_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_balance_sheet_fetcher(credentials=test_credentials):
     """Test XiaoYuanBalanceSheetFetcher."""
     params = {"symbol": "SH600519", "period": "ytd"}
@@ -99,6 +108,17 @@ def test_xiaoyuan_balance_sheet_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
+def test_xiaoyuan_balance_sheet_multiple_symbols_fetcher(credentials=test_credentials):
+    """Test XiaoYuanBalanceSheetFetcher with several symbols in one query."""
+    params = {"symbol": "SH600519,SZ002415", "period": "annual", "limit": 4}
+
+    fetcher = XiaoYuanBalanceSheetFetcher()
+    result = fetcher.test(params, credentials)
+    assert result is None
+
+
+@pytest.mark.record_queries
 def test_xiaoyuan_income_statement_fetcher(credentials=test_credentials):
     """Test XiaoYuanIncomeStatementFetcher."""
     params = {"symbol": "SH600519", "period": "ytd"}
@@ -108,6 +128,7 @@ def test_xiaoyuan_income_statement_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_key_metrics_fetcher(credentials=test_credentials):
     """Test XiaoYuanKeyMetricsFetcher."""
     params = {"symbol": "SH600519,SZ002415", "period": "ytd"}
@@ -117,6 +138,7 @@ def test_xiaoyuan_key_metrics_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiao_yuan_income_statement_growth_fetcher(credentials=test_credentials):
     """Test XiaoYuanIncomeStatementGrowthFetcher."""
     params = {"symbol": "SH600519", "period": "annual", "limit": 4}
@@ -126,6 +148,7 @@ def test_xiao_yuan_income_statement_growth_fetcher(credentials=test_credentials)
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiao_yuan_equity_historical_fetcher(credentials=test_credentials):
     """Test XiaoYuanEquityHistoricalFetcher."""
     params = {
@@ -140,6 +163,22 @@ def test_xiao_yuan_equity_historical_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
+def test_xiao_yuan_equity_historical_monthly_fetcher(credentials=test_credentials):
+    """Test XiaoYuanEquityHistoricalFetcher with monthly bars."""
+    params = {
+        "symbol": "SH600519",
+        "start_date": date(2023, 1, 1),
+        "end_date": date(2023, 12, 31),
+        "interval": "1M",
+    }
+
+    fetcher = XiaoYuanEquityHistoricalFetcher()
+    result = fetcher.test(params, credentials)
+    assert result is None
+
+
+@pytest.mark.record_queries
 def test_xiao_yuan_historical_market_cap_fetcher(credentials=test_credentials):
     """Test XiaoYuanHistoricalMarketCapFetcher."""
     params = {
@@ -154,6 +193,7 @@ def test_xiao_yuan_historical_market_cap_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiaoyuan_equity_valuation_multiples_fetcher(credentials=test_credentials):
     """Test XiaoYuanIncomeStatementGrowthFetcher."""
     params = {"symbol": "SH600519,SZ002415"}
@@ -163,6 +203,7 @@ def test_xiaoyuan_equity_valuation_multiples_fetcher(credentials=test_credential
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiao_yuan_calendar_dividend_fetcher(credentials=test_credentials):
     """Test XiaoYuanCalendarDividendFetcher."""
     params = {
@@ -175,6 +216,7 @@ def test_xiao_yuan_calendar_dividend_fetcher(credentials=test_credentials):
     assert result is None
 
 
+@pytest.mark.record_queries
 def test_xiao_yuan_historical_dividends_fetcher(credentials=test_credentials):
     """Test XiaoYuanHistoricalDividendsFetcher."""
     params = {
@@ -186,3 +228,29 @@ def test_xiao_yuan_historical_dividends_fetcher(credentials=test_credentials):
     fetcher = XiaoYuanHistoricalDividendsFetcher()
     result = fetcher.test(params, credentials)
     assert result is None
+
+
+@pytest.mark.record_queries
+def test_xiaoyuan_company_fundamentals_fetcher(credentials=test_credentials):
+    """Test XiaoYuanCompanyFundamentalsFetcher."""
+    params = {"symbol": "SH600519,SZ002415", "period": "annual", "limit": 4}
+
+    fetcher = XiaoYuanCompanyFundamentalsFetcher()
+    result = fetcher.test(params, credentials)
+    assert result is None
+
+
+@pytest.mark.record_queries
+def test_xiaoyuan_equity_screener_fetcher(credentials=test_credentials):
+    """Test XiaoYuanEquityScreenerFetcher."""
+    params = {
+        "date": date(2024, 10, 8),
+        "report_factors": "营业收入",
+        "filters": "市盈率（滚动）>0,市盈率（滚动）<20",
+        "sort_by": "总市值",
+        "limit": 20,
+    }
+
+    fetcher = XiaoYuanEquityScreenerFetcher()
+    result = fetcher.test(params, credentials)
+    assert result is None
@@ -0,0 +1,1121 @@
+"""Tests for XiaoYuan utilities."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import types
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openbb_xiaoyuan.utils import timings
+from openbb_xiaoyuan.utils.cache import FrameCache, make_key
+from openbb_xiaoyuan.utils.calendar import (
+    TradingCalendar,
+    set_trading_calendar,
+    to_datetime64,
+    to_db_dates,
+)
+from openbb_xiaoyuan.utils.connection import (
+    UPLOAD_THRESHOLD,
+    ConnectionPool,
+    PooledConnection,
+    PooledReader,
+    set_connection_pool,
+)
+from openbb_xiaoyuan.utils.finance import set_finance_cache
+from openbb_xiaoyuan.utils.models import build_models, is_trusted, rename_columns
+from openbb_xiaoyuan.utils.prices import ADJ_CLOSE, PriceStore
+from openbb_xiaoyuan.utils.universe import SymbolUniverse, set_symbol_universe
+
+
+class DummyReader:
+    """Reader stand-in that records the scripts it runs."""
+
+    def __init__(self):
+        self.scripts = []
+        self.closed = False
+
+    def _run_query(self, script):
+        self.scripts.append(script)
+        return script
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_pool_reuses_connections():
+    """Connections are created lazily and reused after release."""
+    pool = ConnectionPool(factory=DummyReader, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert pool.stats() == {"size": 2, "created": 1, "idle": 1, "in_use": 0}
+
+
+def test_connection_pool_bounds_concurrency():
+    """Acquiring beyond the pool size times out instead of opening more sessions."""
+    pool = ConnectionPool(factory=DummyReader, size=1, acquire_timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_connection_pool_reaps_idle_and_unhealthy():
+    """Idle connections are closed, and failed ones are pinged before reuse."""
+    pool = ConnectionPool(factory=DummyReader, size=2, idle_timeout=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    assert conn.reader.closed
+    assert pool.stats()["created"] == 0
+
+    pool = ConnectionPool(factory=DummyReader, size=1)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            raise RuntimeError
+    with pool.connection() as again:
+        assert again is conn
+        assert conn.reader.scripts == ["1"]
+
+
+def test_default_factory_opens_a_session_per_connection(monkeypatch):
+    """Pooled readers are distinct objects on sessions of their own."""
+
+    class Session:
+        host, port, userid, password = "ddb", 8848, "user", "secret"
+
+        def connect(self, host, port, userid, password):
+            self.address = (host, port, userid, password)
+
+    class Reader:
+        def __init__(self):
+            self.session = Session()
+
+        def _run_query(self, script):
+            return script
+
+    shared = Reader()
+    reader_module = types.ModuleType("jinniuai_data_store.reader")
+    reader_module.get_jindata_reader = lambda: shared
+    monkeypatch.setitem(sys.modules, "jinniuai_data_store", types.ModuleType("j"))
+    monkeypatch.setitem(sys.modules, "jinniuai_data_store.reader", reader_module)
+    monkeypatch.setitem(
+        sys.modules, "dolphindb", types.SimpleNamespace(session=Session)
+    )
+
+    pool = ConnectionPool(size=2)
+    first, second = pool.acquire(), pool.acquire()
+    readers = {id(shared), id(first.reader), id(second.reader)}
+    sessions = {id(shared.session), id(first.reader.session), id(second.reader.session)}
+    assert len(readers) == len(sessions) == 3
+    assert first.reader.session.address == ("ddb", 8848, "user", "secret")
+
+
+def test_pooled_reader_spreads_calls():
+    """The pooled reader proxies reader methods from several threads."""
+    pool = ConnectionPool(factory=DummyReader, size=3)
+    reader = PooledReader(pool)
+    threads = [
+        threading.Thread(target=reader._run_query, kwargs={"script": str(i)})
+        for i in range(12)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert reader._run_query(script="x") == "x"
+    assert pool.stats()["in_use"] == 0
+    assert pool.stats()["created"] <= 3
+
+
+def test_pooled_reader_runs_queries_off_the_event_loop():
+    """Async queries run on the pool's executor threads, not the event loop thread."""
+    pool = ConnectionPool(factory=DummyReader, size=2)
+    reader = PooledReader(pool)
+
+    async def run():
+        return await asyncio.gather(
+            reader.arun_query("a"),
+            reader.acall("_run_query", script="b"),
+            pool.run(threading.current_thread),
+        )
+
+    first, second, thread = asyncio.run(run())
+    assert (first, second) == ("a", "b")
+    assert thread.name.startswith("xiaoyuan-db")
+    pool.close()
+
+
+def test_pooled_connection_uploads_large_variables():
+    """Large lists are uploaded on the session, small ones are inlined."""
+
+    class Session:
+        def __init__(self):
+            self.uploaded = {}
+
+        def upload(self, variables):
+            self.uploaded.update(variables)
+
+    symbols = [f"SH{600000 + i}" for i in range(UPLOAD_THRESHOLD)]
+    script = "use mytt\nselect * from t where symbol in symbols and factor_name in f"
+
+    reader = DummyReader()
+    reader.session = Session()
+    PooledConnection(reader).run_query(script, {"symbols": symbols, "f": ["a"]})
+    assert reader.session.uploaded == {"symbols": symbols}
+    assert reader.scripts[-1].split("\n")[:2] == ["use mytt", "f = ['a'];"]
+    assert "SH600000" not in reader.scripts[-1]
+
+    reader = DummyReader()
+    PooledConnection(reader).run_query(script, {"symbols": symbols})
+    assert reader.scripts[-1].split("\n")[1] == f"symbols = {symbols};"
+
+
+def test_pooled_connection_defines_session_functions_once():
+    """Shared helpers are sent with the first script that calls them."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.references import get_specific_daily_sql
+
+    reader = DummyReader()
+    conn = PooledConnection(reader)
+    for _ in range(2):
+        variables = {}
+        script = get_specific_daily_sql(
+            ["总市值"], ["SH600519"], ["2024.01.02"], variables
+        )
+        conn.run_query(script, variables)
+    assert "def queryDailyFactors(" in reader.scripts[0]
+    assert "def " not in reader.scripts[1]
+    assert reader.scripts[1].endswith(
+        "queryDailyFactors(factorNames, symbols, dateList)"
+    )
+
+    conn.run_query("1")
+    assert reader.scripts[-1] == "1"
+
+
+def test_trading_calendar_vectorized_lookups():
+    """Adjacent trading days are resolved for whole arrays at once."""
+    calendar = TradingCalendar(["2024-01-02", "2024-01-03", "2024-01-05", "2024-01-08"])
+    dates = ["2024-01-03", "2024-01-04", "2024-01-06", "2024-01-09"]
+
+    assert to_db_dates(calendar.previous(dates)[:3]) == [
+        "2024.01.02",
+        "2024.01.03",
+        "2024.01.05",
+    ]
+    assert to_db_dates(calendar.rollforward(dates)[:3]) == [
+        "2024.01.03",
+        "2024.01.05",
+        "2024.01.08",
+    ]
+    assert to_db_dates(calendar.rollback(dates)) == [
+        "2024.01.03",
+        "2024.01.03",
+        "2024.01.05",
+        "2024.01.08",
+    ]
+    assert calendar.is_trading_day(dates).tolist() == [True, False, False, False]
+    assert np.isnat(calendar.next(dates)[-1])
+    assert calendar.shift("2024.01.08", -2) == np.datetime64("2024-01-03")
+
+
+def test_symbol_universe_membership():
+    """Requested symbols are filtered with set lookups, keeping their order."""
+    listing = pd.DataFrame(
+        {
+            "symbol": ["SH600519", "SZ002415", "SH600000"],
+            "list_date": pd.to_datetime(["2001-08-27", "2010-05-28", "1999-11-10"]),
+        }
+    )
+    universe = SymbolUniverse(listing)
+
+    assert "SZ002415" in universe
+    assert universe.filter(["SZ002415", "XX000000", "SH600519", "SZ002415"]) == [
+        "SZ002415",
+        "SH600519",
+    ]
+    assert universe.info("SH600519")["list_date"] == pd.Timestamp("2001-08-27")
+    assert not universe.is_stale(ttl=60)
+    assert universe.is_stale(ttl=-1)
+
+
+def test_frame_cache_tiers_and_invalidation(tmp_path):
+    """Frames are served from memory, then disk, and dropped when the version moves."""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame(
+        {"symbol": ["SH600519"], "报告期": pd.to_datetime(["2023-12-31"])}
+    )
+    key = make_key("finance", ["存货", "商誉"], ["SH600519"], "annual", 5)
+    assert key == make_key("finance", ["商誉", "存货"], ["SH600519"], "annual", 5)
+
+    cache = FrameCache("finance", directory=str(tmp_path))
+    cache.put(key, "v1", df)
+    pd.testing.assert_frame_equal(cache.get(key, "v1"), df)
+
+    cold = FrameCache("finance", directory=str(tmp_path))
+    pd.testing.assert_frame_equal(cold.get(key, "v1"), df)
+    assert cold.get(key, "v2") is None
+    assert cold.stats()["disk_hits"] == 1
+    assert cold.stats()["misses"] == 1
+
+
+def test_frame_cache_is_bounded_by_bytes():
+    """The memory tier evicts least recently used frames past its byte budget."""
+    df = pd.DataFrame({"value": np.arange(100, dtype="float64")})
+    cache = FrameCache(
+        "bounded", max_bytes=int(df.memory_usage().sum()) * 2, directory=None
+    )
+    for key in "abc":
+        cache.put(key, 1, df)
+    assert cache.get("a", 1) is None
+    assert cache.get("c", 1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_frame_cache_disk_tier_is_bounded_by_bytes(tmp_path):
+    """The disk tier deletes the least recently read files past its byte budget."""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"value": np.arange(1000, dtype="float64")})
+    cache = FrameCache("bounded", max_bytes=0, directory=str(tmp_path))
+    cache.put("a", 1, df)
+    size = sum(p.stat().st_size for p in tmp_path.rglob("*.arrow"))
+    cache.max_disk_bytes = size * 2
+    cache.put("b", 1, df)
+    # Reading "a" marks it as recently used, so "b" is the one evicted.
+    for path in tmp_path.rglob("b-*.arrow"):
+        os.utime(path, (0, 0))
+    assert cache.get("a", 1) is not None
+    cache.put("c", 1, df)
+    assert sorted(p.name[0] for p in tmp_path.rglob("*.arrow")) == ["a", "c"]
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_finance_watermark_is_checked_once_at_a_time():
+    """Concurrent requests share a single watermark query."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.finance import aget_finance_watermark
+
+    scripts = []
+
+    class WatermarkReader(DummyReader):
+        """Answer the watermark query slowly."""
+
+        def _run_query(self, script):
+            scripts.append(script)
+            time.sleep(0.05)
+            return pd.DataFrame({"timestamp": pd.to_datetime(["2024-04-30"])})
+
+    async def check():
+        return await asyncio.gather(*(aget_finance_watermark() for _ in range(4)))
+
+    pool = ConnectionPool(factory=WatermarkReader, size=4)
+    set_connection_pool(pool)
+    set_finance_cache(None)
+    try:
+        assert asyncio.run(check()) == ["2024-04-30 00:00:00"] * 4
+    finally:
+        set_connection_pool(None)
+        set_finance_cache(None)
+    assert len(scripts) == 1
+
+
+def test_build_models_matches_per_row_validation():
+    """The bulk path builds the same models as per-row validation."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.models.balance_sheet import XiaoYuanBalanceSheetData
+    from openbb_xiaoyuan.models.historical_market_cap import (
+        XiaoYuanHistoricalMarketCapData,
+    )
+
+    market_cap = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-03", "2024-01-02"]),
+            "symbol": ["SH600519", "SH600519"],
+            "总市值": [2.0, 1.0],
+        }
+    )
+    model = XiaoYuanHistoricalMarketCapData
+    assert is_trusted(model, rename_columns(model, market_cap))
+    built = build_models(model, market_cap)
+    expected = [model.model_validate(d) for d in market_cap.to_dict("records")]
+    assert [b.model_dump() for b in built] == [e.model_dump() for e in expected]
+    assert isinstance(built[0], model)
+
+    balance_sheet = pd.DataFrame(
+        {
+            "symbol": ["SH600519", "SH600519"],
+            "报告期": ["2023-12-31", "2022-12-31"],
+            "存货": [1.0, 0.0],
+            "fiscal_year": [2023, 2022],
+        }
+    )
+    model = XiaoYuanBalanceSheetData
+    assert not is_trusted(model, rename_columns(model, balance_sheet))
+    built = build_models(model, balance_sheet)
+    expected = [model.model_validate(d) for d in balance_sheet.to_dict("records")]
+    assert [b.model_dump() for b in built] == [e.model_dump() for e in expected]
+
+
+def test_build_models_keeps_datetimes_by_position():
+    """Datetime columns of frames with a non-default index stay on their rows."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.models.equity_historical import XiaoYuanEquityHistoricalData
+
+    prices = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-03 15:00", "2024-01-02 15:00"]),
+            "symbol": ["SH600519", "SH600519"],
+            "开盘价（不复权）": [2.0, 1.0],
+            "最高价（不复权）": [2.0, 1.0],
+            "最低价（不复权）": [2.0, 1.0],
+            "收盘价（不复权）": [2.0, 1.0],
+            "成交量（不复权）": [2.0, 1.0],
+        },
+        index=[5, 3],
+    )
+    model = XiaoYuanEquityHistoricalData
+    assert is_trusted(model, rename_columns(model, prices))
+    built = build_models(model, prices)
+    assert [b.date for b in built] == list(prices["timestamp"].dt.to_pydatetime())
+    assert [b.close for b in built] == [2.0, 1.0]
+
+
+def test_post_process_matches_per_row_cleanup():
+    """The declarative spec scales, nulls, formats and sorts whole columns."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.models.balance_sheet import BALANCE_SHEET_POST_PROCESS
+    from openbb_xiaoyuan.models.financial_ratios import (
+        FINANCIAL_RATIOS_POST_PROCESS,
+    )
+
+    df = pd.DataFrame(
+        {
+            "symbol": ["SZ002415", "SH600519", "SH600519"],
+            "报告期": pd.to_datetime(["2023-12-31", "2022-12-31", "2023-12-31"]),
+            "timestamp": pd.to_datetime(["2024-03-01", "2023-03-02", "2024-03-02"]),
+            "存货": [1.0, 0.0, 3.0],
+            "资产负债率": [50.0, 40.0, 0.0],
+        }
+    )
+    symbols = ["SH600519", "SZ002415"]
+
+    sheets = BALANCE_SHEET_POST_PROCESS.build(df, symbols)
+    assert [(s.symbol, str(s.period_ending)) for s in sheets] == [
+        ("SH600519", "2023-12-31"),
+        ("SH600519", "2022-12-31"),
+        ("SZ002415", "2023-12-31"),
+    ]
+    # Extra datetime columns stay on their rows once sorted.
+    assert [s.timestamp.day for s in sheets] == [2, 2, 1]
+    assert [s.inventory for s in sheets] == [3.0, None, 1.0]
+    # Zeros are nulled on the frame, so statements skip per-row validation.
+    model = BALANCE_SHEET_POST_PROCESS.model
+    assert is_trusted(
+        model, rename_columns(model, BALANCE_SHEET_POST_PROCESS.apply(df))
+    )
+
+    ratios = FINANCIAL_RATIOS_POST_PROCESS.apply(df, symbols)
+    assert ratios["报告期"].tolist() == ["2023-12-31", "2022-12-31", "2023-12-31"]
+    assert ratios["资产负债率"].tolist()[1:] == [0.4, 0.5]
+    assert np.isnan(ratios["资产负债率"].iloc[0])
+    assert df["资产负债率"].tolist() == [50.0, 40.0, 0.0]
+
+
+def test_arrow_output_keeps_native_columns(monkeypatch):
+    """Arrow output renames columns and keeps native dtypes through IPC."""
+    pa = pytest.importorskip("pyarrow")
+    # pylint: disable=import-outside-toplevel
+    from fastapi import HTTPException, Request
+    from pyarrow import parquet
+
+    from openbb_xiaoyuan.models.equity_historical import XiaoYuanEquityHistoricalData
+    from openbb_xiaoyuan.models.historical_market_cap import (
+        XiaoYuanHistoricalMarketCapData,
+        XiaoYuanHistoricalMarketCapFetcher,
+        XiaoYuanHistoricalMarketCapQueryParams,
+    )
+    from openbb_xiaoyuan.utils.arrow import (
+        afetch_arrow,
+        create_arrow_router,
+        from_ipc_bytes,
+        to_arrow_table,
+        to_ipc_bytes,
+        to_parquet_bytes,
+    )
+
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-02", "2024-01-03"]),
+            "symbol": ["SH600519", "SH600519"],
+            "总市值": [1.0, 2.0],
+        }
+    )
+    table = to_arrow_table(XiaoYuanHistoricalMarketCapData, df)
+    assert table.column_names == ["date", "symbol", "market_cap"]
+    assert table.schema.field("date").type == pa.date32()
+    assert table.schema.field("market_cap").type == pa.float64()
+    assert from_ipc_bytes(to_ipc_bytes(table)).equals(table)
+    assert to_parquet_bytes(table)[:4] == b"PAR1"
+
+    table = to_arrow_table(XiaoYuanEquityHistoricalData, df)
+    assert pa.types.is_timestamp(table.schema.field("date").type)
+
+    # Arrow is served beside the fetcher, never as OBBject results.
+    assert "output_format" not in XiaoYuanHistoricalMarketCapQueryParams.model_fields
+
+    async def aextract_data(query, credentials, **kwargs):
+        return df
+
+    monkeypatch.setattr(
+        XiaoYuanHistoricalMarketCapFetcher, "aextract_data", aextract_data
+    )
+    params = {"symbol": "SH600519"}
+    response = asyncio.run(afetch_arrow(XiaoYuanHistoricalMarketCapFetcher, params))
+    assert response.media_type == "application/vnd.apache.arrow.stream"
+    assert from_ipc_bytes(response.body).column("market_cap").to_pylist() == [
+        2.0,
+        1.0,
+    ]
+    response = asyncio.run(
+        afetch_arrow(
+            XiaoYuanHistoricalMarketCapFetcher, params, output_format="parquet"
+        )
+    )
+    assert parquet.read_table(pa.BufferReader(response.body)).num_rows == 2
+
+    # The routes resolve the fetcher by model and validate the query string.
+    def request(query):
+        return Request({"type": "http", "query_string": query, "headers": []})
+
+    arrow = create_arrow_router().routes[0].endpoint
+    response = asyncio.run(
+        arrow(
+            "HistoricalMarketCap",
+            request(b"symbol=SH600519&output_format=parquet"),
+            output_format="parquet",
+        )
+    )
+    assert response.media_type == "application/vnd.apache.parquet"
+    assert parquet.read_table(pa.BufferReader(response.body)).num_rows == 2
+    for model, query, status in (
+        ("BalanceSheet", b"symbol=SH600519", 404),
+        ("HistoricalMarketCap", b"start_date=never", 422),
+    ):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(arrow(model, request(query)))
+        assert error.value.status_code == status
+
+
+def test_trading_calendar_windows_are_contiguous():
+    """Windows cover (start, end] with at most `size` trading days each."""
+    calendar = TradingCalendar(pd.bdate_range("2024-01-01", "2024-02-01"))
+    windows = calendar.windows("2024-01-01", "2024-01-20", 5)
+    assert to_db_dates(np.array([w[1] for w in windows])) == [
+        "2024.01.08",
+        "2024.01.15",
+        "2024.01.20",
+    ]
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    assert windows[0][0] == np.datetime64("2024-01-01")
+    assert len(calendar.windows("2024-01-06", "2024-01-07", 5)) == 1
+
+
+def test_resampled_windows_hold_whole_bars():
+    """Bar windows end on bar ends, and the bars aggregate on the server."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.references import get_resample_sql
+
+    calendar = TradingCalendar(pd.bdate_range("2024-01-01", "2024-06-28"))
+    windows = calendar.windows("2024-01-01", "2024-06-28", 50, "1M")
+    assert to_db_dates(np.array([w[1] for w in windows])) == [
+        "2024.02.29",
+        "2024.04.30",
+        "2024.06.28",
+    ]
+    quarter = calendar.windows("2024-01-01", "2024-06-28", 20, "1Q")
+    assert to_db_dates(np.array([w[1] for w in quarter])) == [
+        "2024.03.29",
+        "2024.06.28",
+    ]
+
+    script = get_resample_sql("t", "1W", {"open": "first", "volume": "sum"})
+    assert script == (
+        "t = select last(timestamp) as timestamp, first(open) as open,"
+        " sum(volume) as volume from t group by symbol, weekEnd(timestamp) as bar;\n"
+        "t = select timestamp, symbol, open, volume from t"
+        " order by timestamp, symbol;"
+    )
+
+
+def test_price_store_fetches_only_new_days():
+    """Covered spans are served locally and revised adjusted closes reload."""
+    days = pd.bdate_range("2024-01-01", "2024-05-31")
+    set_trading_calendar(TradingCalendar(days))
+    database = {"adj": 1.0, "until": pd.Timestamp("2024-02-29")}
+    calls = []
+
+    async def fetch(symbols, after, until):
+        calls.append((list(symbols), str(after), str(until)))
+        mask = (days > pd.Timestamp(after)) & (days <= pd.Timestamp(until))
+        mask &= days <= database["until"]
+        for symbol in symbols:
+            yield pd.DataFrame(
+                {"timestamp": days[mask], "symbol": symbol, ADJ_CLOSE: database["adj"]}
+            )
+
+    async def run(start, end, symbols=("SH600519",)):
+        return await store.aget(list(symbols), start, end, fetch)
+
+    store = PriceStore()
+    try:
+        df = asyncio.run(run("2024-01-01", "2024-03-02"))
+        assert df["timestamp"].iloc[-1] == pd.Timestamp("2024-02-29")
+        # The fetch covered the weekend, so asking again is served locally.
+        asyncio.run(run("2024-01-01", "2024-03-02"))
+        assert len(calls) == 1
+
+        database["until"] = pd.Timestamp("2024-04-30")
+        df = asyncio.run(run("2024-01-01", "2024-04-30"))
+        assert calls[-1] == (["SH600519"], "2024-02-28", "2024-04-30")
+        assert len(df) == days.get_loc("2024-04-30") and df["timestamp"].is_unique
+
+        asyncio.run(run("2024-02-01", "2024-03-01"))
+        assert len(calls) == 2
+
+        database["adj"] = 0.5
+        database["until"] = pd.Timestamp("2024-05-31")
+        df = asyncio.run(run("2024-01-01", "2024-05-31"))
+        assert calls[-1] == (["SH600519"], "2024-01-01", "2024-05-31")
+        assert (df[ADJ_CLOSE] == 0.5).all()
+        assert {k: v for k, v in store.stats().items() if k != "bytes"} == {
+            "hits": 2,
+            "checks": 0,
+            "incremental": 1,
+            "reloads": 2,
+            "evictions": 0,
+            "symbols": 1,
+        }
+
+        # A span reaching today expires, as today's bar may still land.
+        future = str(pd.Timestamp.today().year + 1) + "-01-01"
+        for ttl, fetches in ((300, 1), (0, 2)):
+            store, calls[:] = PriceStore(today_ttl=ttl), []
+            for _ in range(2):
+                asyncio.run(run("2024-01-01", future))
+            assert len(calls) == fetches
+
+        # The store is bounded by bytes, and a request survives its evictions.
+        nbytes = store.stats()["bytes"]
+        store = PriceStore(max_bytes=nbytes + nbytes // 2)
+        df = asyncio.run(run("2024-01-01", "2024-05-31", ["SH600519", "SZ000001"]))
+        assert set(df["symbol"]) == {"SH600519", "SZ000001"}
+        assert store.stats()["evictions"] == 1
+        assert store.stats()["bytes"] <= store.max_bytes
+    finally:
+        set_trading_calendar(None)
+
+
+def test_price_store_rechecks_covered_spans_daily(monkeypatch):
+    """An ex-date after a cached span reloads it on the next day's request."""
+    # pylint: disable=import-outside-toplevel
+    from datetime import date, timedelta
+
+    from openbb_xiaoyuan.utils import prices
+
+    days = pd.bdate_range("2024-01-01", "2024-03-29")
+    set_trading_calendar(TradingCalendar(days))
+    database = {"adj": 1.0}
+    calls = []
+
+    async def fetch(symbols, after, until):
+        calls.append((list(symbols), str(after), str(until)))
+        mask = (days > pd.Timestamp(after)) & (days <= pd.Timestamp(until))
+        for symbol in symbols:
+            yield pd.DataFrame(
+                {"timestamp": days[mask], "symbol": symbol, ADJ_CLOSE: database["adj"]}
+            )
+
+    class Tomorrow(date):
+        """The day after the real today."""
+
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    def run():
+        return asyncio.run(store.aget(["SH600519"], "2024-01-01", "2024-01-31", fetch))
+
+    store = PriceStore()
+    try:
+        run()
+        # An ex-date in March rescales the cached January closes.
+        database["adj"] = 0.5
+        assert (run()[ADJ_CLOSE] == 1.0).all()
+        assert len(calls) == 1
+
+        monkeypatch.setattr(prices, "date", Tomorrow)
+        df = run()
+        assert calls[1] == (["SH600519"], "2024-01-30", "2024-01-31")
+        assert calls[2] == (["SH600519"], "2024-01-01", "2024-01-31")
+        assert (df[ADJ_CLOSE] == 0.5).all()
+
+        # Checked once that day: unchanged closes are then served locally.
+        run()
+        assert len(calls) == 3
+        monkeypatch.setattr(prices, "date", date)
+        run()
+        assert calls[3] == (["SH600519"], "2024-01-30", "2024-01-31")
+        assert store.stats()["checks"] == 1
+    finally:
+        set_trading_calendar(None)
+
+
+def test_adjustment_factors_extend_and_switch_without_queries():
+    """Cached factors reproduce the forward-adjusted close and only extend."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.adjustments import (
+        CLOSE,
+        AdjustmentFactors,
+        adjust_prices,
+    )
+
+    volume = "成交量（不复权）"
+    days = pd.bdate_range("2024-01-01", "2024-03-29")
+    close = pd.Series(np.linspace(10.0, 12.0, len(days)), index=days)
+    database = {"until": pd.Timestamp("2024-02-29"), "ex": {"2024-02-01": 0.9}}
+
+    def forward():
+        published = close[close.index <= database["until"]]
+        factor = pd.Series(1.0, index=published.index)
+        for day, ratio in database["ex"].items():
+            factor[factor.index < pd.Timestamp(day)] *= ratio
+        return published, factor
+
+    calls = []
+
+    class Factors(AdjustmentFactors):
+        """Factors served from the in-memory database."""
+
+        async def _fetch(self, symbols, after, until):
+            calls.append(str(after))
+            published, factor = forward()
+            factor = factor[factor.index >= pd.Timestamp(str(after))]
+            return {"SH600519": (to_datetime64(factor.index), factor.to_numpy())}
+
+    def frame():
+        published, factor = forward()
+        return pd.DataFrame(
+            {
+                "timestamp": published.index,
+                "symbol": "SH600519",
+                CLOSE: published.to_numpy(),
+                ADJ_CLOSE: (published * factor).to_numpy(),
+                volume: 100.0,
+            }
+        )
+
+    async def run(adjustment):
+        factors = await store.aget(["SH600519"])
+        return adjust_prices(frame(), factors, adjustment)
+
+    store = Factors()
+    df = asyncio.run(run("forward"))
+    np.testing.assert_allclose(df[CLOSE], frame()[ADJ_CLOSE])
+    assert df[ADJ_CLOSE].equals(df[CLOSE])
+    df = asyncio.run(run("backward"))
+    assert df[CLOSE].iloc[0] == close.iloc[0]
+    np.testing.assert_allclose(df[CLOSE].iloc[-1], close["2024-02-29"] / 0.9)
+    # The adjusted close follows the adjustment, and volume is left as is.
+    assert df[ADJ_CLOSE].equals(df[CLOSE])
+    assert (df[volume] == 100.0).all()
+    assert len(store._entries["SH600519"].days) == 2  # pylint: disable=protected-access
+    assert calls == ["1990-01-01"]
+
+    # A new ex-date next day: only the days after the last one are fetched.
+    database.update(until=pd.Timestamp("2024-03-29"))
+    database["ex"]["2024-03-15"] = 0.8
+    store._entries["SH600519"].checked_on = None  # pylint: disable=protected-access
+    df = asyncio.run(run("forward"))
+    np.testing.assert_allclose(df[CLOSE], frame()[ADJ_CLOSE])
+    assert calls == ["1990-01-01", "2024-02-29"]
+    assert asyncio.run(run("none"))[CLOSE].equals(frame()[CLOSE])
+    assert calls == ["1990-01-01", "2024-02-29"]
+
+
+def test_query_builder_emits_prunable_bounds():
+    """Finance selects are bounded on the report date."""
+    # pylint: disable=import-outside-toplevel
+    from datetime import date
+
+    from openbb_xiaoyuan.utils.query import Between, In, Predicate, Raw, Select, Table
+    from openbb_xiaoyuan.utils.references import ReportPeriod
+
+    select = Select(Table("t"), ["symbol"]).where(
+        In("symbol", ["SH600519"]),
+        Between("timestamp", date(2024, 1, 2), Raw("high")),
+    )
+    assert select.render() == (
+        "select symbol from t where symbol in ['SH600519'] "
+        "and timestamp between 2024.01.02 and high"
+    )
+
+    period = ReportPeriod("annual", -5)
+    assert period.lower_bound(date(2026, 10, 17)) == date(2020, 1, 1)
+    rendered = period.apply(Select(Table("t"))).render()
+    assert "monthOfYear(报告期) = 12" in rendered
+    assert "报告期 >= " in rendered and "timestamp >= " not in rendered
+    assert rendered.endswith("order by 报告期 limit -5")
+    assert ReportPeriod("ytd", 0).predicates() == []
+    with pytest.raises(TypeError):
+        Predicate()
+    with pytest.raises(ValueError):
+        ReportPeriod("quarter")
+
+
+def test_key_metrics_join_daily_factors_per_symbol():
+    """Reports meet the prior day's daily row of their own symbol, in one script."""
+    # pylint: disable=import-outside-toplevel
+    from datetime import date
+
+    from openbb_xiaoyuan.utils.references import (
+        ReportPeriod,
+        get_finance_asof_daily_sql,
+    )
+
+    variables = {}
+    script = get_finance_asof_daily_sql(
+        ["营业收入", "总市值"],
+        ["总市值"],
+        ["SH600519", "SZ002415"],
+        ReportPeriod("annual", -2),
+        variables,
+        today=date(2024, 12, 31),
+    )
+    assert variables["dailyFactorNames"] == ["总市值"]
+    statements = [line.strip() for line in script.strip().splitlines()]
+    assert [s.split(" = ")[0] for s in statements[:3]] == ["t", "t", "t"]
+    # Each report is keyed on the last trading day before it, on the server.
+    assert "date(报告期) - 1 as asof_day from t" in statements[2]
+    assert statements[3] == (
+        'tradingDays = getMarketCalendar("XSHG", 2020.12.01, 2024.12.31);'
+    )
+    assert statements[4] == (
+        "update t set day = tradingDays[asof(tradingDays, asof_day)];"
+    )
+    assert statements[5] == "days = exec distinct day from t;"
+    # Only the daily rows of those days are loaded.
+    daily = statements[8]
+    assert daily.startswith("d = select date(timestamp) as day, symbol,")
+    assert "factor_name in dailyFactorNames and symbol in symbols" in daily
+    assert "timestamp between firstDay and lastDay" in daily
+    assert daily.endswith("and date(timestamp) in days;")
+    assert "报告期 >= 2021.01.01" in statements[0]
+    assert statements[9] == "d = select value from d pivot by day, symbol, factor_name;"
+    # The join matches on symbol and day, so rows never cross symbols.
+    assert statements[10] == "select * from lj(t, d, `symbol`day);"
+
+
+def test_valuation_snapshot_is_one_script():
+    """The snapshot aligns report periods to trading days on the server."""
+    # pylint: disable=import-outside-toplevel
+    from datetime import date
+
+    from openbb_xiaoyuan.utils.references import get_valuation_snapshot_sql
+
+    variables = {}
+    script = get_valuation_snapshot_sql(
+        ["投入资本回报率ROIC（TTM）（百分比）"],
+        ["市盈率（滚动）"],
+        None,
+        date(2024, 12, 31),
+        variables,
+    )
+    assert variables == {
+        "financeFactors": ["投入资本回报率ROIC（TTM）（百分比）"],
+        "dailyFactors": ["市盈率（滚动）"],
+    }
+    assert "symbol in" not in script
+    statements = script.splitlines()
+    assert "context by symbol, factor_name order by timestamp limit -1" in script
+    # One row per symbol, dated with its latest report period.
+    assert statements[2] == (
+        "periods = select max(报告期) as 报告期, max(timestamp) as timestamp"
+        " from t group by symbol;"
+    )
+    assert statements[3] == "t = select value from t pivot by symbol, factor_name;"
+    assert statements[4] == "t = lj(periods, t, `symbol);"
+    # The calendar and the daily rows start at the earliest report period.
+    assert statements[5] == "firstPeriod = exec min(date(报告期)) from t;"
+    assert 'getMarketCalendar("XSHG", firstPeriod, 2024.12.31)' in statements[6]
+    assert "timestamp between firstPeriod and 2024.12.31" in statements[9]
+    assert script.endswith("select * from lj(t, d, `symbol`day);")
+
+    script = get_valuation_snapshot_sql(
+        ["a"], ["b"], ["SH600519"], date(2024, 12, 31), variables
+    )
+    assert script.count("symbol in symbols") == 2
+
+
+def test_valuation_multiples_snapshot_every_symbol():
+    """`all_symbols` snapshots the whole universe, `symbol` only its symbols."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.models.equity_valuation_multiples import (
+        XiaoYuanEquityValuationMultiplesFetcher,
+    )
+    from tests.benchmarks.synthetic import SyntheticStore
+
+    store = SyntheticStore(symbols=3, years=1)
+    store.install()
+    fetcher = XiaoYuanEquityValuationMultiplesFetcher
+    try:
+        params = {"symbol": store.symbols[1]}
+        result = asyncio.run(fetcher.fetch_data(params))
+        assert [r.symbol for r in result] == [store.symbols[1]]
+
+        query = fetcher.transform_query({**params, "all_symbols": True})
+        assert query.all_symbols
+        result = asyncio.run(fetcher.fetch_data({**params, "all_symbols": True}))
+        assert sorted(r.symbol for r in result) == sorted(store.symbols)
+    finally:
+        set_connection_pool(None)
+        set_finance_cache(None)
+        set_trading_calendar(None)
+        set_symbol_universe(None)
+
+
+def test_fetcher_timings_in_result_metadata(monkeypatch):
+    """Each fetcher phase and pooled query is reported when timings are on."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.provider.abstract.annotated_result import AnnotatedResult
+    from openbb_core.provider.abstract.data import Data
+    from openbb_core.provider.abstract.fetcher import Fetcher
+    from openbb_core.provider.abstract.query_params import QueryParams
+
+    pool = ConnectionPool(factory=DummyReader, size=1)
+
+    @timings.with_timings
+    class DummyFetcher(Fetcher[QueryParams, List[Data]]):
+        """Fetcher running a single pooled query."""
+
+        @staticmethod
+        def transform_query(params):
+            return QueryParams(**params)
+
+        @staticmethod
+        async def aextract_data(query, credentials, **kwargs):
+            return await PooledReader(pool).arun_query("select 1")
+
+        @staticmethod
+        def transform_data(query, data, **kwargs):
+            return [Data(value=data)]
+
+    result = asyncio.run(DummyFetcher.fetch_data({}))
+    assert not isinstance(result, AnnotatedResult)
+
+    monkeypatch.setattr(timings, "TIMINGS_ENABLED", True)
+    result = asyncio.run(DummyFetcher.fetch_data({}))
+    assert isinstance(result, AnnotatedResult)
+    assert result.result[0].value == "select 1"
+    report = result.metadata["timings"]
+    assert report["fetcher"] == "DummyFetcher"
+    assert [p["phase"] for p in report["phases"]] == [
+        "transform_query",
+        "extract",
+        "acquire",
+        "query",
+        "transform",
+    ]
+    assert report["phases"][3]["script_bytes"] == len("select 1")
+    assert report["total"] >= report["totals"]["extract"] > 0
+    pool.close()
+
+
+def test_benchmark_runs_every_fetcher():
+    """Every registered fetcher runs end to end on the synthetic store."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan import openbb_xiaoyuan_provider
+    from tests.benchmarks.bench_fetchers import benchmark
+    from tests.benchmarks.synthetic import SyntheticStore
+
+    store = SyntheticStore(symbols=3, years=1)
+    try:
+        results = benchmark(store, memory=False, echo=lambda line: None)
+    finally:
+        set_connection_pool(None)
+        set_finance_cache(None)
+        set_trading_calendar(None)
+        set_symbol_universe(None)
+    assert list(results) == list(openbb_xiaoyuan_provider.fetcher_dict)
+    for name, result in results.items():
+        assert "error" not in result, (name, result)
+        assert result["rows"] > 0
+        assert result["phases"]["query"]["rows"] > 0
+    assert not timings.TIMINGS_ENABLED
+
+
+def test_provider_import_loads_fetchers_lazily():
+    """Importing the provider loads no fetcher module until one is looked up."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.provider.registry import Registry
+    from openbb_core.provider.registry_map import RegistryMap
+
+    from openbb_xiaoyuan import openbb_xiaoyuan_provider
+    from openbb_xiaoyuan.utils.lazy import LazyFetcherDict
+    from tests.benchmarks.bench_import import run_once
+
+    result = run_once()
+    assert result["models"] == []
+    assert "pandas" not in result["heavy"]
+
+    # The registry map built at startup loads every fetcher, which still
+    # loads no heavy module.
+    result = run_once(fetchers=True)
+    assert len(result["models"]) > 1
+    assert not {"pandas", "numpy", "pyarrow"} & set(result["heavy"])
+
+    fetchers = LazyFetcherDict(
+        "openbb_xiaoyuan.models",
+        {"KeyMetrics": ("key_metrics", "XiaoYuanKeyMetricsFetcher")},
+    )
+    assert "KeyMetrics" in fetchers and list(fetchers) == ["KeyMetrics"]
+    assert not fetchers.loaded()
+    fetcher = fetchers["KeyMetrics"]
+    assert fetcher.__name__ == "XiaoYuanKeyMetricsFetcher"
+    assert fetchers.find("XiaoYuanKeyMetricsFetcher") is fetcher
+    assert fetchers.loaded() == {"KeyMetrics": fetcher}
+
+    # Building the registry map reads every fetcher, loading them all.
+    registry = Registry()
+    registry.include_provider(openbb_xiaoyuan_provider)
+    RegistryMap(registry)
+    assert set(openbb_xiaoyuan_provider.fetcher_dict.loaded()) == set(
+        openbb_xiaoyuan_provider.fetcher_dict
+    )
+
+
+def test_auto_build_skips_unchanged_extensions(tmp_path, monkeypatch):
+    """The package builder only runs when the installed extensions change."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_core.app.static import package_builder
+
+    from openbb_xiaoyuan.utils import build
+
+    directories = []
+
+    class Builder:
+        """Record the auto builds instead of building."""
+
+        def __init__(self, directory):
+            self.directory = directory
+
+        def auto_build(self):
+            directories.append(self.directory)
+
+    monkeypatch.setattr(package_builder, "PackageBuilder", Builder)
+    monkeypatch.setenv("OPENBB_AUTO_BUILD", "true")
+    fingerprint = build.extension_fingerprint()
+    assert fingerprint == build.extension_fingerprint()
+
+    assert build.auto_build(tmp_path)
+    assert build.read_fingerprint(tmp_path) == fingerprint
+    assert not build.auto_build(tmp_path)
+    assert directories == [tmp_path]
+
+    monkeypatch.setattr(build, "extension_fingerprint", lambda: "changed")
+    assert build.auto_build(tmp_path)
+    assert build.read_fingerprint(tmp_path) == "changed"
+    assert len(directories) == 2
+
+    # An unwritable package still builds, and rebuilds on the next import.
+    readonly = tmp_path / "readonly"
+    readonly.write_text("")
+    assert not build.write_fingerprint(readonly, "changed")
+    assert build.auto_build(readonly)
+    assert build.auto_build(readonly)
+    assert len(directories) == 4
+
+
+def test_cassette_replays_recorded_queries(tmp_path):
+    """Recorded queries replay offline, including today-relative dates."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_xiaoyuan.utils.connection import get_pooled_reader
+    from tests.cassette import Cassette, CassetteMiss, use_cassette
+
+    class FrameReader(DummyReader):
+        """Reader returning each script as a frame."""
+
+        def _run_query(self, script):
+            self.scripts.append(script)
+            return pd.DataFrame(
+                {"script": [script], "day": [pd.Timestamp("2024-01-02")]}
+            )
+
+    prices = "select * from t where symbol in symbols and timestamp > 2024.01.02"
+    dividends = 'queryDividends(2024.01.01, 2024.02.01, NULL, "dividend_detail")'
+    variables = {"symbols": ["SH600519"]}
+
+    with use_cassette(Cassette(tmp_path, "new"), FrameReader):
+        recorded = get_pooled_reader().run_query(prices, variables)
+        get_pooled_reader().run_query(dividends)
+        get_pooled_reader().run_query(dividends)
+    assert len(list(tmp_path.glob("*.arrow"))) == 2
+
+    with use_cassette(Cassette(tmp_path)):
+        reader = get_pooled_reader()
+        pd.testing.assert_frame_equal(reader.run_query(prices, variables), recorded)
+        # Recorded with the session function definitions prepended.
+        assert "def queryDividends" in reader.run_query(dividends)["script"][0]
+        with pytest.raises(CassetteMiss):
+            reader.run_query(prices, {"symbols": ["SZ002415"]})
+
+    with use_cassette(Cassette(tmp_path)):
+        shifted = prices.replace("2024.01.02", "2025.01.02")
+        pd.testing.assert_frame_equal(
+            get_pooled_reader().run_query(shifted, variables), recorded
+        )
+
+
+def test_screener_filters_and_ranks_on_the_server():
+    """The screener script filters, sorts and limits before returning rows."""
+    # pylint: disable=import-outside-toplevel
+    from datetime import date
+
+    from openbb_xiaoyuan.models.equity_screener import (
+        XiaoYuanEquityScreenerQueryParams,
+    )
+    from openbb_xiaoyuan.utils.query import Compare
+    from openbb_xiaoyuan.utils.references import get_screener_sql
+
+    variables = {}
+    script = get_screener_sql(
+        date(2024, 10, 8),
+        ["市盈率（滚动）", "总市值"],
+        ["营业收入"],
+        [Compare("市盈率（滚动）", "<", 20.0)],
+        "总市值 desc",
+        10,
+        variables,
+        report_since=date(2023, 10, 8),
+    )
+    assert variables == {
+        "dailyFactors": ["市盈率（滚动）", "总市值"],
+        "reportFactors": ["营业收入"],
+    }
+    assert "timestamp between 2024.10.08 and 2024.10.08" in script
+    assert "timestamp between 2023.10.08 and 2024.10.08" in script
+    assert script.endswith(
+        "select * from t where 市盈率（滚动） < 20.0 order by 总市值 desc limit 10;"
+    )
+
+    with pytest.raises(ValueError):
+        XiaoYuanEquityScreenerQueryParams(filters="营业收入>0")
+    with pytest.raises(ValueError):
+        XiaoYuanEquityScreenerQueryParams(sort_by="总市值;drop")